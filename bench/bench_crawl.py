@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# Benchmark: SimpleCrawler throughput (pages/s) and peak memory against a local synthetic site.
+#   python bench/bench_crawl.py [--pages 2000 --depth 4 --fanout 8 --latency 0.005]
+#                               [--concurrency 10,50] [--workers 0,1,2,4] [--markup 500]
+#                               [--traps --dedup off,near] [--repeat 3] [--save NAME] [--compare FILE]
+# --workers: jumlah proses parse (0 = parse di event loop); --markup membuat halaman berat untuk di-parse.
+# --traps menambah kalender tanpa ujung, link session-ID dan soft-404; --dedup membandingkan mode dedup crawler.
+# Setiap crawl jalan di proses terpisah supaya peak RSS tiap percobaan tidak saling mempengaruhi.
+import os, sys, json, argparse, tempfile, subprocess
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from bench.harness import SiteShape, SyntheticSite, median, save_results, report_comparison
+
+console = Console()
+
+
+def crawl_once(url, depth, concurrency, extractor, bloom, workers, dedup, result_path):
+    """Child process: crawl once with output silenced, write stats as JSON"""
+    import time
+    import resource
+    from contextlib import redirect_stdout
+    from plugins.crawl_simple import SimpleCrawler
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        os.chdir(tmp)
+        start = time.perf_counter()
+        out = SimpleCrawler().run(url, out_dir="reports", depth=depth, concurrency=concurrency,
+                                  per_host_rate=0, extractor=extractor, bloom_capacity=bloom or None,
+                                  parse_workers=workers, dedup=dedup, force=True)
+        elapsed = time.perf_counter() - start
+        with open(out, encoding="utf-8") as f:
+            urls = sum(1 for _ in f)
+        skipped_path = os.path.join("reports", "crawl_skipped_" + os.path.basename(out)[len("simple_crawler_"):])
+        skipped = 0
+        if os.path.isfile(skipped_path):
+            with open(skipped_path, encoding="utf-8") as f:
+                skipped = sum(1 for _ in f)
+    stats = {"elapsed_s": elapsed, "urls": urls, "skipped": skipped,
+             # Termasuk proses parse worker (anak terbesar)
+             "peak_rss_mb": max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024}
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f)
+
+
+def run_case(site, depth, concurrency, extractor, bloom, repeat, workers=0, dedup="near"):
+    runs = []
+    for _ in range(repeat):
+        before = site.requests
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            result_path = tmp.name
+        try:
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--child", site.url, str(depth),
+                            str(concurrency), extractor, str(bloom or 0), str(workers), dedup, result_path],
+                           check=True)
+            with open(result_path, encoding="utf-8") as f:
+                stats = json.load(f)
+        finally:
+            os.remove(result_path)
+        stats["pages"] = site.requests - before
+        runs.append(stats)
+    elapsed = median([r["elapsed_s"] for r in runs])
+    pages = runs[0]["pages"]
+    return {"pages": pages, "urls": runs[0]["urls"], "skipped": runs[0]["skipped"], "elapsed_s": round(elapsed, 4),
+            "pages_per_s": round(pages / elapsed, 1),
+            "peak_rss_mb": round(max(r["peak_rss_mb"] for r in runs), 1)}
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        url, depth, concurrency, extractor, bloom, workers, dedup, result_path = sys.argv[2:10]
+        crawl_once(url, int(depth), int(concurrency), extractor, int(bloom), int(workers), dedup, result_path)
+        return
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=2000)
+    ap.add_argument("--depth", type=int, default=4)
+    ap.add_argument("--fanout", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.005, help="detik per request")
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--dup", type=float, default=0.5, help="rasio link duplikat per halaman")
+    ap.add_argument("--page-bytes", type=int, default=4096)
+    ap.add_argument("--markup", type=int, default=0, help="elemen HTML tambahan per halaman")
+    ap.add_argument("--concurrency", default="10,50")
+    ap.add_argument("--extractor", default="stream")
+    ap.add_argument("--bloom", type=int, default=0, help="kapasitas Bloom filter (0 = set biasa)")
+    ap.add_argument("--workers", default="0", help="daftar jumlah proses parse, mis. 0,1,2,4")
+    ap.add_argument("--traps", action="store_true", help="tambahkan crawler trap ke situs sintetis")
+    ap.add_argument("--dedup", default="near", help="daftar mode dedup crawler, mis. off,near")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--save", metavar="NAME", help="simpan hasil ke bench/results/NAME.json")
+    ap.add_argument("--compare", metavar="FILE", help="file hasil sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    shape = SiteShape(pages=args.pages, depth=args.depth, fanout=args.fanout, latency=args.latency,
+                      jitter=args.jitter, dup_ratio=args.dup, page_bytes=args.page_bytes, markup=args.markup,
+                      traps=args.traps)
+    results = {}
+    with SyntheticSite(shape) as site:
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            for workers in (int(w) for w in args.workers.split(",")):
+                for dedup in args.dedup.split(","):
+                    case = f"crawl_c{concurrency}_{args.extractor}" + ("_bloom" if args.bloom else "") + \
+                        (f"_w{workers}" if workers else "") + (f"_dedup-{dedup}" if dedup != "near" else "")
+                    console.print(f"[cyan]{case}: {shape.pages} halaman, {args.repeat}x[/cyan]")
+                    results[case] = run_case(site, shape.depth, concurrency, args.extractor, args.bloom,
+                                             args.repeat, workers, dedup)
+    results["_site"] = shape.to_dict()
+
+    t = Table(title=f"SimpleCrawler ({shape.pages} pages, depth {shape.depth}, fan-out {shape.fanout}, "
+                    f"latency {shape.latency * 1000:.0f} ms)")
+    for col in ("Case", "Pages", "URLs", "Skipped", "Median s", "Pages/s", "Peak RSS MB"):
+        t.add_column(col, justify="left" if col == "Case" else "right")
+    for case, r in results.items():
+        if not case.startswith("_"):
+            t.add_row(case, str(r["pages"]), str(r["urls"]), str(r["skipped"]), f"{r['elapsed_s']:.2f}",
+                      f"{r['pages_per_s']:,.0f}", f"{r['peak_rss_mb']:.1f}")
+    console.print(t)
+
+    if args.save:
+        console.print(f"[green]Hasil disimpan ke {save_results(args.save, results)}[/green]")
+    if args.compare and not report_comparison(console, args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
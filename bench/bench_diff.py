@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Benchmark: run-over-run diff (snapshot, key build via external sort, streaming merge) pada report besar.
+#   python bench/bench_diff.py [--lines 2000000] [--churn 5] [--save NAME] [--compare FILE]
+# peak_mb adalah puncak alokasi Python (tracemalloc) saat build key + diff; harus tetap kecil berapa pun --lines.
+import os, sys, time, random, argparse, tempfile, tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from bench.harness import save_results, report_comparison
+from plugins.runs import RunStore
+
+console = Console()
+
+
+def write_report(path, names):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{n}\n" for n in names)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lines", type=int, default=2_000_000)
+    ap.add_argument("--churn", type=float, default=5.0, help="persen baris yang hilang/baru di run kedua")
+    ap.add_argument("--save", metavar="NAME", help="simpan hasil ke bench/results/NAME.json")
+    ap.add_argument("--compare", metavar="FILE", help="file hasil sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    rnd = random.Random(1)
+    changed = int(args.lines * args.churn / 100)
+    old = [f"h{i:08d}.example.com" for i in rnd.sample(range(args.lines * 2), args.lines)]
+    removed = set(old[:changed])
+    new = old[changed:] + [f"n{i:08d}.example.com" for i in range(changed)]
+    rnd.shuffle(new)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RunStore(root=os.path.join(tmp, "runs"))
+        report = os.path.join(tmp, "subfinder_example.com.txt")
+        timings = {}
+        for label, names in (("old", old), ("new", new)):
+            write_report(report, names)
+            start = time.perf_counter()
+            store.record(report)
+            timings[f"record_{label}_s"] = time.perf_counter() - start
+        del old, new
+
+        start = time.perf_counter()
+        for run in store.runs(report):
+            store.keys(report, run)
+        keys = time.perf_counter() - start
+        start = time.perf_counter()
+        diff = store.diff(report)
+        merge = time.perf_counter() - start
+
+        # Ulangi tanpa key yang sudah jadi, kali ini dengan tracemalloc (lebih lambat)
+        for run in store.runs(report):
+            os.remove(os.path.join(store.root, os.path.basename(report), f"{run}.keys"))
+        tracemalloc.start()
+        store.diff(report)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        with open(diff["removed_path"], encoding="utf-8") as f:
+            correct = diff["added"] == changed and {line.rstrip("\n") for line in f} == removed
+
+    results = {"diff": {
+        "lines": args.lines, "added": diff["added"], "removed": diff["removed"], "correct": int(correct),
+        "record_s": round(timings["record_new_s"], 3), "keys_s": round(keys, 3), "diff_s": round(merge, 3),
+        "lines_per_s": round(2 * args.lines / (keys + merge), 1), "peak_mb": round(peak / 1024 ** 2, 1),
+    }}
+
+    t = Table(title=f"Run diff ({args.lines:,} lines, {args.churn}% churn)")
+    t.add_column("Metric")
+    t.add_column("Value", justify="right")
+    for metric, value in results["diff"].items():
+        t.add_row(metric, f"{value:,}")
+    console.print(t)
+
+    if args.save:
+        console.print(f"[green]Hasil disimpan ke {save_results(args.save, results)}[/green]")
+    if args.compare and not report_comparison(console, args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
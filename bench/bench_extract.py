@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Benchmark: pages parsed per second per link extractor on a local corpus of HTML files.
+#   python bench/bench_extract.py [corpus_dir] [--repeat 3]
+# Tanpa corpus_dir, corpus sintetis dibuat di folder sementara.
+import os, sys, time, glob, random, argparse, tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from plugins.extract import EXTRACTORS
+
+console = Console()
+
+
+def make_corpus(path, pages=200, links=150):
+    rnd = random.Random(1)
+    for i in range(pages):
+        body = []
+        for _ in range(links):
+            body.append(f'<div class="row"><p>{"lorem ipsum " * rnd.randint(5, 40)}</p>'
+                        f'<a href="/item/{rnd.randint(0, 10000)}?ref={i}">item</a></div>')
+        body.append(f'<form action="/search?p={i}"><input name="q"></form>')
+        with open(os.path.join(path, f"page{i}.html"), "w", encoding="utf-8") as f:
+            f.write(f"<html><head><script>{'var x=1;' * 500}</script></head><body>{''.join(body)}</body></html>")
+
+
+def bench(name, cls, pages, repeat):
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            ex = cls("http://bench.local/")
+            # Feed in 64 KiB chunks like the crawler does
+            for i in range(0, len(html), 65536):
+                ex.feed(html[i:i + 65536])
+            ex.result()
+        best = max(best, len(pages) / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("corpus", nargs="?", help="folder berisi file *.html")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus
+        if not corpus:
+            corpus = tmp
+            make_corpus(corpus)
+        files = glob.glob(os.path.join(corpus, "**", "*.htm*"), recursive=True)
+        pages = [open(f, encoding="utf-8", errors="replace").read() for f in files]
+        if not pages:
+            console.print(f"[red]Tidak ada file HTML di {corpus}[/red]")
+            return
+
+        mb = sum(len(p) for p in pages) / 1e6
+        t = Table(title=f"Link extraction ({len(pages)} pages, {mb:.1f} MB)")
+        t.add_column("Extractor")
+        t.add_column("Pages/s", justify="right")
+        t.add_column("MB/s", justify="right")
+        for name, cls in EXTRACTORS.items():
+            try:
+                rate = bench(name, cls, pages, args.repeat)
+            except ImportError as e:
+                t.add_row(name, "-", f"[red]{e}[/red]")
+                continue
+            t.add_row(name, f"{rate:,.0f}", f"{rate * mb / len(pages):,.1f}")
+        console.print(t)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Benchmark: SimpleFuzzer requests/s and accuracy against a local content-discovery target.
+#   python bench/bench_fuzz.py [--words 20000] [--hits 1] [--concurrency 50,200] [--save NAME]
+# Kasus "soft404" memakai server yang menjawab 200 untuk semua path, untuk menguji auto-calibration.
+import os, sys, time, random, argparse, tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from bench.harness import FuzzTarget, save_results, report_comparison
+from plugins.fuzz_ffuf import FFUF
+
+console = Console()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--words", type=int, default=20000)
+    ap.add_argument("--hits", type=float, default=1.0, help="persen kata yang benar-benar ada")
+    ap.add_argument("--concurrency", default="50,200")
+    ap.add_argument("--latency", type=float, default=0.0, help="detik per request di server")
+    ap.add_argument("--save", metavar="NAME", help="simpan hasil ke bench/results/NAME.json")
+    ap.add_argument("--compare", metavar="FILE", help="file hasil sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    from plugins.fuzz_simple import SimpleFuzzer
+    rnd = random.Random(1)
+    words = [f"w{i:06d}" for i in range(args.words)]
+    hidden = set(rnd.sample(words, max(1, int(args.words * args.hits / 100))))
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        wordlist = os.path.join(tmp, "words.txt")
+        with open(wordlist, "w", encoding="utf-8") as f:
+            f.writelines(w + "\n" for w in words)
+        os.chdir(tmp)
+        try:
+            for soft_404 in (False, True):
+                with FuzzTarget(hidden, soft_404=soft_404, latency=args.latency) as target:
+                    for concurrency in (int(c) for c in args.concurrency.split(",")):
+                        case = f"{'soft404' if soft_404 else 'plain'}_c{concurrency}"
+                        console.print(f"[cyan]{case}...[/cyan]")
+                        start = time.perf_counter()
+                        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                            # rate=0: ukur engine-nya, bukan ramp-up rate limiter adaptif
+                            out = SimpleFuzzer().run(target.url, wordlist, out_dir="reports",
+                                                     concurrency=concurrency, rate=0, force=True)
+                        elapsed = time.perf_counter() - start
+                        found = {r["input"]["FUZZ"] for r in FFUF.iter_results(out)}
+                        results[case] = {
+                            "requests": len(words), "hits": len(found), "expected": len(hidden),
+                            "false_positives": len(found - hidden), "missed": len(hidden - found),
+                            "elapsed_s": round(elapsed, 4), "req_per_s": round(len(words) / elapsed, 1),
+                        }
+        finally:
+            os.chdir(cwd)
+
+    t = Table(title=f"SimpleFuzzer ({len(words)} words, {len(hidden)} real paths)")
+    for col in ("Case", "Hits", "False +", "Missed", "Seconds", "Req/s"):
+        t.add_column(col, justify="left" if col == "Case" else "right")
+    for case, r in results.items():
+        t.add_row(case, str(r["hits"]), str(r["false_positives"]), str(r["missed"]),
+                  f"{r['elapsed_s']:.2f}", f"{r['req_per_s']:,.0f}")
+    console.print(t)
+
+    if args.save:
+        console.print(f"[green]Hasil disimpan ke {save_results(args.save, results)}[/green]")
+    if args.compare and not report_comparison(console, args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
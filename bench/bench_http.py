@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Benchmark: shared HTTP client - banyak stage kecil (crawl + fuzz) berturut-turut ke host yang sama,
+# "cold" (pool ditutup sebelum setiap stage, seperti session per run dulu) vs "warm" (koneksi dipakai ulang).
+#   python bench/bench_http.py [--stages 10] [--pages 50] [--words 200] [--connect-delay 0.05] [--save NAME]
+# --connect-delay meniru biaya handshake (RTT + TLS) per koneksi baru, yang di localhost hampir nol.
+import os, sys, time, argparse, tempfile
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from bench.harness import SiteShape, SyntheticSite, FuzzTarget, save_results, report_comparison
+
+console = Console()
+
+
+def run_stages(site, target, wordlist, stages, concurrency, warm):
+    from plugins.http import get_http_client
+    from plugins.crawl_simple import SimpleCrawler
+    from plugins.fuzz_simple import SimpleFuzzer
+    client = get_http_client()
+    client.close()
+    site.connections = target.connections = 0
+    requests = site.requests + target.requests
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(stages):
+            if not warm:
+                client.close()
+            SimpleCrawler().run(site.url, out_dir="reports", depth=3, concurrency=concurrency, per_host_rate=0,
+                                dedup="off", force=True)
+            if not warm:
+                client.close()
+            SimpleFuzzer().run(target.url, wordlist, out_dir="reports", concurrency=concurrency, rate=0,
+                               force=True)
+    elapsed = time.perf_counter() - start
+    requests = site.requests + target.requests - requests
+    return {"stages": stages, "requests": requests, "connections": site.connections + target.connections,
+            "elapsed_s": round(elapsed, 4), "req_per_s": round(requests / elapsed, 1)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stages", type=int, default=10, help="jumlah pasangan crawl + fuzz berturut-turut")
+    ap.add_argument("--pages", type=int, default=50)
+    ap.add_argument("--words", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=10)
+    ap.add_argument("--connect-delay", type=float, default=0.05, help="detik per koneksi baru di server")
+    ap.add_argument("--save", metavar="NAME", help="simpan hasil ke bench/results/NAME.json")
+    ap.add_argument("--compare", metavar="FILE", help="file hasil sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, \
+            SyntheticSite(SiteShape(pages=args.pages, depth=3), connect_delay=args.connect_delay) as site, \
+            FuzzTarget({f"w{i:05d}" for i in range(0, args.words, 50)}, connect_delay=args.connect_delay) as target:
+        wordlist = os.path.join(tmp, "words.txt")
+        with open(wordlist, "w", encoding="utf-8") as f:
+            f.writelines(f"w{i:05d}\n" for i in range(args.words))
+        os.chdir(tmp)
+        try:
+            for case in ("cold", "warm"):
+                console.print(f"[cyan]{case}...[/cyan]")
+                results[case] = run_stages(site, target, wordlist, args.stages, args.concurrency, case == "warm")
+        finally:
+            os.chdir(cwd)
+
+    t = Table(title=f"Shared HTTP client ({args.stages} x crawl {args.pages} pages + fuzz {args.words} words, "
+                    f"handshake {args.connect_delay * 1000:.0f} ms)")
+    for col in ("Case", "Requests", "Connections", "Seconds", "Req/s"):
+        t.add_column(col, justify="left" if col == "Case" else "right")
+    for case, r in results.items():
+        t.add_row(case, f"{r['requests']:,}", f"{r['connections']:,}", f"{r['elapsed_s']:.2f}",
+                  f"{r['req_per_s']:,.0f}")
+    console.print(t)
+
+    if args.save:
+        console.print(f"[green]Hasil disimpan ke {save_results(args.save, results)}[/green]")
+    if args.compare and not report_comparison(console, args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
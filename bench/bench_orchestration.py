@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Benchmark: orchestration overhead with stub tools (bench/stubs) instead of the real binaries.
+#   python bench/bench_orchestration.py [--jobs 50] [--domains 20] [--repeat 3] [--save NAME] [--compare FILE]
+# Stub tidak melakukan apa-apa (BENCH_STUB_DELAY=0), jadi waktu yang terukur adalah biaya
+# orkestrasi: spawn proses, executor, cache, metrics, batch fan-out dan pipeline.
+import os, sys, time, argparse, tempfile, subprocess
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from bench.harness import SiteShape, SyntheticSite, use_stubs, median, save_results, report_comparison
+
+console = Console()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_spawn(jobs):
+    """Baseline: bare subprocess.run of a stub, no executor"""
+    elapsed = timed(lambda: [subprocess.run("nmap -version", shell=True, stdout=subprocess.DEVNULL)
+                             for _ in range(jobs)])
+    return {"job_ms": round(elapsed / jobs * 1000, 2)}
+
+
+def bench_executor(jobs):
+    """Same command through the shared executor: serial (overhead) and parallel (jobs/s)"""
+    from plugins.executor import Executor
+    ex = Executor(max_workers=16, tool_limits={"nmap": 16})
+    serial = timed(lambda: [ex.submit("nmap -version", "nmap", capture=True).wait() for _ in range(jobs)])
+
+    def parallel():
+        for job in [ex.submit("nmap -version", "nmap", capture=True) for _ in range(jobs)]:
+            job.wait()
+    par = timed(parallel)
+    return {"job_ms": round(serial / jobs * 1000, 2), "jobs_per_s": round(jobs / par, 1)}
+
+
+def bench_plugin(jobs):
+    """Full Plugin.run path (command, cache store, metrics), then the cache-hit path"""
+    from plugins.scan_nmap import Nmap
+    nmap = Nmap()
+    miss = timed(lambda: [nmap.run(f"host{i}.bench", scan_type="fast", force=True) for i in range(jobs)])
+    hit = timed(lambda: [nmap.run(f"host{i}.bench", scan_type="fast") for i in range(jobs)])
+    return {"run_ms": round(miss / jobs * 1000, 2), "cache_hit_ms": round(hit / jobs * 1000, 2)}
+
+
+def bench_batch(domains, subdomains):
+    """BatchRunner fan-out: subfinder per domain, nmap + nuclei per discovered host"""
+    from plugins.batch import BatchRunner
+    from plugins.recon_subfinder import Subfinder
+    from plugins.scan_nmap import Nmap
+    from plugins.scan_nuclei import Nuclei
+    from plugins.cache import get_cache
+    get_cache().clear()  # setiap percobaan harus benar-benar menjalankan tool
+    os.environ["BENCH_SUBDOMAINS"] = str(subdomains)
+    names = [f"d{i}.bench" for i in range(domains)]
+    runner = BatchRunner(Subfinder(), Nmap(), Nuclei())
+    start = time.perf_counter()
+    runner.run(names, name="bench")
+    elapsed = time.perf_counter() - start
+    return {"jobs": runner.progress.done, "elapsed_s": round(elapsed, 3),
+            "jobs_per_s": round(runner.progress.done / elapsed, 1)}
+
+
+def bench_pipeline(shape):
+    """Crawl ➜ nuclei pipeline vs crawl alone on the synthetic site"""
+    from plugins.crawl_simple import SimpleCrawler
+    from plugins.scan_nuclei import Nuclei
+    from plugins.pipeline import crawl_scan_pipeline
+    crawler = SimpleCrawler()
+    with SyntheticSite(shape) as site:
+        crawl = timed(lambda: crawler.run(site.url, depth=shape.depth, per_host_rate=0, force=True))
+        original_run = crawler.run
+        crawler.run = lambda *a, **kw: original_run(*a, **{**kw, "per_host_rate": 0, "force": True})
+        piped = timed(lambda: crawl_scan_pipeline(crawler, Nuclei(), site.url, depth=shape.depth,
+                                                  batch_size=100, batch_interval=1.0))
+    return {"crawl_s": round(crawl, 3), "pipeline_s": round(piped, 3), "overhead_s": round(piped - crawl, 3)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=50, help="job per kasus executor/plugin")
+    ap.add_argument("--domains", type=int, default=20)
+    ap.add_argument("--subdomains", type=int, default=5)
+    ap.add_argument("--pages", type=int, default=500, help="ukuran situs untuk kasus pipeline")
+    ap.add_argument("--repeat", type=int, default=3, help="median dari N percobaan per kasus")
+    ap.add_argument("--save", metavar="NAME", help="simpan hasil ke bench/results/NAME.json")
+    ap.add_argument("--compare", metavar="FILE", help="file hasil sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    use_stubs(delay=0.0)
+    results = {}
+    cases = [
+        ("spawn", lambda: bench_spawn(args.jobs)),
+        ("executor", lambda: bench_executor(args.jobs)),
+        ("plugin", lambda: bench_plugin(args.jobs)),
+        ("batch", lambda: bench_batch(args.domains, args.subdomains)),
+        ("pipeline", lambda: bench_pipeline(SiteShape(pages=args.pages, depth=4, fanout=8))),
+    ]
+    cwd = os.getcwd()
+    # Report, cache dan metrics ditulis ke folder sementara, bukan ke reports/ proyek
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for name, fn in cases:
+                console.print(f"[cyan]{name}...[/cyan]")
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    samples = [fn() for _ in range(args.repeat)]
+                results[name] = {m: round(median([s[m] for s in samples]), 4) for m in samples[0]}
+        finally:
+            os.chdir(cwd)
+
+    t = Table(title="Orchestration overhead (stub tools)")
+    t.add_column("Case")
+    t.add_column("Metric")
+    t.add_column("Value", justify="right")
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            t.add_row(case, metric, f"{value:,}")
+    console.print(t)
+
+    if args.save:
+        console.print(f"[green]Hasil disimpan ke {save_results(args.save, results)}[/green]")
+    if args.compare and not report_comparison(console, args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
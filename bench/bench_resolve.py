@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# Benchmark: DNS resolution stage (names/s) against a local stub DNS server.
+#   python bench/bench_resolve.py [--names 5000] [--concurrency 50,200] [--delay 0.001] [--save NAME]
+# Sepertiga nama hidup, sepertiga di bawah zona wildcard, sisanya NXDOMAIN.
+import os, sys, time, asyncio, argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from bench.harness import StubDNSServer, save_results, report_comparison
+from plugins.resolve import TTLCache, resolve_hosts
+import plugins.resolve as resolve
+
+console = Console()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--names", type=int, default=5000)
+    ap.add_argument("--ips", type=int, default=200, help="jumlah IP berbeda untuk nama yang hidup")
+    ap.add_argument("--concurrency", default="50,200")
+    ap.add_argument("--delay", type=float, default=0.0, help="detik per jawaban di server stub")
+    ap.add_argument("--save", metavar="NAME", help="simpan hasil ke bench/results/NAME.json")
+    ap.add_argument("--compare", metavar="FILE", help="file hasil sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    third = args.names // 3
+    live = {f"h{i}.bench.test": [f"10.0.{i % args.ips // 256}.{i % args.ips % 256}"] for i in range(third)}
+    names = list(live) + [f"w{i}.wild.bench.test" for i in range(third)] + \
+        [f"gone{i}.bench.test" for i in range(args.names - 2 * third)]
+
+    results = {}
+    with StubDNSServer(live, wildcards={"wild.bench.test": ["10.9.9.9"]}, delay=args.delay) as dns:
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            resolve._shared_cache = TTLCache()  # mulai dingin setiap kasus
+            start = time.perf_counter()
+            res = asyncio.run(resolve_hosts(names, f"127.0.0.1:{dns.port}", concurrency=concurrency,
+                                            root="bench.test"))
+            elapsed = time.perf_counter() - start
+            results[f"resolve_c{concurrency}"] = {
+                "names": len(names), "live": len(res.live), "targets": len(res.targets()),
+                "wildcard": len(res.wildcard), "failed": len(res.failed),
+                "elapsed_s": round(elapsed, 4), "names_per_s": round(len(names) / elapsed, 1),
+            }
+
+    t = Table(title=f"DNS resolution ({len(names)} names, stub server)")
+    for col in ("Case", "Live", "Targets", "Wildcard", "Timeout", "Seconds", "Names/s"):
+        t.add_column(col, justify="left" if col == "Case" else "right")
+    for case, r in results.items():
+        t.add_row(case, str(r["live"]), str(r["targets"]), str(r["wildcard"]), str(r["failed"]),
+                  f"{r['elapsed_s']:.2f}", f"{r['names_per_s']:,.0f}")
+    console.print(t)
+
+    if args.save:
+        console.print(f"[green]Hasil disimpan ke {save_results(args.save, results)}[/green]")
+    if args.compare and not report_comparison(console, args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
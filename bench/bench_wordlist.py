@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Benchmark: wordlist index build (dedup + normalisasi), cached open, iterasi dan sharding.
+#   python bench/bench_wordlist.py [--lines 1000000] [--dup 0.4] [--sources 2] [--save NAME] [--compare FILE]
+# peak_mb adalah puncak alokasi Python (tracemalloc) saat build; harus tetap kecil berapa pun --lines.
+import os, sys, time, random, argparse, tempfile, tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rich.console import Console
+from rich.table import Table
+from bench.harness import save_results, report_comparison
+from plugins.wordlist import Wordlist
+
+console = Console()
+
+
+def make_sources(tmp, lines, dup, sources):
+    """`sources` files; a share `dup` of all lines repeats an earlier word, some lines are blank/comments"""
+    distinct = max(1, int(lines * (1 - dup)))
+    paths = []
+    per_file = lines // sources
+    for s in range(sources):
+        path = os.path.join(tmp, f"list{s}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(per_file):
+                n = random.randrange(distinct)
+                f.write(f"/path{n}\n" if i % 50 else ("# comment\n" if i % 100 else "\n"))
+        paths.append(path)
+    return paths
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lines", type=int, default=1_000_000)
+    ap.add_argument("--dup", type=float, default=0.4, help="bagian baris duplikat")
+    ap.add_argument("--sources", type=int, default=2, help="jumlah file yang digabung")
+    ap.add_argument("--shards", type=int, default=8)
+    ap.add_argument("--chunk", type=int, default=500_000, help="baris per chunk external sort")
+    ap.add_argument("--save", metavar="NAME", help="simpan hasil ke bench/results/NAME.json")
+    ap.add_argument("--compare", metavar="FILE", help="file hasil sebelumnya untuk dibandingkan")
+    ap.add_argument("--tolerance", type=float, default=0.10)
+    args = ap.parse_args()
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        console.print("[cyan]Membuat wordlist sintetis...[/cyan]")
+        paths = make_sources(tmp, args.lines, args.dup, args.sources)
+
+        start = time.perf_counter()
+        wl = Wordlist(paths, cache_dir=os.path.join(tmp, "cache"), chunk_lines=args.chunk)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Wordlist(paths, cache_dir=os.path.join(tmp, "cache"), chunk_lines=args.chunk).close()
+        cached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count = sum(1 for _ in wl)
+        iterate = time.perf_counter() - start
+
+        start = time.perf_counter()
+        wl.write_shards(args.shards, os.path.join(tmp, "shards"))
+        shard = time.perf_counter() - start
+        wl.close()
+
+        tracemalloc.start()
+        Wordlist(paths, cache_dir=os.path.join(tmp, "cache_mem"), chunk_lines=args.chunk).close()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    results = {"wordlist": {
+        "lines": args.lines, "unique": count,
+        "build_s": round(build, 3), "cached_open_ms": round(cached * 1000, 3),
+        "iterate_s": round(iterate, 3), "words_per_s": round(count / iterate, 1),
+        "write_shards_s": round(shard, 3), "peak_mb": round(peak / 1024 ** 2, 1),
+    }}
+
+    t = Table(title=f"Wordlist index ({args.lines:,} lines, {args.sources} files)")
+    t.add_column("Metric")
+    t.add_column("Value", justify="right")
+    for metric, value in results["wordlist"].items():
+        t.add_row(metric, f"{value:,}")
+    console.print(t)
+
+    if args.save:
+        console.print(f"[green]Hasil disimpan ke {save_results(args.save, results)}[/green]")
+    if args.compare and not report_comparison(console, args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+# bench/harness.py
+# Shared pieces for the offline benchmarks: a synthetic website served from
+# localhost, stub tool binaries on PATH, and JSON results for regression checks.
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import weakref
+import platform
+import threading
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+STUBS_DIR = os.path.join(BENCH_DIR, "stubs")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+class SiteShape:
+    """Layout of a synthetic site: a tree of `pages` nodes, `fanout` children per page.
+
+    Pages deeper than `depth` are not generated. `dup_ratio` adds that share of
+    extra links pointing at random existing pages (half of them as variants
+    with a fragment or reordered query) so URL deduplication gets exercised.
+    `markup` adds that many nested elements and an inline script per page to
+    make parsing, not the network, the expensive part. `traps` adds crawler
+    traps: an endless calendar, session-ID variants of links and a site that
+    answers 200 "not found" (soft-404) for unknown paths.
+    """
+
+    def __init__(self, pages=2000, depth=6, fanout=8, latency=0.0, jitter=0.0, dup_ratio=0.5,
+                 page_bytes=4096, markup=0, traps=False, seed=1):
+        self.depth = depth
+        self.fanout = fanout
+        self.latency = latency
+        self.jitter = jitter
+        self.dup_ratio = dup_ratio
+        self.page_bytes = page_bytes
+        self.markup = markup
+        self.traps = traps
+        self.seed = seed
+        # Jumlah node pohon sampai kedalaman `depth`
+        reachable, level = 1, 1
+        for _ in range(depth):
+            level *= fanout
+            reachable += level
+        self.pages = min(pages, reachable)
+
+    def children(self, i: int):
+        first = i * self.fanout + 1
+        return range(first, min(first + self.fanout, self.pages))
+
+    def links(self, i: int):
+        rnd = random.Random(self.seed * 1_000_003 + i)
+        links = [f"/p/{c}?a=1&b=2" for c in self.children(i)]
+        for _ in range(round(max(len(links), 1) * self.dup_ratio)):
+            target = rnd.randrange(self.pages)
+            variant = rnd.random()
+            if variant < 0.25:
+                links.append(f"/p/{target}?a=1&b=2#frag{rnd.randrange(100)}")
+            elif variant < 0.5:
+                links.append(f"/p/{target}?b=2&a=1")
+            else:
+                links.append(f"/p/{target}?a=1&b=2")
+        if self.traps:
+            children = self.children(i)
+            links.append(f"/cal/{i % 12}")
+            links.append(f"/missing/x{i}")
+            if children:
+                links.append(f"/p/{children[0]}?a=1&b=2&sid={rnd.getrandbits(64):016x}")
+        return links
+
+    def render_calendar(self, n: int) -> str:
+        days = " ".join(str(d) for d in range(1, 31))
+        return (f"<html><head><title>Calendar</title></head><body><h1>Events in month {n}</h1>"
+                f"<p>{days}</p><p>No events are scheduled for this month. Browse the previous or next "
+                f"month, or return to the home page of the site.</p><a href='/cal/{max(0, n - 1)}'>prev</a>"
+                f"<a href='/cal/{n + 1}'>next</a><a href='/p/0'>home</a></body></html>")
+
+    @staticmethod
+    def render_not_found(path: str) -> str:
+        return (f"<html><body><h1>Oops</h1><p>The page {path} could not be found on this server. "
+                f"Check the address or start again from the home page.</p><a href='/p/0'>home</a></body></html>")
+
+    def render(self, i: int) -> str:
+        anchors = "".join(f'<li><a href="{u}">link</a></li>' for u in self.links(i))
+        filler = "lorem ipsum dolor sit amet " * max(0, self.page_bytes // 27)
+        topics = " ".join(f"topic{(i * 7919 + k * 104729) % 1000003}" for k in range(12))
+        markup = "".join(f'<div class="row r{n}"><span data-n="{n}">item &amp; {n}</span><img src="/i/{n}.png" '
+                         f'alt="x"></div>' for n in range(self.markup))
+        script = f"<script>var data = {list(range(self.markup))};</script>" if self.markup else ""
+        return (f"<html><head><title>page {i}</title>{script}</head><body><ul>{anchors}</ul>{markup}"
+                f'<p>{topics}</p><p>{filler}</p><form action="/search?from={i}"><input name="q"></form></body></html>')
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in
+                ("pages", "depth", "fanout", "latency", "jitter", "dup_ratio", "page_bytes", "markup", "traps",
+                 "seed")}
+
+
+class SyntheticSite:
+    """aiohttp server for a SiteShape on 127.0.0.1, running in a background thread.
+
+        with SyntheticSite(SiteShape(pages=500)) as site:
+            crawl(site.url)
+    """
+
+    def __init__(self, shape: SiteShape, host="127.0.0.1", port=0, connect_delay=0.0):
+        self.shape = shape
+        self.host = host
+        self.port = port
+        self.connect_delay = connect_delay  # detik tambahan untuk request pertama per koneksi (mis. TLS)
+        self.requests = 0
+        self.connections = 0
+        self._transports = weakref.WeakSet()
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/p/0"
+
+    async def _page(self, request):
+        from aiohttp import web
+        self.requests += 1
+        i = int(request.match_info["i"])
+        if i >= self.shape.pages:
+            raise web.HTTPNotFound()
+        delay = self.shape.latency + (random.random() * self.shape.jitter if self.shape.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        return web.Response(text=self.shape.render(i), content_type="text/html")
+
+    def routes(self, app):
+        from aiohttp import web
+
+        async def search(request):
+            return web.Response(text="ok")
+
+        async def calendar(request):
+            self.requests += 1
+            return web.Response(text=self.shape.render_calendar(int(request.match_info["n"])),
+                                content_type="text/html")
+
+        async def not_found(request):
+            self.requests += 1
+            return web.Response(text=self.shape.render_not_found(request.path), content_type="text/html")
+        app.router.add_get("/p/{i}", self._page)
+        app.router.add_get("/search", search)
+        if self.shape.traps:
+            app.router.add_get(r"/cal/{n:\d+}", calendar)
+            app.router.add_get("/{tail:.*}", not_found)
+
+    async def _start(self, sock):
+        from aiohttp import web
+
+        @web.middleware
+        async def handshake(request, handler):
+            # Koneksi baru: tiru biaya handshake (RTT + TLS) yang di localhost hampir nol
+            transport = request.transport
+            if transport not in self._transports:
+                self._transports.add(transport)
+                self.connections += 1
+                if self.connect_delay:
+                    await asyncio.sleep(self.connect_delay)
+            return await handler(request)
+        app = web.Application(middlewares=[handshake])
+        self.routes(app)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.SockSite(self._runner, sock).start()
+
+    def _serve(self, sock):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._start(sock))
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, args=(sock,), name="synthetic-site", daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FuzzTarget(SyntheticSite):
+    """Content-discovery target: only `paths` exist (and `params` on /search).
+
+    With `soft_404` every other path answers 200 with a "not found" page that
+    echoes the path (so its size varies), like many real applications.
+    """
+
+    def __init__(self, paths=(), params=(), soft_404=False, latency=0.0, host="127.0.0.1", port=0,
+                 connect_delay=0.0):
+        super().__init__(SiteShape(pages=1, latency=latency), host, port, connect_delay)
+        self.paths = set(paths)
+        self.params = set(params)
+        self.soft_404 = soft_404
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def routes(self, app):
+        from aiohttp import web
+
+        async def handle(request):
+            self.requests += 1
+            if self.shape.latency:
+                await asyncio.sleep(self.shape.latency)
+            name = request.path.strip("/")
+            if request.path == "/search":
+                if self.params & set(request.query):
+                    return web.Response(text="<html><body>search results for you</body></html>",
+                                        content_type="text/html")
+                return web.Response(text="<html><body>no query</body></html>", content_type="text/html")
+            if name in self.paths:
+                return web.Response(text=f"<html><body><h1>{name}</h1>{'content ' * 50}</body></html>",
+                                    content_type="text/html")
+            if self.soft_404:
+                return web.Response(text=f"<html><body>Page {request.path} not found</body></html>",
+                                    content_type="text/html")
+            raise web.HTTPNotFound()
+        app.router.add_route("GET", "/{tail:.*}", handle)
+
+
+class StubDNSServer:
+    """UDP DNS server on 127.0.0.1 answering A queries from fixed tables, in a background thread.
+
+    `records` maps names to address lists, `wildcards` maps zones to the
+    addresses every other name under them resolves to (like `*.zone`), and
+    `cnames` maps aliases to their target name. Everything else is NXDOMAIN.
+    `drop` is the share of queries silently ignored, to exercise retries;
+    names in `silent` are never answered (a resolver that times out).
+    """
+
+    def __init__(self, records=None, wildcards=None, cnames=None, ttl=300, delay=0.0, drop=0.0,
+                 host="127.0.0.1", port=0, silent=()):
+        self.records = {k.lower(): v for k, v in (records or {}).items()}
+        self.wildcards = {k.lower(): v for k, v in (wildcards or {}).items()}
+        self.cnames = {k.lower(): v.lower() for k, v in (cnames or {}).items()}
+        self.ttl = ttl
+        self.delay = delay
+        self.drop = drop
+        self.silent = {n.lower() for n in silent}
+        self.host = host
+        self.port = port
+        self.queries = 0
+        self._sock = None
+        self._thread = None
+
+    def lookup(self, name: str):
+        if name in self.records:
+            return self.records[name]
+        labels = name.split(".")
+        for i in range(1, len(labels)):
+            zone = ".".join(labels[i:])
+            if zone in self.wildcards:
+                return self.wildcards[zone]
+        return None
+
+    def _answer(self, data: bytes) -> bytes:
+        import struct
+        qid = struct.unpack(">H", data[:2])[0]
+        offset, labels = 12, []
+        while data[offset]:
+            labels.append(data[offset + 1:offset + 1 + data[offset]].decode("ascii"))
+            offset += 1 + data[offset]
+        question = data[12:offset + 5]
+        qtype = struct.unpack(">H", data[offset + 1:offset + 3])[0]
+        name = ".".join(labels).lower()
+        if name in self.silent:
+            return None
+
+        answers = []
+        if name in self.cnames:
+            target = self.cnames[name]
+            rdata = b"".join(bytes([len(l)]) + l.encode() for l in target.split(".")) + b"\0"
+            answers.append(struct.pack(">HHHIH", 0xC00C, 5, 1, self.ttl, len(rdata)) + rdata)
+            name = target
+        ips = self.lookup(name)
+        if ips is None and not answers:
+            return struct.pack(">HHHHHH", qid, 0x8183, 1, 0, 0, 0) + question  # NXDOMAIN
+        if qtype == 1 and not (answers and name in self.cnames):
+            for ip in ips or []:
+                answers.append(struct.pack(">HHHIH", 0xC00C, 1, 1, self.ttl, 4) + socket.inet_aton(ip))
+        return struct.pack(">HHHHHH", qid, 0x8180, 1, len(answers), 0, 0) + question + b"".join(answers)
+
+    def _serve(self):
+        while True:
+            try:
+                data, addr = self._sock.recvfrom(512)
+            except socket.timeout:
+                continue  # close() dari thread lain tidak membangunkan recvfrom; cek ulang berkala
+            except OSError:
+                return
+            self.queries += 1
+            if self.drop and random.random() < self.drop:
+                continue
+            if self.delay:
+                time.sleep(self.delay)
+            try:
+                answer = self._answer(data)
+                if answer is not None:
+                    self._sock.sendto(answer, addr)
+            except (OSError, IndexError, ValueError):
+                pass
+
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._sock.bind((self.host, self.port))
+        self.port = self._sock.getsockname()[1]
+        self._sock.settimeout(0.2)
+        self._thread = threading.Thread(target=self._serve, name="stub-dns", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._sock.close()
+        self._thread.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def use_stubs(delay=0.0):
+    """Put bench/stubs on PATH through main.py's BIN_DIR mechanism.
+
+    `delay` (seconds) is how long each stub tool pretends to work.
+    """
+    os.environ["BLACKBOX_BIN_DIR"] = STUBS_DIR
+    os.environ["BENCH_STUB_DELAY"] = str(delay)
+    import main  # noqa: F401  (menambahkan BIN_DIR ke PATH saat import)
+    return main
+
+
+def environment():
+    """Details that make two result files comparable"""
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                             text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        rev = None
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "git": rev}
+
+
+def save_results(name: str, results: dict, path=None) -> str:
+    """Write results to bench/results/<name>.json (or `path`)"""
+    path = path or os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    doc = {"benchmark": name, "ts": round(time.time(), 3), "env": environment(), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+    return path
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare_results(baseline: dict, current: dict, tolerance=0.10):
+    """Rows (case, metric, baseline, current, change, regressed) for every numeric metric in both.
+
+    Metric names ending in `_per_s` are better when higher; everything else
+    (seconds, megabytes) is better when lower. Plain counts are shown but never
+    flagged. Cases starting with `_` describe the setup and are skipped.
+    """
+    rows = []
+    for case, metrics in current.items():
+        base = baseline.get(case)
+        if case.startswith("_") or not isinstance(base, dict):
+            continue
+        for metric, value in metrics.items():
+            old = base.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old
+            worse = -change if metric.endswith("_per_s") else change
+            timed = metric.endswith(("_s", "_ms", "_mb"))
+            rows.append((case, metric, old, value, change, timed and worse > tolerance))
+    return rows
+
+
+def report_comparison(console, baseline_path: str, current: dict, tolerance=0.10) -> bool:
+    """Print a comparison table; returns False if any metric regressed beyond `tolerance`"""
+    from rich.table import Table
+    rows = compare_results(load_results(baseline_path), current, tolerance)
+    t = Table(title=f"Dibandingkan dengan {os.path.relpath(baseline_path)} (toleransi {tolerance:.0%})")
+    for col in ("Case", "Metric", "Baseline", "Sekarang", "Perubahan"):
+        t.add_column(col, justify="right" if col in ("Baseline", "Sekarang", "Perubahan") else "left")
+    for case, metric, old, new, change, regressed in rows:
+        style = "red" if regressed else "green"
+        t.add_row(case, metric, f"{old:,.3f}", f"{new:,.3f}", f"[{style}]{change:+.1%}[/{style}]")
+    console.print(t)
+    return not any(r[-1] for r in rows)
+
+
+def median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
@@ -0,0 +1,38 @@
+# bench/stubs/_stub.py
+# Helpers for the stub tools: they accept the same flags the plugins pass,
+# sleep BENCH_STUB_DELAY seconds and write a small, valid report.
+import os
+import sys
+import time
+
+
+def arg(flag, default=None):
+    argv = sys.argv[1:]
+    if flag in argv and argv.index(flag) + 1 < len(argv):
+        return argv[argv.index(flag) + 1]
+    return default
+
+
+def version(name):
+    if any(a in ("-version", "--version", "-V") for a in sys.argv[1:]):
+        print(f"{name} stub 0.0.0")
+        sys.exit(0)
+
+
+def work():
+    time.sleep(float(os.environ.get("BENCH_STUB_DELAY") or 0))
+
+
+def write(path, lines):
+    if not path:
+        for line in lines:
+            print(line)
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(line + "\n" for line in lines)
+
+
+def lines_of(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return [line.strip() for line in f if line.strip()]
@@ -1,32 +1,31 @@
 #!/usr/bin/env python3
-import os, sys, shutil
+import os, sys
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
-from pyfiglet import figlet_format
 
-# import plugins
-from plugins.recon_subfinder import Subfinder
-from plugins.crawl_katana import Katana
-from plugins.crawl_simple import SimpleCrawler
-from plugins.fuzz_ffuf import FFUF
-from plugins.scan_nuclei import Nuclei
-from plugins.scan_nmap import Nmap
+# Plugin ditemukan dari folder plugins/ tanpa di-import; modul baru di-load saat dipakai
+from plugins.registry import PluginRegistry
 
 console = Console()
 
 # Tambahkan folder lokal "bin/" ke PATH agar .exe di proyek terdeteksi.
 # Cukup taruh subfinder.exe, katana.exe, ffuf.exe, nuclei.exe ke folder ini bila belum ada di PATH global.
-BIN_DIR = os.path.join(os.path.dirname(__file__), "bin")
+# BLACKBOX_BIN_DIR menggantikan folder ini (dipakai benchmark untuk binary stub).
+BIN_DIR = os.environ.get("BLACKBOX_BIN_DIR") or os.path.join(os.path.dirname(__file__), "bin")
 if os.path.isdir(BIN_DIR):
     os.environ["PATH"] = BIN_DIR + os.pathsep + os.environ.get("PATH", "")
 
-PLUGINS = [
-    Subfinder(), Katana(), SimpleCrawler(), FFUF(), Nuclei(), Nmap()
-]
+REGISTRY = PluginRegistry()
+plugin = REGISTRY.get
+
+_BANNER = None
 
 def banner():
-    console.print("[bold cyan]" + figlet_format("BLACKBOX", width=120) + "[/bold cyan]")
+    global _BANNER
+    if _BANNER is None:
+        from pyfiglet import figlet_format
+        _BANNER = figlet_format("BLACKBOX", width=120)
+    console.print("[bold cyan]" + _BANNER + "[/bold cyan]")
     console.print("[bold magenta]by Sasaki[/bold magenta]\n")
     console.print(Panel.fit("Toolkit interaktif. Jalankan HANYA pada aset yang kamu miliki/diizinkan.", style="bold yellow"))
 
@@ -35,18 +34,19 @@ def pause():
     input()
 
 def list_tools():
+    from rich.table import Table
     t = Table(title="Tools", show_lines=False)
     t.add_column("#", justify="right")
     t.add_column("Nama")
     t.add_column("Kategori")
     t.add_column("Ketersediaan")
     t.add_column("Deskripsi")
-    for i, p in enumerate(PLUGINS, start=1):
+    for i, p in enumerate(REGISTRY.specs(), start=1):
         t.add_row(str(i), p.name, p.category, "[green]OK[/green]" if p.is_available() else "[red]Not Found[/red]", p.description)
     console.print(t)
 
 def ensure_bins_msg():
-    missing = [p.bin_name for p in PLUGINS if not p.is_available()]
+    missing = [p.bin_name for p in REGISTRY.specs() if not p.is_available()]
     if missing:
         console.print(Panel.fit(
             "Tool berikut belum terinstal: [red]{}[/red]\nSilakan install via package manager / release GitHub masing-masing."
@@ -65,6 +65,10 @@ def menu():
         console.print("[bold]5[/bold]) Vulnerability Scan (Nuclei)")
         console.print("[bold]6[/bold]) Network Scan (Nmap)")
         console.print("[bold]7[/bold]) Pipeline Cepat (Katana ➜ Nuclei)")
+        console.print("[bold]8[/bold]) Batch Mode (banyak domain: Subfinder ➜ Nmap + Nuclei)")
+        console.print("[bold]9[/bold]) Ringkasan Temuan (index SQLite semua report)")
+        console.print("[bold]10[/bold]) Perubahan Antar Run (diff report)")
+        console.print("[bold]11[/bold]) Antrean Job Scheduler (daemon: python main.py daemon)")
         console.print("[bold]0[/bold]) Keluar\n")
         choice = input("Pilih opsi: ").strip()
 
@@ -77,16 +81,23 @@ def menu():
             console.print("  - [cyan]testphp.vulnweb.com[/cyan] (domain saja)")
             domain = input("Domain (contoh: example.com): ").strip()
             extra  = input("Tambahan flag (opsional, Enter untuk skip): ").strip()
-            out = Subfinder().run(domain, extra=extra)
-            console.print(f"[green]Output:[/green] {out}"); pause()
+            out = plugin("Subfinder").run(domain, extra=extra)
+            console.print(f"[green]Output:[/green] {out}")
+            if os.path.isfile(out) and input("Resolve DNS & buang host mati/wildcard? (y/N): ").lower().startswith("y"):
+                from plugins.resolve import resolve_file
+                nameserver = input("Nameserver (ip atau ip:port, kosong = dari sistem): ").strip() or None
+                live = resolve_file(out, nameserver=nameserver, root=plugin("Subfinder").clean_domain(domain).lower() or None)
+                console.print(f"[green]Target hidup & unik:[/green] {live}")
+            pause()
 
         elif choice == "3":
             url    = input("URL target (https://example.com): ").strip()
             depth  = input("Depth (default 2): ").strip() or "2"
             
             # Check if Katana is available
-            katana = Katana()
-            simple_crawler = SimpleCrawler()
+            katana = plugin("Katana")
+            simple_crawler = plugin("SimpleCrawler")
+            from plugins.checkpoint import CHECKPOINT_DIR
             
             if katana.is_available():
                 console.print("[dim]Mode crawling:[/dim]")
@@ -94,10 +105,26 @@ def menu():
                 console.print("  - [yellow]Y[/yellow] = Headless mode (dengan JS, mungkin diblokir Windows Defender)")
                 head   = input("Headless? (y/N): ").lower().startswith("y")
                 extra  = input("Tambahan flag (opsional): ").strip()
-                out = katana.run(url, depth=int(depth), headless=head, extra=extra)
+                checkpoint = os.path.join(CHECKPOINT_DIR, f"katana_{katana.clean_url_for_filename(url)}.txt")
+                resume = os.path.isfile(checkpoint) and \
+                    not input("Ada hasil sesi sebelumnya, gabungkan? (Y/n): ").lower().startswith("n")
+                limit = input("Batas waktu sesi dalam detik (Enter = default, 0 = tanpa batas): ").strip()
+                out = katana.run(url, depth=int(depth), headless=head, extra=extra, resume=resume,
+                                 timeout=int(limit) if limit.isdigit() else None)
             elif simple_crawler.is_available():
                 console.print("[yellow]Katana tidak tersedia, menggunakan Simple Crawler (Python)[/yellow]")
-                out = simple_crawler.run(url, depth=int(depth))
+                conc = input("Concurrency (default 20): ").strip() or "20"
+                checkpoint = os.path.join(CHECKPOINT_DIR,
+                                          f"simple_crawler_{simple_crawler.clean_url_for_filename(url)}.log")
+                resume = os.path.isfile(checkpoint) and \
+                    not input("Ada checkpoint crawl sebelumnya, lanjutkan? (Y/n): ").lower().startswith("n")
+                limit = input("Batas waktu sesi dalam detik (Enter = tanpa batas): ").strip()
+                workers = input(f"Proses parse HTML paralel (0 = di proses utama, CPU: {os.cpu_count()}): ").strip()
+                dedup = input("Lewati halaman duplikat & crawler trap [near/exact/off] (default near): ").strip()
+                out = simple_crawler.run(url, depth=int(depth), concurrency=int(conc), resume=resume,
+                                         max_time=int(limit) if limit.isdigit() and int(limit) > 0 else None,
+                                         parse_workers=int(workers) if workers.isdigit() else 0,
+                                         dedup=dedup if dedup in ("near", "exact", "off") else "near")
             else:
                 console.print("[red]Tidak ada crawler yang tersedia![/red]")
                 pause()
@@ -106,7 +133,9 @@ def menu():
             console.print(f"[green]Output:[/green] {out}")
             # Show results preview if file exists and not empty
             if os.path.isfile(out) and os.path.getsize(out) > 0:
-                console.print(f"[blue]File berisi {sum(1 for line in open(out))} URLs[/blue]")
+                from plugins.findings import get_index
+                get_index().ingest(out)
+                console.print(f"[blue]File berisi {get_index().count(out)} URLs[/blue]")
             else:
                 console.print("[red]File output kosong atau tidak ada[/red]")
             pause()
@@ -116,7 +145,7 @@ def menu():
             console.print("[dim]Wordlist default tersedia:[/dim]")
             console.print("  - [cyan]wordlists/common-dirs.txt[/cyan] (untuk directory fuzzing)")
             console.print("  - [cyan]wordlists/common-params.txt[/cyan] (untuk parameter fuzzing)")
-            wl  = input("Path wordlist (Enter untuk wordlist default, atau path custom): ").strip()
+            wl  = input("Path wordlist (Enter untuk default; beberapa file dipisah koma digabung & dedup): ").strip()
             mode = input("Mode [dir/param] (default dir): ").strip() or "dir"
             
             # Set default wordlist if empty
@@ -125,8 +154,23 @@ def menu():
                 wl = default_wl
                 console.print(f"[green]Menggunakan wordlist default: {wl}[/green]")
             
+            extensions = input("Ekstensi tambahan (mis: .php,.bak) atau Enter untuk tanpa: ").strip()
             extra = input("Tambahan flag (opsional): ").strip()
-            out = FFUF().run(url, wl, mode=mode, extra=extra)
+            ffuf = plugin("FFUF")
+            simple_fuzzer = plugin("SimpleFuzzer")
+            if ffuf.is_available():
+                shards = input("Bagi wordlist ke N proses ffuf paralel (default 1): ").strip()
+                out = ffuf.run(url, wl, mode=mode, extra=extra, extensions=extensions,
+                               shards=int(shards) if shards.isdigit() else 1)
+            elif simple_fuzzer.is_available():
+                console.print("[yellow]FFUF tidak tersedia, menggunakan Simple Fuzzer (Python)[/yellow]")
+                conc = input("Concurrency (default 50): ").strip() or "50"
+                out = simple_fuzzer.run(url, wl, mode=mode, extra=extra, extensions=extensions,
+                                        concurrency=int(conc))
+            else:
+                console.print("[red]Tidak ada fuzzer yang tersedia![/red]")
+                pause()
+                continue
             console.print(f"[green]Output:[/green] {out}"); pause()
 
         elif choice == "5":
@@ -152,16 +196,30 @@ def menu():
             tags = input("Filter tags (mis: cve,misconfig) atau Enter untuk semua: ").strip()
             
             extra = input("Tambahan flag nuclei (opsional): ").strip()
-            out = Nuclei().run(target, use_urls_file=use_file, severity=severity or None, tags=tags or None, extra=extra)
+            record = True
+            if use_file:
+                from plugins.runs import get_run_store
+                store = get_run_store()
+                if len(store.runs(target)) > 1 and \
+                        input("Scan hanya URL baru sejak run sebelumnya? (y/N): ").lower().startswith("y"):
+                    target, n = store.changed_targets(target)
+                    record = False  # report delta tidak masuk riwayat run
+                    console.print(f"[blue]{n} URL baru ➜ {target}[/blue]")
+            if use_file and \
+                    not input("Kelompokkan URL yang polanya sama (scan satu per pola)? (Y/n): ").lower().startswith("n"):
+                from plugins.cluster import reduce_file
+                target, _ = reduce_file(target)
+            out = plugin("Nuclei").run(target, use_urls_file=use_file, severity=severity or None, tags=tags or None,
+                                       extra=extra, record=record)
             console.print(f"[green]Output:[/green] {out}")
             
             # Show scan results preview
             if os.path.isfile(out) and os.path.getsize(out) > 0:
                 try:
-                    import json
-                    vulns_count = sum(1 for line in open(out, encoding='utf-8') if line.strip())
-                    console.print(f"[blue]Ditemukan {vulns_count} hasil scan[/blue]")
-                except:
+                    from plugins.findings import get_index
+                    get_index().ingest(out)
+                    console.print(f"[blue]Ditemukan {get_index().count(out)} hasil scan[/blue]")
+                except Exception:
                     console.print("[blue]File hasil scan tersedia untuk analisis[/blue]")
             else:
                 console.print("[yellow]Tidak ada vulnerability ditemukan atau scan gagal[/yellow]")
@@ -179,6 +237,7 @@ def menu():
             console.print("  - [cyan]testphp.vulnweb.com[/cyan] (domain/hostname)")
             console.print("  - [cyan]192.168.1.1[/cyan] (IP address)")
             console.print("  - [cyan]192.168.1.0/24[/cyan] (network range)")
+            console.print("  - [cyan]targets.txt[/cyan] atau beberapa target dipisah spasi (mode sharding)")
             
             target = input("Target (IP/domain/network, tanpa http://): ").strip()
             scan_type = input("Scan type [basic/fast/comprehensive/stealth/custom] (default basic): ").strip() or "basic"
@@ -188,10 +247,19 @@ def menu():
                 ports = input("Port range (contoh: 80,443,8080 atau 1-1000): ").strip()
             
             extra = input("Tambahan flag nmap (opsional): ").strip()
+            parallel = input("Sharding: jumlah proses nmap paralel (kosong = satu proses): ").strip()
             
-            nmap = Nmap()
+            nmap = plugin("Nmap")
             if nmap.is_available():
-                out = nmap.run(target, scan_type=scan_type, ports=ports, extra=extra)
+                if parallel.isdigit() and int(parallel) > 0:
+                    hosts = input("Host per shard (default 16): ").strip()
+                    port_shards = input("Bagi port range menjadi N shard (default 1): ").strip() if ports else ""
+                    out = nmap.run_sharded(target, scan_type=scan_type, ports=ports, extra=extra,
+                                           parallel=int(parallel),
+                                           hosts_per_shard=int(hosts) if hosts.isdigit() else 16,
+                                           port_shards=int(port_shards) if port_shards.isdigit() else 1)
+                else:
+                    out = nmap.run(target, scan_type=scan_type, ports=ports, extra=extra)
                 console.print(f"[green]Output:[/green] {out}")
                 
                 # Show scan results preview
@@ -207,36 +275,163 @@ def menu():
             url = input("URL target untuk crawl lalu scan (https://example.com): ").strip()
             
             # 1) Crawl - Use available crawler
-            katana = Katana()
-            simple_crawler = SimpleCrawler()
+            katana = plugin("Katana")
+            simple_crawler = plugin("SimpleCrawler")
             
             if katana.is_available():
                 console.print("[blue]Menggunakan Katana untuk crawling...[/blue]")
-                urls_file = katana.run(url, depth=2, headless=False)
+                crawler = katana
             elif simple_crawler.is_available():
                 console.print("[blue]Menggunakan Simple Crawler untuk crawling...[/blue]")
-                urls_file = simple_crawler.run(url, depth=2)
+                crawler = simple_crawler
             else:
                 console.print("[red]Tidak ada crawler tersedia untuk pipeline![/red]")
                 pause()
                 continue
-                
+            
+            nuclei = plugin("Nuclei")
+            if not nuclei.is_available():
+                urls_file = crawler.run(url, depth=2)
+                console.print(f"[blue]URL hasil crawl:[/blue] {urls_file}")
+                console.print("[red]Nuclei tidak tersedia untuk scanning![/red]")
+                pause()
+                continue
+            
+            # 2) Crawl dan scan berjalan bersamaan: URL hasil crawl langsung dikirim ke nuclei per batch
+            per_cluster = input("URL per pola yang di-scan (default 1, 0 = semua URL): ").strip()
+            from plugins.pipeline import crawl_scan_pipeline
+            urls_file, out = crawl_scan_pipeline(crawler, nuclei, url, depth=2,
+                                                 per_cluster=int(per_cluster) if per_cluster.isdigit() else 1)
             console.print(f"[blue]URL hasil crawl:[/blue] {urls_file}")
             
-            # Check if crawl was successful
-            if not os.path.isfile(urls_file) or os.path.getsize(urls_file) == 0:
+            if out is None:
                 console.print("[red]Crawling gagal atau tidak menemukan URL. Pipeline dihentikan.[/red]")
+            else:
+                console.print(f"[green]Output Nuclei:[/green] {out}")
+            
+            pause()
+
+        elif choice == "8":
+            console.print("[dim]File target: satu domain per baris, baris diawali # diabaikan[/dim]")
+            path = input("Path file target (contoh: targets.txt): ").strip()
+            if not os.path.isfile(path):
+                console.print(f"[red]File {path} tidak ditemukan[/red]")
                 pause()
                 continue
             
-            # 2) Scan dengan nuclei
-            nuclei = Nuclei()
-            if nuclei.is_available():
-                out = nuclei.run(urls_file, use_urls_file=True, severity=None, tags=None)
-                console.print(f"[green]Output Nuclei:[/green] {out}")
-            else:
-                console.print("[red]Nuclei tidak tersedia untuk scanning![/red]")
+            subfinder = plugin("Subfinder")
+            if not subfinder.is_available():
+                console.print("[red]Subfinder tidak tersedia untuk batch mode![/red]")
+                pause()
+                continue
+            nmap, nuclei = plugin("Nmap"), plugin("Nuclei")
+            scan_type = input("Nmap scan type (default fast, 'skip' untuk tanpa nmap): ").strip() or "fast"
+            severity = input("Filter severity nuclei (opsional): ").strip()
+            resolve = not input("Resolve DNS & buang host mati/wildcard sebelum scan? (Y/n): ").lower().startswith("n")
+            nameserver = input("Nameserver (ip atau ip:port, kosong = dari sistem): ").strip() if resolve else ""
+            changed_only = input("Scan hanya subdomain baru sejak run sebelumnya? (y/N): ").lower().startswith("y")
+            
+            from plugins.batch import BatchRunner, read_targets
+            domains = read_targets(path)
+            console.print(f"[blue]{len(domains)} domain dimuat dari {path}[/blue]")
+            runner = BatchRunner(
+                subfinder,
+                nmap=nmap if nmap.is_available() and scan_type != "skip" else None,
+                nuclei=nuclei if nuclei.is_available() else None,
+                scan_type=scan_type, severity=severity or None,
+                resolve=resolve, nameserver=nameserver or None, changed_only=changed_only,
+            )
+            stem = os.path.splitext(os.path.basename(path))[0]
+            out = runner.run(domains, name=stem)
+            console.print(f"[green]Daftar host unik:[/green] {out}")
+            pause()
+
+        elif choice == "9":
+            from rich.table import Table
+            from plugins.findings import get_index
+            index = get_index()
+            added = index.ingest_dir("reports")
+            console.print(f"[blue]{added} baris baru dimuat ke {index.db_path}[/blue]")
+            
+            t = Table(title="Temuan per severity")
+            t.add_column("Severity"); t.add_column("Jumlah", justify="right")
+            for severity, n in index.severity_counts():
+                t.add_row(severity, str(n))
+            console.print(t)
+            
+            t = Table(title="Jumlah URL per host")
+            t.add_column("Host"); t.add_column("URL", justify="right")
+            for host, n in index.url_counts():
+                t.add_row(host, str(n))
+            console.print(t)
             
+            rows = index.findings_on_open_port(443)
+            t = Table(title="High/critical pada host dengan port 443 terbuka")
+            t.add_column("Host"); t.add_column("Severity"); t.add_column("Template"); t.add_column("URL")
+            for row in rows:
+                t.add_row(*[str(c) for c in row])
+            console.print(t)
+            pause()
+
+        elif choice == "10":
+            from rich.table import Table
+            from plugins.runs import get_run_store
+            store = get_run_store()
+            reports = sorted(name for name in os.listdir(store.root)) if os.path.isdir(store.root) else []
+            if not reports:
+                console.print("[yellow]Belum ada riwayat run di reports/runs[/yellow]")
+                pause()
+                continue
+            t = Table(title="Report dengan riwayat run")
+            t.add_column("#", justify="right"); t.add_column("Report"); t.add_column("Run", justify="right")
+            t.add_column("Terakhir")
+            for i, name in enumerate(reports, start=1):
+                runs = store.runs(name)
+                t.add_row(str(i), name, str(len(runs)), runs[-1] if runs else "-")
+            console.print(t)
+            pick = input("Pilih nomor report: ").strip()
+            if not pick.isdigit() or not 1 <= int(pick) <= len(reports):
+                console.print("[red]Pilihan tidak valid[/red]")
+                pause()
+                continue
+            name = reports[int(pick) - 1]
+            runs = store.runs(name)
+            console.print(f"[dim]Run tersedia: {', '.join(runs)}[/dim]")
+            old = input("Run lama (Enter = run sebelum yang terakhir): ").strip() or None
+            new = input("Run baru (Enter = terakhir): ").strip() or None
+            unknown = [r for r in (old, new) if r is not None and r not in runs]
+            if unknown:
+                console.print(f"[red]Run tidak ditemukan: {', '.join(unknown)}[/red]")
+                pause()
+                continue
+            diff = store.diff(name, old=old, new=new)
+            if diff is None:
+                console.print("[yellow]Report ini belum punya run[/yellow]")
+                pause()
+                continue
+            console.print(f"[bold]{name}[/bold] ({diff['kind']}): {diff['old'] or '-'} ➜ {diff['new']}")
+            for label, path, color in (("Baru", diff["added_path"], "green"), ("Hilang", diff["removed_path"], "red")):
+                count = diff["added" if label == "Baru" else "removed"]
+                console.print(f"[{color}]{label}: {count}[/{color}] [dim]({path})[/dim]")
+                with open(path, encoding="utf-8") as f:
+                    for _, line in zip(range(20), f):
+                        console.print(f"  [{color}]{'+' if label == 'Baru' else '-'} {line.rstrip()}[/{color}]")
+                if count > 20:
+                    console.print(f"  [dim]... {count - 20} lainnya[/dim]")
+            if diff["added"]:
+                targets, n = store.changed_targets(name, diff)
+                console.print(f"[blue]{n} target untuk scan lanjutan (mode 'hanya yang berubah'):[/blue] {targets}")
+            pause()
+
+        elif choice == "11":
+            from plugins.scheduler import JobQueue
+            queue = JobQueue()
+            show_jobs(queue.list(limit=20), queue.counts())
+            console.print("[dim]Tambah job dari terminal lain: python main.py submit Nmap example.com --set scan_type=fast[/dim]")
+            pick = input("ID job yang dibatalkan (Enter untuk kembali): ").strip()
+            if pick.isdigit():
+                ok = queue.cancel(int(pick))
+                console.print(f"[green]Job {pick} dibatalkan[/green]" if ok else f"[yellow]Job {pick} sudah selesai atau tidak ada[/yellow]")
             pause()
 
         elif choice == "0":
@@ -245,6 +440,107 @@ def menu():
             console.print("[red]Pilihan tidak valid[/red]")
             pause()
 
+def show_jobs(jobs, counts=None):
+    from datetime import datetime
+    from rich.table import Table
+    colors = {"queued": "cyan", "running": "blue", "done": "green", "failed": "red", "cancelled": "yellow"}
+    t = Table(title="Job scheduler" + (" (" + ", ".join(f"{s} {n}" for s, n in counts.items()) + ")" if counts else ""))
+    for col in ("ID", "Plugin", "Target", "Prio", "Status", "Coba", "Dikirim", "Hasil / error"):
+        t.add_column(col, justify="right" if col in ("ID", "Prio", "Coba") else "left")
+    for j in jobs:
+        state = j["state"] + (" (batal)" if j["cancel"] and j["state"] == "running" else "")
+        t.add_row(str(j["id"]), f"{j['plugin']}.{j['method']}", j["target"], str(j["priority"]),
+                  f"[{colors[j['state']]}]{state}[/{colors[j['state']]}]", f"{j['attempts']}/{j['max_attempts']}",
+                  datetime.fromtimestamp(j["submitted"]).strftime("%m-%d %H:%M:%S"), j["error"] or j["result"] or "")
+    console.print(t)
+
+def _value(text: str):
+    """CLI value: JSON when it parses (3, true, null, [..]), else the plain string"""
+    import json
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def cli(argv):
+    """Headless mode: scheduler daemon and its job queue (tanpa menu interaktif)"""
+    import argparse
+    from plugins import scheduler
+    ap = argparse.ArgumentParser(prog="main.py", description="BLACKBOX headless: daemon scheduler dan antrean job")
+    ap.add_argument("--db", default=scheduler.DEFAULT_DB, help="database antrean (SQLite)")
+    sub = ap.add_subparsers(dest="command", required=True, metavar="{daemon,submit,jobs,job,cancel}")
+    p = sub.add_parser("daemon", help="jalankan scheduler sampai dihentikan (SIGTERM/Ctrl-C)")
+    p.add_argument("--slots", type=int, default=scheduler.DEFAULT_SLOTS, help="jumlah job paralel")
+    p.add_argument("--per-target", type=int, default=None, help="maksimal job berjalan per target")
+    p.add_argument("--port", type=int, default=scheduler.DEFAULT_PORT, help="port JSON API di 127.0.0.1")
+    p.add_argument("--no-api", action="store_true", help="tanpa JSON API")
+    p = sub.add_parser("submit", help="antrekan plugin.run(args...), mis: submit Nmap example.com --set scan_type=fast")
+    p.add_argument("plugin", help="nama class plugin (Subfinder, Nmap, Nuclei, FFUF, Katana, SimpleCrawler, ...)")
+    p.add_argument("args", nargs="*", help="argumen posisi untuk run()")
+    p.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="argumen keyword (boleh berulang)")
+    p.add_argument("--method", default="run", choices=scheduler.METHODS)
+    p.add_argument("--priority", type=int, default=0, help="lebih tinggi dijalankan lebih dulu")
+    p.add_argument("--target", help="kunci fairness (default: host dari argumen pertama)")
+    p.add_argument("--timeout", type=float, help="detik sebelum job dihentikan")
+    p.add_argument("--attempts", type=int, default=3, help="percobaan maksimal bila daemon mati di tengah job")
+    p = sub.add_parser("jobs", help="daftar job terbaru")
+    p.add_argument("--state", choices=scheduler.STATES)
+    p.add_argument("--limit", type=int, default=30)
+    p = sub.add_parser("job", help="detail satu job dan akhir log-nya")
+    p.add_argument("id", type=int)
+    p = sub.add_parser("cancel", help="batalkan job (yang sedang jalan dihentikan oleh daemon)")
+    p.add_argument("ids", type=int, nargs="+")
+    p = sub.add_parser("exec-job")  # dipakai daemon: satu proses per job
+    p.add_argument("id", type=int)
+    args = ap.parse_args(argv)
+
+    if args.command == "exec-job":
+        return scheduler.execute(args.id, REGISTRY, args.db)
+    if args.command == "daemon":
+        scheduler.Scheduler(args.slots, args.db, max_per_target=args.per_target).serve(
+            None if args.no_api else args.port)
+        return 0
+    queue = scheduler.JobQueue(args.db)
+    if args.command == "submit":
+        kwargs = {}
+        for item in args.set:
+            key, sep, value = item.partition("=")
+            if not sep:
+                ap.error(f"--set butuh KEY=VALUE, bukan '{item}'")
+            kwargs[key] = _value(value)
+        try:
+            job_id = scheduler.submit_job(queue, {
+                "plugin": args.plugin, "args": [_value(a) for a in args.args], "kwargs": kwargs,
+                "method": args.method, "target": args.target, "priority": args.priority,
+                "max_attempts": args.attempts, "timeout": args.timeout}, REGISTRY)
+        except (ValueError, KeyError) as e:
+            console.print(f"[red]{e.args[0] if e.args else e}[/red]")
+            return 2
+        console.print(f"[green]Job {job_id} masuk antrean[/green] [dim]({queue.get(job_id)['target']})[/dim]")
+    elif args.command == "jobs":
+        show_jobs(queue.list(args.state, args.limit), queue.counts())
+    elif args.command == "job":
+        import json
+        job = queue.get(args.id)
+        if job is None:
+            console.print(f"[red]Job {args.id} tidak ada[/red]")
+            return 1
+        console.print_json(json.dumps(job))
+        log = os.path.join(scheduler.LOG_DIR, f"{args.id}.log")
+        if os.path.isfile(log):
+            from collections import deque
+            with open(log, encoding="utf-8", errors="replace") as f:
+                tail = deque(f, maxlen=20)
+            console.print(f"[dim]--- {log} (20 baris terakhir) ---[/dim]")
+            console.print("".join(tail).rstrip(), markup=False, highlight=False)
+    elif args.command == "cancel":
+        for job_id in args.ids:
+            ok = queue.cancel(job_id)
+            console.print(f"[green]Job {job_id} dibatalkan[/green]" if ok else f"[yellow]Job {job_id} sudah selesai atau tidak ada[/yellow]")
+    return 0
+
 if __name__ == "__main__":
     os.makedirs("reports", exist_ok=True)
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
     menu()
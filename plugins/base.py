@@ -1,7 +1,12 @@
 # plugins/base.py
-import os, shutil, subprocess
+import os, subprocess
 from datetime import datetime
 from rich.console import Console
+from .executor import get_executor
+from .cache import get_cache
+from .runs import get_run_store
+from .registry import which
+from .metrics import get_metrics
 
 console = Console()
 
@@ -10,9 +15,24 @@ class Plugin:
     category    = "General"
     description = "Base plugin"
     bin_name    = None              # nama executable CLI
+    version_flag = "-version"       # flag untuk cek versi tool (kunci cache)
+
+    _versions = {}                  # bin_name -> versi, di-probe sekali per sesi
 
     def is_available(self) -> bool:
-        return shutil.which(self.bin_name) is not None if self.bin_name else False
+        return which(self.bin_name) is not None if self.bin_name else False
+
+    def version(self) -> str:
+        """First line of `<bin> <version_flag>`, probed once per session"""
+        if self.bin_name not in Plugin._versions:
+            try:
+                res = subprocess.run([self.bin_name, self.version_flag], capture_output=True,
+                                     text=True, errors="replace", timeout=15)
+                lines = (res.stdout or res.stderr).strip().splitlines()
+                Plugin._versions[self.bin_name] = lines[0] if lines else ""
+            except (OSError, subprocess.SubprocessError):
+                Plugin._versions[self.bin_name] = ""
+        return Plugin._versions[self.bin_name]
 
     def ensure_reports_dir(self, reports_dir="reports"):
         os.makedirs(reports_dir, exist_ok=True)
@@ -22,10 +42,96 @@ class Plugin:
         ts = datetime.now().strftime("%Y%m%d-%H%M%S")
         return f"{base}-{ts}.{ext}"
 
-    def run_cmd(self, cmd: str):
-        console.rule(f"[bold]{self.name}[/bold]")
+    def emit_lines(self, path: str, callback):
+        """Pass every non-empty line of a report to `callback` (no-op without callback)"""
+        if callback is None or not os.path.isfile(path):
+            return
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    callback(line)
+
+    def submit(self, cmd: str, timeout=None, capture=False, on_stdout=None, on_stderr=None, slot=None):
+        """Queue a command on the shared executor without waiting (returns a Job)"""
         console.print(f"[cyan]$ {cmd}[/cyan]")
+        return get_executor().submit(cmd, self.bin_name or self.name, timeout=timeout, capture=capture,
+                                     on_stdout=on_stdout, on_stderr=on_stderr, slot=slot)
+
+    def run_cmd(self, cmd: str, timeout=None, capture=False, on_stdout=None, on_stderr=None, out=None, slot=None):
+        """Run a command through the shared executor and wait for it; returns the finished Job.
+
+        Timing, CPU, peak RSS and the size of `out` are recorded to the metrics files.
+        `slot` replaces the tool's concurrency cap for this job (see Executor.submit).
+        """
+        console.rule(f"[bold]{self.name}[/bold]")
+        job = self.submit(cmd, timeout=timeout, capture=capture, on_stdout=on_stdout, on_stderr=on_stderr,
+                          slot=slot)
+        return self._wait(job, out)
+
+    def run_call(self, fn, out=None):
+        """Run a Python callable `fn(job)` through the shared executor and wait for it"""
+        console.rule(f"[bold]{self.name}[/bold]")
+        return self._wait(get_executor().submit_call(fn, self.bin_name or self.name), out)
+
+    def cache_key(self, target: str, flags: str = "", inputs=()):
+        """Run-cache key for this tool, target, flags, tool version and input files"""
+        return get_cache().key(self.bin_name or self.name, target, flags, self.version(), inputs)
+
+    def cache_restore(self, key: str, out: str, force=False) -> bool:
+        """Restore a fresh cached report to `out`; returns True when the run can be skipped"""
+        if force or not get_cache().restore(key, out):
+            return False
+        console.rule(f"[bold]{self.name}[/bold]")
+        console.print(f"[green]Cache hit, memakai hasil sebelumnya:[/green] {out} [dim](force=True untuk scan ulang)[/dim]")
+        return True
+
+    def cache_store(self, key: str, out: str):
+        get_cache().put(key, out)
+
+    def record_run(self, out: str):
+        """Keep a versioned copy of a finished report under reports/runs/ for run-over-run diffs"""
+        if out and os.path.isfile(out):
+            get_run_store().record(out)
+
+    def run_cmd_cached(self, cmd: str, out: str, target: str, inputs=(), force=False, key_cmd=None, **kwargs):
+        """run_cmd unless a fresh cached report exists for the same tool/target/flags/inputs.
+
+        `key_cmd` is the command the cache key is derived from (default `cmd`),
+        for flags such as rate limits that should not change the result.
+        Returns the finished Job, or None on a cache hit.
+        """
+        flags = " ".join((key_cmd or cmd).replace(out, "").split())
+        key = self.cache_key(target, flags, inputs)
+        if self.cache_restore(key, out, force):
+            return None
+        job = self.run_cmd(cmd, out=out, **kwargs)
+        if job.ok:
+            self.cache_store(key, out)
+        return job
+
+    def _wait(self, job, out=None):
         try:
-            subprocess.run(cmd, shell=True, check=True)
-        except subprocess.CalledProcessError as e:
-            console.print(f"[red]Command failed ({e.returncode})[/red]")
+            job.wait()
+        except KeyboardInterrupt:
+            job.cancel()
+            job.wait()
+            get_metrics().record_run(self.name, job, out)
+            raise
+        get_metrics().record_run(self.name, job, out)
+        if job.timed_out:
+            console.print(f"[red]Timeout setelah {job.duration:.0f}s[/red]")
+        elif job.cancelled:
+            console.print("[yellow]Dibatalkan[/yellow]")
+        elif job.error is not None:
+            console.print(f"[red]Error: {job.error}[/red]")
+        elif job.returncode != 0:
+            console.print(f"[red]Command failed ({job.returncode})[/red]")
+        else:
+            usage = ""
+            if job.cpu_time is not None:
+                usage += f", CPU {job.cpu_time:.1f}s"
+            if job.peak_rss:
+                usage += f", RSS {job.peak_rss / 1024 ** 2:.0f} MB"
+            console.print(f"[dim]Selesai dalam {job.duration:.1f}s{usage}[/dim]")
+        return job
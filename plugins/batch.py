@@ -0,0 +1,189 @@
+# plugins/batch.py
+import os
+import re
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from rich.console import Console
+from .metrics import stage
+from .resolve import resolve_hosts
+from .runs import get_run_store
+
+console = Console()
+
+
+def read_targets(path: str):
+    """Read one domain per line, skipping blanks, comments and duplicates"""
+    seen, targets = set(), []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            domain = re.sub(r'^https?://', '', line.split('#', 1)[0].strip()).rstrip('/').lower()
+            if domain and domain not in seen:
+                seen.add(domain)
+                targets.append(domain)
+    return targets
+
+
+class BatchProgress:
+    """Thread-safe work counter that prints throughput and remaining work"""
+
+    def __init__(self):
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, n=1):
+        with self._lock:
+            self.total += n
+
+    def finish(self, label: str, ok=True):
+        with self._lock:
+            self.done += 1
+            if not ok:
+                self.failed += 1
+            elapsed = time.monotonic() - self.started
+            rate = self.done / elapsed if elapsed else 0.0
+            remaining = self.total - self.done
+            eta = f"{remaining / rate:.0f}s" if rate else "?"
+            console.print(f"[magenta][batch][/magenta] {label} • {self.done}/{self.total} selesai "
+                          f"• {rate:.2f} target/s • sisa {remaining} (ETA {eta})"
+                          + (f" • [red]{self.failed} gagal[/red]" if self.failed else ""))
+
+
+class BatchRunner:
+    """Recon ➜ scan fan-out over many domains.
+
+    Subfinder runs for every domain in parallel; each newly discovered host
+    (deduplicated across domains) is fanned out to Nmap and Nuclei. How many
+    processes of each tool run at once is capped by the shared executor.
+
+    With `resolve=True` discovered names are resolved first: dead and
+    wildcard-DNS names are dropped and only one name per distinct IP set
+    (across all domains) is scanned. Names whose query timed out are
+    scanned as they are.
+
+    With `changed_only=True` only subdomains that are new since the previous
+    subfinder run of a domain are scanned (everything on a domain's first run).
+    """
+
+    def __init__(self, subfinder, nmap=None, nuclei=None, out_dir="reports", workers=64,
+                 scan_type="fast", severity=None, tags=None, resolve=False, nameserver=None, changed_only=False):
+        self.subfinder = subfinder
+        self.nmap = nmap
+        self.nuclei = nuclei
+        self.out_dir = out_dir
+        self.scan_type = scan_type
+        self.severity = severity
+        self.tags = tags
+        self.resolve = resolve
+        self.nameserver = nameserver
+        self.changed_only = changed_only
+        self.ip_groups = {}  # IP set -> nama yang di-scan untuk IP tersebut
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+        self.progress = BatchProgress()
+        self.hosts = set()
+        self.reports = []  # (tool, target, report path)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+
+    def _spawn(self, fn, *args):
+        future = self.pool.submit(fn, *args)
+        with self._pending_lock:
+            self._pending.append(future)
+
+    def _record(self, tool: str, target: str, report):
+        with self._lock:
+            self.reports.append((tool, target, report))
+
+    def _recon(self, domain: str):
+        with stage("batch:recon"):
+            report = self.subfinder.run(domain, out_dir=self.out_dir)
+        found = [domain]
+        diff = get_run_store().diff(report) if self.changed_only and report else None
+        if diff is not None and diff["old"] is not None:
+            # Hanya subdomain yang belum ada di run subfinder sebelumnya
+            console.print(f"[blue]{domain}: {diff['added']} subdomain baru, {diff['removed']} hilang "
+                          f"sejak run {diff['old']}[/blue]")
+            found, report_lines = [], diff["added_path"]
+        else:
+            report_lines = report
+        if report_lines and os.path.isfile(report_lines):
+            with open(report_lines, encoding="utf-8", errors="replace") as f:
+                found += [line.strip().lower() for line in f if line.strip()]
+        self._record("subfinder", domain, report)
+
+        groups = None
+        if self.resolve:
+            with stage("batch:dns"):
+                resolution = asyncio.run(resolve_hosts(found, self.nameserver, root=domain))
+            groups = resolution.groups()
+            found = resolution.targets()
+
+        with self._lock:
+            new_hosts = [h for h in dict.fromkeys(found) if h not in self.hosts]
+            if groups is not None:
+                ips_of = {name: ips for ips, names in groups.items() for name in names}
+                fresh = []
+                for host in new_hosts:
+                    ips = ips_of.get(host)  # None: query timeout, IP tidak diketahui
+                    if ips is None:
+                        fresh.append(host)
+                    elif ips not in self.ip_groups:
+                        self.ip_groups[ips] = host
+                        fresh.append(host)
+                new_hosts = fresh
+            self.hosts.update(new_hosts)
+
+        scans = [s for s in (self.nmap, self.nuclei) if s is not None]
+        self.progress.add(len(new_hosts) * len(scans))
+        for host in new_hosts:
+            if self.nmap is not None:
+                self._spawn(self._scan_nmap, host)
+            if self.nuclei is not None:
+                self._spawn(self._scan_nuclei, host)
+        self.progress.finish(f"subfinder {domain}: {len(new_hosts)} host baru", ok=bool(report) and os.path.isfile(report))
+
+    def _scan_nmap(self, host: str):
+        with stage("batch:nmap"):
+            report = self.nmap.run(host, out_dir=self.out_dir, scan_type=self.scan_type)
+        self._record("nmap", host, report)
+        self.progress.finish(f"nmap {host}")
+
+    def _scan_nuclei(self, host: str):
+        with stage("batch:nuclei"):
+            report = self.nuclei.run(host, out_dir=self.out_dir, severity=self.severity, tags=self.tags)
+        self._record("nuclei", host, report)
+        self.progress.finish(f"nuclei {host}")
+
+    def run(self, domains, name="batch"):
+        """Run the whole fan-out and block until every spawned job finished"""
+        self.progress.add(len(domains))
+        for domain in domains:
+            self._spawn(self._recon, domain)
+
+        # Jobs spawn more jobs; keep waiting until the pending list stops growing
+        waited = 0
+        while True:
+            with self._pending_lock:
+                batch = self._pending[waited:]
+            if not batch:
+                break
+            for future in batch:
+                try:
+                    future.result()
+                except Exception as e:
+                    self.progress.finish(f"[red]error: {e}[/red]", ok=False)
+            waited += len(batch)
+        self.pool.shutdown()
+
+        hosts_file = os.path.join(self.out_dir, f"batch_{name}_hosts.txt")
+        with open(hosts_file, "w", encoding="utf-8") as f:
+            f.writelines(h + "\n" for h in sorted(self.hosts))
+        elapsed = time.monotonic() - self.progress.started
+        console.print(f"[green]Batch selesai: {len(domains)} domain, {len(self.hosts)} host unik, "
+                      f"{self.progress.done} job dalam {elapsed:.1f}s[/green]")
+        return hosts_file
@@ -0,0 +1,180 @@
+# plugins/cache.py
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar proses
+    fcntl = None
+
+CACHE_DIR = os.path.join("reports", ".cache")
+DEFAULT_TTL = 6 * 3600            # detik
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+
+_digest_memo = {}
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content, memoized on (path, size, mtime)"""
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _digest_memo.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = _digest_memo[memo_key] = h.hexdigest()
+    return digest
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive cross-process lock on `path` (created if missing) for read-modify-write of shared files.
+
+    Job processes of the scheduler share reports/; a threading.Lock only
+    guards one process. Without fcntl (Windows) this is a no-op.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RunCache:
+    """Content-addressed cache of tool reports with TTL and size-based (LRU) eviction.
+
+    Entries are keyed on (tool, normalized target, flags, tool version,
+    input file hashes); the report content is kept under `objects/` so a hit
+    can be restored even after the report file was overwritten by another run.
+    """
+
+    def __init__(self, root=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self._index = None
+
+    def key(self, tool: str, target: str, flags: str = "", version: str = "", inputs=()) -> str:
+        parts = {
+            "tool": tool,
+            "target": target.strip().lower().rstrip("/"),
+            "flags": " ".join(flags.split()),
+            "version": version or "",
+            "inputs": [file_digest(p) for p in inputs if p and os.path.isfile(p)],
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    @contextmanager
+    def _locked(self):
+        """Index lock for this thread and every other process; the index is re-read inside it"""
+        with self._lock, file_lock(self.index_path + ".lock"):
+            yield
+
+    def _load(self):
+        # Selalu dibaca ulang di dalam lock: proses lain (mis. job scheduler) bisa sudah menulis index
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+        return self._index
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self.index_path)
+
+    def _object(self, key: str) -> str:
+        return os.path.join(self.root, "objects", key[:2], key)
+
+    def _drop(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._object(key))
+        except OSError:
+            pass
+
+    def get(self, key: str):
+        """Return the cached object path for a fresh entry, else None"""
+        with self._locked():
+            index = self._load()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            path = self._object(key)
+            if time.time() - entry["created"] > entry.get("ttl", self.ttl) or not os.path.isfile(path):
+                self._drop(key)
+                self._save()
+                return None
+            entry["used"] = time.time()
+            self._save()
+            return path
+
+    def restore(self, key: str, out: str) -> bool:
+        """Copy a fresh cached report to `out`; returns True on a hit"""
+        path = self.get(key)
+        if path is None:
+            return False
+        if not (os.path.isfile(out) and file_digest(out) == file_digest(path)):
+            os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+            shutil.copyfile(path, out)
+        return True
+
+    def put(self, key: str, out: str, ttl=None):
+        """Store a finished report and evict old entries beyond the size budget"""
+        if not os.path.isfile(out):
+            return
+        path = self._object(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(out, path)
+        now = time.time()
+        with self._locked():
+            index = self._load()
+            index[key] = {"created": now, "used": now, "size": os.path.getsize(path),
+                          "ttl": ttl or self.ttl, "source": out}
+            self._evict(now)
+            self._save()
+
+    def _evict(self, now: float):
+        for key, entry in list(self._index.items()):
+            if now - entry["created"] > entry.get("ttl", self.ttl):
+                self._drop(key)
+        total = sum(e["size"] for e in self._index.values())
+        for key, entry in sorted(self._index.items(), key=lambda kv: kv[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._index = {}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> RunCache:
+    """Process-wide shared run cache"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RunCache()
+        return _default
@@ -0,0 +1,131 @@
+# plugins/checkpoint.py
+import os
+import json
+import time
+
+CHECKPOINT_DIR = os.path.join("reports", ".checkpoints")
+
+
+class CrawlCheckpoint:
+    """Append-only journal of a crawl: queued URLs, fetched URLs and emitted report lines.
+
+    One record per line, tab separated:
+        Q <depth> <url>   URL accepted by the frontier
+        D <url>           URL fetched and its links journaled
+        E <url>           line written to the report
+        S <url> <reason>  URL skipped as duplicate or crawler trap
+    The first line is a JSON header with the crawl parameters. Records are
+    flushed in batches; a crash can only cut the tail, and since a page's Q/E
+    records are written before its D record, replay never loses a link - at
+    worst the last few pages are fetched again.
+    """
+
+    def __init__(self, path: str, params: dict, flush_interval=1.0, batch_size=500):
+        self.path = path
+        self.params = params
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._fh = None
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path) and os.path.getsize(self.path) > 0
+
+    def header(self):
+        """Parameters the journal was started with, or None"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def replay(self):
+        """(pending [(url, depth)] in queue order, seen URLs, emitted lines, fetched count, skipped (url, reason))"""
+        pending, seen, emitted, fetched, skipped = {}, [], [], 0, []
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            f.readline()
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # record terakhir terpotong
+                kind, _, rest = line.rstrip("\n").partition("\t")
+                if kind == "Q":
+                    depth, _, url = rest.partition("\t")
+                    pending[url] = int(depth)
+                    seen.append(url)
+                elif kind == "D":
+                    if pending.pop(rest, None) is not None:
+                        fetched += 1
+                elif kind == "E":
+                    emitted.append(rest)
+                elif kind == "S":
+                    url, _, reason = rest.partition("\t")
+                    skipped.append((url, reason))
+                    seen.append(url)
+        return list(pending.items()), seen, emitted, fetched, skipped
+
+    def open(self, resume: bool):
+        """Start a new journal, or append to the existing one when resuming"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if resume:
+            self._truncate_partial()
+            self._fh = open(self.path, "a", encoding="utf-8")
+        else:
+            self._fh = open(self.path, "w", encoding="utf-8")
+            self._fh.write(json.dumps(self.params, sort_keys=True) + "\n")
+        return self
+
+    def _truncate_partial(self):
+        """Drop a half-written last record so appended records start on a fresh line"""
+        with open(self.path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(max(0, size - 65536))
+            tail = f.read()
+            if not tail.endswith(b"\n"):
+                f.truncate(size - len(tail) + tail.rfind(b"\n") + 1)
+
+    def queued(self, url: str, depth: int):
+        self._append(f"Q\t{depth}\t{url}")
+
+    def fetched(self, url: str):
+        self._append(f"D\t{url}")
+
+    def emitted(self, url: str):
+        self._append(f"E\t{url}")
+
+    def skipped(self, url: str, reason: str):
+        self._append(f"S\t{url}\t{reason}")
+
+    def _append(self, record: str):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._fh is None:
+            return
+        if self._buffer:
+            self._fh.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._fh is not None and not self._fh.closed:
+            self.flush()
+            self._fh.close()
+
+    def remove(self):
+        self.close()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,136 @@
+# plugins/cluster.py
+import os
+import re
+import heapq
+from functools import lru_cache
+from rich.console import Console
+
+console = Console()
+
+# Segmen path yang nilainya berganti-ganti tapi endpoint-nya sama
+_SEGMENT_RULES = [
+    (re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.I), "{uuid}"),
+    (re.compile(r'^\d{4}-\d{2}-\d{2}$'), "{date}"),
+    (re.compile(r'^[0-9a-f]{16,}$', re.I), "{hex}"),
+    (re.compile(r'^(?=[A-Za-z0-9_\-]*\d)[A-Za-z0-9_\-]{20,}$'), "{token}"),
+]
+_SLUG_NUMBER = re.compile(r'([-_])\d+$')
+_HAS_DIGIT = re.compile(r'\d').search
+_DEFAULT_PORTS = {"http": ":80", "https": ":443"}
+
+
+def _segment_shape(segment: str) -> str:
+    if segment.isdigit():
+        return "{int}"
+    if not _HAS_DIGIT(segment):
+        return segment
+    return _mixed_segment_shape(segment)
+
+
+@lru_cache(maxsize=1 << 16)
+def _mixed_segment_shape(segment: str) -> str:
+    name, dot, ext = segment.rpartition(".") if "." in segment[1:] else (segment, "", "")
+    if name.isdigit():
+        # 123.json; segmen angka murni sudah ditangani _segment_shape
+        return "{int}" + dot + ext
+    for pattern, placeholder in _SEGMENT_RULES:
+        if pattern.match(name):
+            return placeholder + dot + ext
+    # post-123 / item_42 -> post-{int}
+    return _SLUG_NUMBER.sub(r'\1{int}', name) + dot + ext
+
+
+def url_shape(url: str):
+    """(scheme, host, path template, sorted parameter names) of a URL, or None if it is not http(s).
+
+    Parsed with plain string splitting rather than urlsplit: this runs once
+    per crawled URL and dominates the cost on multi-million-line inputs.
+    """
+    scheme, sep, rest = url.partition("://")
+    scheme = scheme.lower()
+    if not sep or scheme not in _DEFAULT_PORTS:
+        return None
+    rest = rest.partition("#")[0]
+    rest, _, query = rest.partition("?")
+    host, slash, path = rest.partition("/")
+    if not host:
+        return None
+    host = host.lower()
+    if host.endswith(_DEFAULT_PORTS[scheme]):
+        host = host[:-len(_DEFAULT_PORTS[scheme])]
+    path = "/" + "/".join([_segment_shape(seg) for seg in path.split("/")]) if path else "/"
+    params = tuple(sorted({p.partition("=")[0] for p in query.split("&") if p})) if query else ()
+    return scheme, host, path, params
+
+
+class URLClusterer:
+    """Streaming URL de-duplication by shape.
+
+    `add(url)` returns True for the first `per_cluster` URLs of every shape
+    and False for the rest. Lines that are not http(s) URLs (e.g. bare
+    hosts from subfinder) cannot be clustered; they are passed through
+    (True) and counted in `invalid`. Memory grows with the number of
+    distinct shapes, not with the number of URLs.
+    """
+
+    def __init__(self, per_cluster=1):
+        self.per_cluster = per_cluster
+        self.clusters = {}  # shape -> jumlah URL
+        self.total = 0
+        self.kept = 0
+        self.invalid = 0
+
+    def add(self, url: str) -> bool:
+        self.total += 1
+        shape = url_shape(url)
+        if shape is None:
+            self.invalid += 1
+            return True
+        n = self.clusters.get(shape, 0)
+        self.clusters[shape] = n + 1
+        if n < self.per_cluster:
+            self.kept += 1
+            return True
+        return False
+
+    @property
+    def ratio(self) -> float:
+        """Share of input lines removed (0.0 - 1.0)"""
+        return 1 - (self.kept + self.invalid) / self.total if self.total else 0.0
+
+    def largest(self, n=5):
+        """The `n` biggest clusters as (count, readable pattern)"""
+        top = heapq.nlargest(n, self.clusters.items(), key=lambda kv: kv[1])
+        return [(count, format_shape(shape)) for shape, count in top]
+
+    def summary(self):
+        console.print(f"[green]Reduksi URL: {self.total} ➜ {self.kept + self.invalid} baris "
+                      f"({len(self.clusters)} pola, {self.ratio:.1%} dibuang)[/green]")
+        if self.invalid:
+            console.print(f"[yellow]{self.invalid} baris invalid (bukan URL http/https), "
+                          f"diteruskan apa adanya[/yellow]")
+        for count, pattern in self.largest():
+            if count > self.per_cluster:
+                console.print(f"[dim]  {count:>8}  {pattern}[/dim]")
+
+
+def format_shape(shape) -> str:
+    scheme, host, path, params = shape
+    return f"{scheme}://{host}{path}" + ("?" + "&".join(f"{p}=*" for p in params) if params else "")
+
+
+def reduce_file(path: str, out=None, per_cluster=1):
+    """Write the representatives of every URL shape in `path` to `out` (default `<path>_reduced.txt`).
+
+    Lines that are not URLs (bare hosts) are copied unchanged. Reads and
+    writes line by line; returns (out, URLClusterer) for the stats.
+    """
+    out = out or f"{os.path.splitext(path)[0]}_reduced.txt"
+    clusterer = URLClusterer(per_cluster)
+    with open(path, encoding="utf-8", errors="replace") as src, open(out, "w", encoding="utf-8") as dst:
+        for line in src:
+            url = line.strip()
+            if url and clusterer.add(url):
+                dst.write(url + "\n")
+    clusterer.summary()
+    return out, clusterer
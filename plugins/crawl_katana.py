@@ -1,8 +1,10 @@
 # plugins/crawl_katana.py
 import os
 import re
-import subprocess
 from .base import Plugin
+from .ratelimit import get_rate_limiter, host_of
+from .checkpoint import CHECKPOINT_DIR
+from .writer import external_sort
 from rich.console import Console
 
 console = Console()
@@ -20,52 +22,121 @@ class Katana(Plugin):
         cleaned = re.sub(r'[<>:"/\\|?*]', '_', cleaned)
         return cleaned
 
-    def run(self, url: str, out_dir="reports", depth=2, headless=False, extra=""):
+    def run(self, url: str, out_dir="reports", depth=2, headless=False, extra="", on_url=None, rate=None,
+            timeout=None, resume=False, force=False):
+        """Crawl `url` with katana; `rate` req/s as -rl (None = rate learned for the host, 0 = none).
+
+        `timeout` limits one session in seconds (None = 300 headless / 180
+        standard, 0 = no limit). Katana cannot export its frontier, so URLs of
+        a session that timed out or failed are kept in reports/.checkpoints/
+        and merged into the report of the next `resume=True` run.
+        """
         self.ensure_reports_dir(out_dir)
         out = f"{out_dir}/katana_{self.clean_url_for_filename(url)}.txt"
+        partial = self._partial_path(out)
+        resume = resume and os.path.isfile(partial)
+        if not resume and os.path.isfile(partial):
+            os.remove(partial)  # sisa sesi lama yang tidak dilanjutkan
+        
+        # Hasil crawl yang masih fresh di cache dipakai ulang tanpa menjalankan katana
+        key = self.cache_key(url, f"-d {depth} headless={headless} {extra}")
+        if not resume and self.cache_restore(key, out, force):
+            self.emit_lines(out, on_url)
+            self.record_run(out)
+            return out
         
+        # Rate limit tidak mengubah hasil, jadi ditambahkan setelah kunci cache dihitung
+        rate_flag = get_rate_limiter().rate_flag(self.bin_name, host_of(url), extra, rate)
+        job = self._crawl(url, out, out_dir, depth, headless, f"{rate_flag} {extra}".strip(), on_url, timeout)
+        if os.path.isfile(partial):
+            # Dari sesi sebelumnya (resume) atau dari run headless yang timeout sebelum fallback
+            self._merge_partial(partial, out)
+            console.print(f"[cyan]Hasil sesi sebelumnya digabung dari {partial}[/cyan]")
+        if job.ok:
+            if os.path.isfile(partial):
+                os.remove(partial)
+            self.cache_store(key, out)
+            self.record_run(out)
+        else:
+            self._save_partial(out)
+        return out
+
+    @staticmethod
+    def _partial_path(out: str) -> str:
+        return os.path.join(CHECKPOINT_DIR, os.path.basename(out))
+
+    def _save_partial(self, out: str):
+        """Keep the URLs of an unfinished session (merged with earlier ones) for a later resume"""
+        if not os.path.isfile(out) or os.path.getsize(out) == 0:
+            return
+        partial = self._partial_path(out)
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        self._merge_partial(out, partial)
+        console.print(f"[yellow]Hasil sebagian disimpan di {partial}; jalankan lagi dengan resume=True "
+                      f"untuk menggabungkannya[/yellow]")
+
+    @staticmethod
+    def _merge_partial(src: str, dst: str):
+        """Append `src` to `dst` and rewrite `dst` sorted and unique"""
+        if not os.path.isfile(src):
+            return
+        with open(src, encoding="utf-8", errors="replace") as f, open(dst, "a", encoding="utf-8") as g:
+            for line in f:
+                if line.strip():
+                    g.write(line if line.endswith("\n") else line + "\n")
+        external_sort(dst)
+    
+    def _crawl(self, url: str, out: str, out_dir: str, depth: int, headless: bool, extra: str, on_url,
+               timeout=None):
+        """Run katana (headless with standard fallback); returns the last finished Job"""
         # Try headless first if requested, fallback to passive mode if fails
         if headless:
             console.print("[yellow]Mencoba mode headless...[/yellow]")
             flags = f"-d {depth} -kf -silent -headless"
             cmd = f"katana -u {url} {flags} -o {out} {extra}"
             
-            try:
-                console.print(f"[cyan]$ {cmd}[/cyan]")
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
-                
-                if result.returncode != 0 and ("virus" in result.stderr.lower() or "leakless" in result.stderr.lower()):
-                    console.print("[red]Headless mode gagal - Windows Defender memblokir browser.[/red]")
-                    console.print("[yellow]Mencoba mode standard (tanpa JS)...[/yellow]")
-                    return self._run_standard_mode(url, out_dir, depth, extra)
-                elif result.returncode != 0:
-                    console.print(f"[red]Command failed ({result.returncode})[/red]")
-                    console.print("[yellow]Mencoba mode standard sebagai fallback...[/yellow]")
-                    return self._run_standard_mode(url, out_dir, depth, extra)
-                else:
-                    console.print("[green]Headless crawling berhasil![/green]")
-                    return out
-                    
-            except subprocess.TimeoutExpired:
+            job = self.run_cmd(cmd, timeout=300 if timeout is None else timeout or None, capture=True,
+                               on_stdout=self._url_callback(on_url), out=out)
+            stderr = (job.stderr or "").lower()
+            
+            if job.timed_out:
                 console.print("[red]Timeout - mencoba mode standard...[/red]")
-                return self._run_standard_mode(url, out_dir, depth, extra)
+                self._save_partial(out)  # jangan sampai tertimpa oleh run standard
+                return self._run_standard_mode(url, out_dir, depth, extra, on_url, timeout)
+            elif job.returncode != 0 and ("virus" in stderr or "leakless" in stderr):
+                console.print("[red]Headless mode gagal - Windows Defender memblokir browser.[/red]")
+                console.print("[yellow]Mencoba mode standard (tanpa JS)...[/yellow]")
+                return self._run_standard_mode(url, out_dir, depth, extra, on_url, timeout)
+            elif job.returncode != 0:
+                console.print("[yellow]Mencoba mode standard sebagai fallback...[/yellow]")
+                return self._run_standard_mode(url, out_dir, depth, extra, on_url, timeout)
+            else:
+                console.print("[green]Headless crawling berhasil![/green]")
+                return job
         else:
-            return self._run_standard_mode(url, out_dir, depth, extra)
+            return self._run_standard_mode(url, out_dir, depth, extra, on_url, timeout)
     
-    def _run_standard_mode(self, url: str, out_dir: str, depth: int, extra: str):
+    def _run_standard_mode(self, url: str, out_dir: str, depth: int, extra: str, on_url=None, timeout=None):
         """Run Katana in standard mode without headless browser"""
         out = f"{out_dir}/katana_{self.clean_url_for_filename(url)}.txt"
         # Standard mode tanpa headless, masih bisa crawl links dari HTML
         flags = f"-d {depth} -kf -silent"
         cmd = f"katana -u {url} {flags} -o {out} {extra}"
         
-        console.print(f"[cyan]$ {cmd}[/cyan]")
-        try:
-            subprocess.run(cmd, shell=True, check=True, timeout=180)
+        job = self.run_cmd(cmd, timeout=180 if timeout is None else timeout or None,
+                           on_stdout=self._url_callback(on_url), out=out)
+        if job.ok:
             console.print("[green]Standard crawling selesai![/green]")
-        except subprocess.CalledProcessError as e:
-            console.print(f"[red]Command failed ({e.returncode})[/red]")
-        except subprocess.TimeoutExpired:
-            console.print("[red]Timeout pada standard mode[/red]")
             
-        return out
+        return job
+
+    def _url_callback(self, on_url):
+        """Wrap `on_url` so it only sees non-empty URL lines from katana stdout"""
+        if on_url is None:
+            return None
+
+        def callback(line):
+            line = line.strip()
+            if line:
+                on_url(line)
+        return callback
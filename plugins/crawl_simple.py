@@ -1,15 +1,27 @@
 # plugins/crawl_simple.py
 import os
 import re
-import requests
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-import time
+import codecs
+import asyncio
+import secrets
+import functools
+import importlib.util
 from .base import Plugin
+from .frontier import Frontier, BloomFilter, canonicalize_url
+from .writer import StreamWriter, external_sort
+from .extract import ParsePool, get_extractor
+from .metrics import Histogram, get_metrics
+from .ratelimit import BACKOFF_STATUS, get_rate_limiter, host_of
+from .checkpoint import CHECKPOINT_DIR, CrawlCheckpoint
+from .dedup import DEDUP_MODES, CrawlFilter
+from .http import get_http_client
 from rich.console import Console
 
 console = Console()
 
+_FAILED = object()  # hasil _fetch untuk halaman yang gagal diambil (tidak dicatat selesai di journal)
+
+
 class SimpleCrawler(Plugin):
     name = "Simple Crawler (Python)"
     category = "Crawler"
@@ -18,93 +30,347 @@ class SimpleCrawler(Plugin):
 
     def __init__(self):
         super().__init__()
-        try:
-            import requests
-            import bs4
-        except ImportError:
-            console.print("[red]Missing dependencies: requests, beautifulsoup4[/red]")
-            console.print("Install with: pip install requests beautifulsoup4")
-    
+        if not self.is_available():
+            console.print("[red]Missing dependency: aiohttp[/red]")
+            console.print("Install with: pip install aiohttp (beautifulsoup4 optional, for extractor='bs4')")
+
     def clean_url_for_filename(self, url: str) -> str:
         """Clean URL for safe filename"""
         cleaned = url.replace('://', '_').replace('/', '_')
-        # Remove invalid filename characters  
+        # Remove invalid filename characters
         cleaned = re.sub(r'[<>:"/\\|?*]', '_', cleaned)
         return cleaned
-    
+
     def is_available(self) -> bool:
-        try:
-            import requests
-            import bs4
-            return True
-        except ImportError:
-            return False
+        # find_spec cek instalasi tanpa benar-benar meng-import aiohttp (lambat)
+        return importlib.util.find_spec("aiohttp") is not None
+
+    def version(self) -> str:
+        import sys
+        import aiohttp
+        return f"python {sys.version.split()[0]} aiohttp {aiohttp.__version__}"
+
+    def run(self, url: str, out_dir="reports", depth=2, headless=False, extra="",
+            concurrency=20, per_host_rate=None, bloom_capacity=None,
+            extractor="stream", max_body=2_000_000, on_url=None, resume=False, max_time=None, parse_workers=0,
+            dedup="near", max_per_pattern=None, force=False, cancel=None):
+        """Crawl `url` up to `depth` links deep; writes `simple_crawler_<stem>.txt`.
+
+        Requests go through the shared adaptive rate limiter: `per_host_rate`
+        is the starting rate per host (None = learned from earlier runs or the
+        limiter default, 0 = no limit).
+
+        With `parse_workers` > 0, HTML parsing, link resolution and the scope
+        filter run in that many worker processes (batched), leaving the event
+        loop to network I/O; 0 parses in-process while the body streams in.
+
+        `dedup` "near" skips pages whose content duplicates (exactly or nearly)
+        an earlier page or the site's soft-404 page, and stops fetching URL
+        patterns that keep producing duplicates (plus at most
+        `max_per_pattern` fetches per pattern); "exact" only drops exact
+        duplicates, "off" disables both. Skipped URLs and the reason are
+        written to `crawl_skipped_<stem>.txt`.
 
-    def run(self, url: str, out_dir="reports", depth=2, headless=False, extra=""):
+        Frontier, seen set and report lines are journaled to
+        reports/.checkpoints/ while crawling. After a timeout, error, Ctrl-C
+        or a session that hit `max_time` seconds, `resume=True` continues from
+        the journal without fetching finished pages again. Pages that failed
+        (connection error, timeout, 5xx) stay pending in the journal, so a
+        crawl with failures is not complete and resume retries them. The
+        journal is removed once a crawl completes.
+
+        `on_url` gets every new report line from a worker thread, so it may
+        block (e.g. a full pipeline queue) without stalling the shared HTTP
+        loop. Setting the `cancel` event stops the crawl like Ctrl-C does,
+        also when it runs on another thread than the main one.
+        """
         self.ensure_reports_dir(out_dir)
-        out = f"{out_dir}/simple_crawler_{self.clean_url_for_filename(url)}.txt"
-        
-        console.print(f"[cyan]Starting simple crawl of {url} (depth: {depth})[/cyan]")
-        
-        visited = set()
-        to_visit = [(url, 0)]  # (url, current_depth)
-        found_urls = []
-        
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        while to_visit:
-            current_url, current_depth = to_visit.pop(0)
-            
-            if current_url in visited or current_depth > depth:
-                continue
-                
-            visited.add(current_url)
-            
+        stem = self.clean_url_for_filename(url)
+        out = f"{out_dir}/simple_crawler_{stem}.txt"
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode '{dedup}', choose from: {', '.join(DEDUP_MODES)}")
+        skipped_path = f"{out_dir}/crawl_skipped_{stem}.txt"
+        params = {"url": url, "depth": depth, "extractor": extractor, "max_body": max_body,
+                  "dedup": dedup, "max_per_pattern": max_per_pattern}
+        checkpoint = CrawlCheckpoint(os.path.join(CHECKPOINT_DIR, f"simple_crawler_{stem}.log"), params)
+
+        resuming = False
+        if resume and checkpoint.exists():
+            resuming = checkpoint.header() == params
+            if not resuming:
+                console.print("[yellow]Checkpoint dibuat dengan parameter lain, crawl dimulai dari awal[/yellow]")
+        elif resume:
+            console.print("[yellow]Tidak ada checkpoint untuk target ini, crawl dimulai dari awal[/yellow]")
+
+        key = self.cache_key(url, f"depth={depth} extractor={extractor} max_body={max_body} "
+                                  f"dedup={dedup} max_per_pattern={max_per_pattern}")
+        if not resuming and self.cache_restore(key, out, force):
+            self.emit_lines(out, on_url)
+            self.record_run(out)
+            return out
+
+        frontier = Frontier(depth, scope=url, bloom_capacity=bloom_capacity)
+        seen = BloomFilter(bloom_capacity) if bloom_capacity else None
+
+        # URL ditulis langsung ke file saat ditemukan, bisa di-tail selama crawl berjalan
+        # Baris report di-dedup pada bentuk kanonik, tapi ditulis seperti aslinya
+        with StreamWriter(out, seen=seen, key=canonicalize_url) as writer, \
+                StreamWriter(skipped_path) as skipped, checkpoint.open(resuming):
+
+            def on_skip(skipped_url, reason):
+                if skipped.write(f"{skipped_url}\t{reason}"):
+                    checkpoint.skipped(skipped_url, reason)
+
+            crawl_filter = CrawlFilter(dedup, max_per_pattern, on_skip) if dedup != "off" else None
+            frontier.on_push = checkpoint.queued
+            if crawl_filter is not None:
+                frontier.guard = crawl_filter.accept
+            if resuming:
+                pending, seen_urls, emitted, fetched, skipped_urls = checkpoint.replay()
+                frontier.restore(pending, seen_urls)
+                writer.restore(emitted)
+                skipped.restore(f"{u}\t{r}" for u, r in skipped_urls)
+                console.print(f"[cyan]Melanjutkan crawl {url}: {fetched} halaman sudah selesai, "
+                              f"{len(pending)} di antrean, {writer.count} URL tersimpan[/cyan]")
+            else:
+                console.print(f"[cyan]Starting simple crawl of {url} (depth: {depth}, "
+                              f"concurrency: {concurrency})[/cyan]")
+                frontier.push(url, 0)
+            extractor_cls = functools.partial(get_extractor(extractor), fingerprint=crawl_filter is not None)
+            pool = ParsePool(parse_workers, extractor, frontier.scope,
+                             fingerprint=crawl_filter is not None) if parse_workers else None
+            # Path acak yang pasti tidak ada: jawaban 200 di sini adalah soft-404 situs ini
+            root = url.split("://", 1)[0] + "://" + frontier.scope
+            probes = [f"{root}/{secrets.token_hex(8)}", f"{root}/{secrets.token_hex(6)}/{secrets.token_hex(6)}.html"]
+            job = None
             try:
-                console.print(f"[dim]Crawling: {current_url} (depth: {current_depth})[/dim]")
-                response = session.get(current_url, timeout=10, allow_redirects=True)
-                
-                if response.status_code == 200:
-                    found_urls.append(current_url)
-                    
-                    # Parse HTML untuk cari links baru
-                    if 'text/html' in response.headers.get('Content-Type', ''):
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        
-                        # Cari semua links
-                        for link in soup.find_all('a', href=True):
-                            href = link['href'].strip()
-                            if href:
-                                absolute_url = urljoin(current_url, href)
-                                parsed = urlparse(absolute_url)
-                                
-                                # Hanya crawl dari domain yang sama
-                                if parsed.netloc == urlparse(url).netloc:
-                                    if absolute_url not in visited and current_depth < depth:
-                                        to_visit.append((absolute_url, current_depth + 1))
-                                        
-                        # Cari form actions
-                        for form in soup.find_all('form', action=True):
-                            action = form['action'].strip()
-                            if action:
-                                absolute_url = urljoin(current_url, action)
-                                parsed = urlparse(absolute_url)
-                                if parsed.netloc == urlparse(url).netloc:
-                                    found_urls.append(absolute_url)
-                
-                time.sleep(0.5)  # Rate limiting
-                
-            except Exception as e:
-                console.print(f"[red]Error crawling {current_url}: {str(e)}[/red]")
-                continue
-        
-        # Save results
-        with open(out, 'w', encoding='utf-8') as f:
-            for found_url in sorted(set(found_urls)):
-                f.write(found_url + '\n')
-        
-        console.print(f"[green]Found {len(set(found_urls))} unique URLs[/green]")
+                job = self.run_call(lambda job: get_http_client().run(self._crawl(
+                    frontier, writer, checkpoint, concurrency, per_host_rate, extractor_cls, max_body,
+                    max_time, pool, crawl_filter, probes, on_url, cancel=(job.cancel_requested, cancel))), out=out)
+            except KeyboardInterrupt:
+                console.print("[yellow]Crawl dihentikan, hasil sementara tetap tersimpan[/yellow]")
+            finally:
+                if pool is not None:
+                    pool.close()
+
+        complete = job is not None and job.ok and job.error is None and job.value and job.value[0]["complete"]
+        if complete:
+            checkpoint.remove()
+        else:
+            if job is not None and job.value and job.value[0]["failed"]:
+                console.print(f"[yellow]{job.value[0]['failed']} halaman gagal diambil dan belum "
+                              f"dianggap selesai[/yellow]")
+            console.print(f"[yellow]Checkpoint tersimpan di {checkpoint.path}; "
+                          f"jalankan lagi dengan resume=True untuk melanjutkan[/yellow]")
+
+        if per_host_rate != 0:
+            get_rate_limiter().save()
+        if job is not None and job.value:
+            totals, elapsed, latency = job.value
+            get_metrics().record_crawl(self.name, totals["pages"], totals["bytes"], elapsed, latency,
+                                       errors=totals["errors"])
+            console.print(f"[dim]{totals['pages']} halaman, {totals['bytes'] / 1024 ** 2:.1f} MB, "
+                          f"{totals['pages'] / elapsed if elapsed else 0:.1f} halaman/s[/dim]")
+
+        if crawl_filter is not None and crawl_filter.skipped:
+            reasons = ", ".join(f"{reason} {n}" for reason, n in crawl_filter.skipped.most_common())
+            console.print(f"[yellow]{sum(crawl_filter.skipped.values())} URL dilewati ({reasons}) ➜ "
+                          f"{skipped_path}[/yellow]")
+            for pattern in crawl_filter.closed:
+                console.print(f"[dim]  pola ditutup (isi berulang): {pattern}[/dim]")
+        elif skipped.count == 0 and os.path.isfile(skipped_path):
+            os.remove(skipped_path)
+
+        external_sort(out)
+        if complete:
+            self.cache_store(key, out)
+            self.record_run(out)
+        console.print(f"[green]Found {writer.count} unique URLs[/green]")
         return out
+
+    async def _crawl(self, frontier: Frontier, writer: StreamWriter, checkpoint: CrawlCheckpoint,
+                     concurrency: int, per_host_rate, extractor_cls, max_body: int, max_time=None, pool=None,
+                     crawl_filter=None, probes=(), on_url=None, cancel=()):
+        """Crawl loop: keep up to `concurrency` fetches in flight, handle pages as they complete.
+
+        With a `crawl_filter`, `probes` (URLs that should not exist) are fetched
+        first, without following redirects, to learn the soft-404 page; queued
+        URLs of closed patterns are skipped and duplicate pages are neither
+        reported nor expanded. The seed page (depth 0) is never a soft-404.
+
+        New report lines are handed to `on_url` in batches on a worker thread;
+        the crawl waits for each hand-off (backpressure), the loop does not.
+        Stops early (keeping what was written and journaled so far) once one
+        of the `cancel` events is set or `max_time` seconds have passed.
+        Returns (totals, elapsed seconds, latency histogram) for the metrics sink;
+        totals["complete"] is False when the frontier was not exhausted or
+        totals["failed"] pages could not be fetched (those are not journaled
+        as done, so a resume fetches them again).
+        """
+        limiter = get_rate_limiter() if per_host_rate != 0 else None
+        in_flight = {}  # task -> url
+        latency = Histogram()
+        totals = {"pages": 0, "bytes": 0, "errors": 0, "failed": 0, "complete": False}
+        started = asyncio.get_running_loop().time()
+        deadline = started + max_time if max_time else None
+
+        new_lines = []
+
+        def emit(line, key=None):
+            if writer.write(line, key):
+                checkpoint.emitted(line)
+                if on_url is not None:
+                    new_lines.append(line)
+
+        async def hand_off():
+            # on_url boleh memblok (antrean pipeline penuh): jalan di thread lain, loop HTTP bersama tetap jalan
+            if new_lines:
+                batch = new_lines[:]
+                new_lines.clear()
+                await asyncio.get_running_loop().run_in_executor(None, _deliver, on_url, batch)
+
+        client = get_http_client()
+        if crawl_filter is not None:
+            for probe in probes:
+                # Tanpa redirect: situs yang mengalihkan path tak dikenal ke / tidak boleh
+                # membuat homepage dianggap soft-404
+                page = await self._fetch(client, limiter, per_host_rate, probe, 0, extractor_cls, max_body,
+                                         latency, totals, pool, redirects=False)
+                if page is not None and page is not _FAILED and page[4] is not None:
+                    crawl_filter.calibrate(page[4])
+        while frontier or in_flight:
+            if any(event is not None and event.is_set() for event in cancel) or \
+                    (deadline and asyncio.get_running_loop().time() >= deadline):
+                # Halaman yang sedang diambil belum tercatat selesai, jadi diulang saat resume
+                for task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+                break
+            while frontier and len(in_flight) < concurrency:
+                current_url, current_depth = frontier.pop()
+                if crawl_filter is not None and not crawl_filter.admit(current_url):
+                    checkpoint.fetched(current_url)
+                    continue
+                task = asyncio.create_task(
+                    self._fetch(client, limiter, per_host_rate, current_url, current_depth,
+                                extractor_cls, max_body, latency, totals, pool))
+                in_flight[task] = current_url
+            if not in_flight:
+                continue  # semua URL yang tersisa dilewati
+
+            done, _ = await asyncio.wait(in_flight, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                fetched_url = in_flight.pop(task)
+                page = task.result()
+                if page is _FAILED:
+                    # Tanpa record D: URL tetap di antrean journal dan diambil ulang saat resume
+                    totals["failed"] += 1
+                    continue
+                if page is not None:
+                    current_url, current_depth, links, actions, fingerprint = page
+                    totals["pages"] += 1
+                    if crawl_filter is not None and not crawl_filter.page(current_url, fingerprint,
+                                                                          seed=current_depth == 0):
+                        links = actions = ()  # isi sudah pernah dilihat: link-nya juga
+                    else:
+                        emit(current_url)
+                    # Hanya crawl dari domain yang sama (scope dicek oleh frontier, atau sudah
+                    # oleh worker parse bila pakai pool)
+                    for link in links:
+                        if pool is not None:
+                            frontier.push(link[0], current_depth + 1, key=link[1])
+                        else:
+                            frontier.push(link, current_depth + 1)
+                    for action in actions:
+                        found = action if pool is not None else frontier.in_scope(action)
+                        if found:
+                            emit(*found)
+                # Dicatat setelah link-nya, supaya journal yang terpotong tidak kehilangan link
+                checkpoint.fetched(fetched_url)
+            await hand_off()
+        else:
+            totals["complete"] = not totals["failed"]
+
+        await hand_off()
+        return totals, asyncio.get_running_loop().time() - started, latency
+
+    async def _fetch(self, client, limiter, rate, url: str, depth: int,
+                     extractor_cls, max_body: int, latency: Histogram, totals: dict, pool=None, retries=2,
+                     redirects=True):
+        """Fetch one page and extract links while the body streams in (or afterwards in `pool`).
+
+        Returns (url, depth, links, actions, fingerprint) for 200 responses, None for
+        other answers and _FAILED when the page could not be fetched (connection
+        error, timeout, 5xx, or still 429/503 after `retries`).
+        Non-HTML bodies are never read; HTML bodies stop after `max_body` bytes.
+        Request latency (until the body is read) and bytes go into `latency`/`totals`.
+        429/503 responses are fed to `limiter` and retried after its backoff.
+        """
+        import aiohttp
+        host = host_of(url)
+        try:
+            for attempt in range(retries + 1):
+                if limiter is not None:
+                    await limiter.acquire(host, rate)
+                if attempt == 0:
+                    console.print(f"[dim]Crawling: {url} (depth: {depth})[/dim]")
+                loop = asyncio.get_running_loop()
+                t0 = loop.time()
+                try:
+                    status, headers, page, raw = await self._get(client, url, depth, extractor_cls, max_body,
+                                                                 totals, raw=pool is not None, redirects=redirects)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if limiter is not None:
+                        limiter.observe(host, error=True)
+                    raise
+                elapsed = loop.time() - t0
+                latency.observe(elapsed)
+                if limiter is not None:
+                    limiter.observe(host, status, elapsed, headers=headers)
+                if status not in BACKOFF_STATUS or limiter is None:
+                    break
+            if status >= 500 or status in BACKOFF_STATUS:
+                raise RuntimeError(f"HTTP {status}")
+            if raw is not None:
+                # Koneksi sudah dilepas; parse di worker tidak menahan slot HTTP
+                page = await pool.parse(url, depth, *raw)
+            return page
+        except Exception as e:
+            totals["errors"] += 1
+            console.print(f"[red]Error crawling {url}: {str(e) or type(e).__name__}[/red]")
+            return _FAILED
+
+    async def _get(self, client, url: str, depth: int, extractor_cls, max_body: int, totals: dict, raw=False,
+                   redirects=True):
+        """(status, headers, page, raw body) where page is (url, depth, links, actions, fingerprint) or None.
+
+        With `raw` an HTML body is returned unparsed as (bytes, charset) instead of a page.
+        """
+        async with client.stream(url, timeout=10, max_body=max_body, redirects=redirects) as response:
+            if response.status != 200:
+                return response.status, response.headers, None, None
+            if 'text/html' not in response.content_type:
+                return response.status, response.headers, (url, depth, [], [], None), None
+            if raw:
+                body = await response.read()
+                totals["bytes"] += len(body)
+                return response.status, response.headers, None, (body, response.charset)
+
+            try:
+                decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+            except LookupError:
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            extractor = extractor_cls(url)
+            async for chunk in response.iter_chunks():
+                extractor.feed(decoder.decode(chunk))
+            totals["bytes"] += response.received
+            extractor.feed(decoder.decode(b'', final=True))
+            links, actions = extractor.result()
+            fingerprint = extractor.fingerprint.result() if extractor.fingerprint is not None else None
+            return response.status, response.headers, (url, depth, links, actions, fingerprint), None
+
+
+def _deliver(callback, lines):
+    for line in lines:
+        callback(line)
@@ -0,0 +1,221 @@
+# plugins/dedup.py
+import re
+import heapq
+import hashlib
+from collections import Counter
+from .cluster import url_shape, format_shape
+
+_WORD = re.compile(r'\w+')
+SKETCH_SIZE = 64        # hash terkecil yang disimpan per halaman (MinHash bottom-k)
+MIN_FEATURES = 16       # di bawah ini halaman terlalu kecil untuk dinilai near-duplicate
+MAX_URL_LENGTH = 2048
+MAX_SEGMENT_REPEATS = 3
+DEDUP_MODES = ("near", "exact", "off")
+
+
+def _hash(feature: str) -> int:
+    # Stabil antar proses (hash() diacak per proses, parse worker butuh nilai yang sama)
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8", "replace"), digest_size=8).digest(), "little")
+
+
+class ContentFingerprint:
+    """Features of one page: the words of its visible text and the paths of its links.
+
+    Words that also occur in the page's own URL are left out, so soft-404,
+    calendar and search pages that echo their path compare equal.
+    `result()` returns (exact digest, bottom-k MinHash sketch, feature count).
+    """
+
+    def __init__(self, url: str):
+        self.ignore = set(_WORD.findall(url.lower()))
+        self.features = set()
+
+    def feed_text(self, text: str):
+        self.features.update(w for w in _WORD.findall(text.lower()) if w not in self.ignore)
+
+    def feed_link(self, url: str):
+        # Path saja: session ID dan parameter lain di query tidak membuat halaman berbeda
+        self.features.add("@" + url.split("#", 1)[0].split("?", 1)[0].split(";", 1)[0])
+
+    def result(self):
+        hashes = sorted(_hash(f) for f in self.features)
+        digest = hashlib.blake2b(b"".join(h.to_bytes(8, "little") for h in hashes), digest_size=16).digest()
+        return digest, tuple(hashes[:SKETCH_SIZE]), len(hashes)
+
+
+def similarity(a, b) -> float:
+    """Estimated Jaccard similarity of two bottom-k sketches (exact for pages with < k features)"""
+    sa, sb = set(a), set(b)
+    union = heapq.nsmallest(SKETCH_SIZE, sa | sb)
+    if not union:
+        return 1.0
+    return sum(1 for h in union if h in sa and h in sb) / len(union)
+
+
+class ContentIndex:
+    """Exact and near-duplicate detection for crawled pages.
+
+    Exact duplicates are looked up in a digest table over every page.
+    Near-duplicates (estimated Jaccard similarity >= `threshold`) are looked
+    for among the first `samples` pages of the same URL pattern - where
+    calendars, session IDs and faceted search produce them - and among the
+    calibrated soft-404 pages of the site.
+    """
+
+    def __init__(self, near=True, threshold=0.8, samples=8):
+        self.near = near
+        self.threshold = threshold
+        self.samples = samples
+        self.exact = {}     # digest -> url
+        self.patterns = {}  # url_shape -> [(sketch, url)]
+        self.soft_404 = []  # sketch halaman "tidak ditemukan" hasil kalibrasi
+
+    def add_soft_404(self, fingerprint):
+        self.soft_404.append(fingerprint[1])
+
+    def check(self, url: str, fingerprint, soft_404=True):
+        """Skip reason if the page duplicates one seen before, else None (and the page is indexed).
+
+        `soft_404=False` skips the soft-404 comparison (for the seed page).
+        """
+        digest, sketch, size = fingerprint
+        for sample in self.soft_404 if soft_404 else ():
+            if similarity(sketch, sample) >= self.threshold:
+                return "soft-404"
+        original = self.exact.get(digest)
+        if original is not None:
+            return f"duplicate {original}"
+        self.exact[digest] = url
+        if not self.near or size < MIN_FEATURES:
+            return None
+        samples = self.patterns.setdefault(url_shape(url), [])
+        for sample, original in samples:
+            score = similarity(sketch, sample)
+            if score >= self.threshold:
+                return f"near-duplicate {original} ({score:.0%})"
+        if len(samples) < self.samples:
+            samples.append((sketch, url))
+        return None
+
+
+def _patterns(url: str):
+    """(URL pattern, pattern of its folder) - e.g. /cal/{int}?m=* and /cal/*; None for non-http URLs"""
+    shape = url_shape(url)
+    if shape is None:
+        return None
+    scheme, host, path, _ = shape
+    return shape, (scheme, host, path.rsplit("/", 1)[0] + "/*", ())
+
+
+class TrapGuard:
+    """Crawl budget per URL pattern (host, path template, parameter names) and per folder.
+
+    A pattern or folder whose fetched pages keep turning out duplicate - at
+    least `dup_ratio` of them once `min_samples` were fetched - is closed and
+    its queued and future URLs are skipped; the folder level catches traps
+    whose URLs share no template, such as soft-404 links. `max_per_pattern`
+    caps the fetches of any one pattern outright. Repeating path segments
+    (/a/b/a/b/...) and overlong URLs are rejected before they are queued.
+    """
+
+    def __init__(self, min_samples=5, dup_ratio=0.8, max_per_pattern=None):
+        self.min_samples = min_samples
+        self.dup_ratio = dup_ratio
+        self.max_per_pattern = max_per_pattern
+        self.stats = {}  # pola -> [fetched, duplicates, closed]
+
+    def check(self, url: str):
+        """Skip reason for a URL about to be queued, else None"""
+        if len(url) > MAX_URL_LENGTH:
+            return "url-too-long"
+        path = url.partition("://")[2].partition("/")[2].partition("?")[0]
+        if path and max(Counter(s for s in path.split("/") if s).values(), default=0) > MAX_SEGMENT_REPEATS:
+            return "repeating-path"
+        return self._budget(_patterns(url))
+
+    def _budget(self, patterns):
+        if patterns is None:
+            return None
+        for pattern in patterns:
+            stats = self.stats.get(pattern)
+            if stats is not None and stats[2]:
+                return f"pattern-closed {format_shape(pattern)}"
+        stats = self.stats.get(patterns[0])
+        if stats is not None and self.max_per_pattern and stats[0] >= self.max_per_pattern:
+            return f"pattern-budget {format_shape(patterns[0])}"
+        return None
+
+    def admit(self, url: str):
+        """Skip reason for a queued URL about to be fetched, else None (the fetch is counted)"""
+        patterns = _patterns(url)
+        reason = self._budget(patterns)
+        if reason is None and patterns is not None:
+            for pattern in patterns:
+                self.stats.setdefault(pattern, [0, 0, False])[0] += 1
+        return reason
+
+    def observe(self, url: str, duplicate: bool):
+        """Record a fetched page; returns the patterns this closed"""
+        closed = []
+        for pattern in _patterns(url) or ():
+            stats = self.stats.get(pattern)
+            if stats is None or stats[2]:
+                continue
+            stats[1] += duplicate
+            if stats[0] >= self.min_samples and stats[1] >= self.dup_ratio * stats[0]:
+                stats[2] = True
+                closed.append(format_shape(pattern))
+        return closed
+
+
+class CrawlFilter:
+    """Content dedup and trap budgets for one crawl, reporting every skipped URL with its reason.
+
+    mode "near" uses exact + near-duplicate detection, "exact" only exact
+    duplicates; both apply the TrapGuard budgets. `on_skip(url, reason)` is
+    called for every URL that is not queued, not fetched or not expanded.
+    """
+
+    def __init__(self, mode="near", max_per_pattern=None, on_skip=None):
+        if mode not in DEDUP_MODES or mode == "off":
+            raise ValueError(f"Unknown dedup mode '{mode}', choose from: near, exact")
+        self.index = ContentIndex(near=mode == "near")
+        self.guard = TrapGuard(max_per_pattern=max_per_pattern)
+        self.on_skip = on_skip
+        self.skipped = Counter()  # jenis alasan -> jumlah
+        self.closed = []
+
+    def _skip(self, url: str, reason: str):
+        self.skipped[reason.split(" ", 1)[0]] += 1
+        if self.on_skip:
+            self.on_skip(url, reason)
+
+    def accept(self, url: str) -> bool:
+        """Frontier guard: False (and reported) for trap URLs and closed patterns"""
+        reason = self.guard.check(url)
+        if reason:
+            self._skip(url, reason)
+        return reason is None
+
+    def admit(self, url: str) -> bool:
+        """Whether a queued URL should still be fetched"""
+        reason = self.guard.admit(url)
+        if reason:
+            self._skip(url, reason)
+        return reason is None
+
+    def page(self, url: str, fingerprint, seed=False) -> bool:
+        """Whether a fetched page is new content whose URL and links should be used.
+
+        The `seed` page is never judged a soft-404: a site whose unknown paths
+        serve the start page (SPA catch-all) would otherwise yield nothing.
+        """
+        reason = self.index.check(url, fingerprint, soft_404=not seed) if fingerprint is not None else None
+        self.closed.extend(self.guard.observe(url, reason is not None))
+        if reason:
+            self._skip(url, reason)
+        return reason is None
+
+    def calibrate(self, fingerprint):
+        """Register the page a random, non-existent URL returned (soft-404)"""
+        self.index.add_soft_404(fingerprint)
@@ -0,0 +1,304 @@
+# plugins/executor.py
+import os
+import sys
+import time
+import signal
+import threading
+import contextlib
+import subprocess
+
+# Batas default proses paralel per tool (sisanya dibatasi oleh max_workers global)
+DEFAULT_TOOL_LIMITS = {"nmap": 2, "nuclei": 2, "katana": 2, "ffuf": 2, "subfinder": 4, "python": 4}
+
+
+class Job:
+    """One submitted tool invocation (shell command or Python callable).
+
+    After `wait()` the outcome is in `returncode`, `duration`, `timed_out`,
+    `cancelled`, `stdout`/`stderr` (when captured) and `error` (callables, or
+    the first exception raised by an `on_stdout`/`on_stderr` callback).
+    `cpu_time` (user+sys seconds) and `peak_rss` (bytes) are filled in where
+    the platform reports them for the child process tree.
+    With `timeout_grace` a timed-out process is stopped like `cancel(grace=...)`:
+    SIGTERM first, SIGKILL only when it is still running `timeout_grace`
+    seconds later.
+    """
+
+    def __init__(self, tool: str, cmd=None, fn=None, timeout=None, capture=False,
+                 on_stdout=None, on_stderr=None, slot=None, timeout_grace=None):
+        self.tool = tool
+        self.cmd = cmd
+        self.fn = fn
+        self.timeout = timeout
+        self.timeout_grace = timeout_grace
+        self.capture = capture
+        self.on_stdout = on_stdout
+        self.on_stderr = on_stderr
+        self.slot = slot  # semaphore pengganti batas per tool (mis. satu per panggilan sharded)
+
+        self.returncode = None
+        self.started = None
+        self.duration = None
+        self.timed_out = False
+        self.cancelled = False
+        self.stdout = "" if capture else None
+        self.stderr = "" if capture else None
+        self.error = None
+        self.value = None  # return value of a callable job
+        self.cpu_time = None
+        self.peak_rss = None
+
+        self.cancel_requested = threading.Event()
+        self._proc = None
+        self._done = threading.Event()
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns the job itself"""
+        self._done.wait(timeout)
+        return self
+
+    def cancel(self, grace=None):
+        """Cancel a queued job or stop a running one (callables must poll `cancel_requested`).
+
+        With `grace` a process first gets SIGTERM so it can stop its own
+        children, and is killed `grace` seconds later if still running.
+        """
+        self.cancel_requested.set()
+        if self._proc is not None and self._proc.poll() is None:
+            if grace and os.name != "nt":
+                _kill(self._proc, signal.SIGTERM)
+                timer = threading.Timer(grace, _kill, args=(self._proc,))
+                timer.daemon = True
+                timer.start()
+            else:
+                _kill(self._proc)
+
+    def __repr__(self):
+        return f"<Job {self.tool} rc={self.returncode} {self.duration or 0:.1f}s>"
+
+
+def _self_peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _kill(proc: subprocess.Popen, sig=None):
+    """Kill the process and (on POSIX) the whole group spawned through the shell (or send it `sig`)"""
+    try:
+        if os.name != "nt":
+            os.killpg(proc.pid, sig or signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+class Executor:
+    """Runs jobs concurrently under a global cap and per-tool caps.
+
+    Every job gets its own thread; the thread waits for a tool slot, then a
+    global slot, so a saturated tool never holds global capacity while idle.
+    Python callables only take a tool slot: they wait on I/O or on jobs they
+    submit themselves, and holding a global slot meanwhile could starve
+    those nested jobs.
+    """
+
+    def __init__(self, max_workers=None, tool_limits=None):
+        self.max_workers = max_workers or max(4, os.cpu_count() or 1)
+        self.tool_limits = dict(DEFAULT_TOOL_LIMITS, **(tool_limits or {}))
+        self._global = threading.BoundedSemaphore(self.max_workers)
+        self._tool_sems = {}
+        self._lock = threading.Lock()
+        self._active = set()
+
+    def _tool_sem(self, tool: str):
+        with self._lock:
+            if tool not in self._tool_sems:
+                self._tool_sems[tool] = threading.BoundedSemaphore(self.tool_limits.get(tool, self.max_workers))
+            return self._tool_sems[tool]
+
+    def submit(self, cmd: str, tool: str, timeout=None, capture=False, on_stdout=None, on_stderr=None,
+               slot=None, timeout_grace=None) -> Job:
+        """Queue a shell command; returns immediately with a Job.
+
+        A `slot` semaphore replaces the per-tool cap for this job, so one call
+        (e.g. a sharded scan) can run its own number of processes without
+        changing the cap other callers see; the global cap still applies.
+        `timeout_grace` makes a timeout send SIGTERM before SIGKILL (see Job).
+        """
+        return self._start(Job(tool, cmd=cmd, timeout=timeout, capture=capture, on_stdout=on_stdout,
+                               on_stderr=on_stderr, slot=slot, timeout_grace=timeout_grace))
+
+    def submit_call(self, fn, tool: str) -> Job:
+        """Queue a Python callable `fn(job)` under the same caps"""
+        return self._start(Job(tool, fn=fn))
+
+    def _start(self, job: Job) -> Job:
+        with self._lock:
+            self._active.add(job)
+        threading.Thread(target=self._run, args=(job,), name=f"job-{job.tool}", daemon=True).start()
+        return job
+
+    def _run(self, job: Job):
+        try:
+            with job.slot or self._tool_sem(job.tool), \
+                    self._global if job.fn is None else contextlib.nullcontext():
+                if job.cancel_requested.is_set():
+                    job.cancelled = True
+                    return
+                job.started = time.monotonic()
+                if job.fn is not None:
+                    self._run_call(job)
+                else:
+                    self._run_process(job)
+                job.cancelled = job.cancel_requested.is_set()
+        except OSError as e:
+            job.error = e
+            job.returncode = 127
+        finally:
+            if job.started is not None:
+                job.duration = time.monotonic() - job.started
+            with self._lock:
+                self._active.discard(job)
+            job._done.set()
+
+    def _run_call(self, job: Job):
+        cpu_start = time.thread_time()
+        try:
+            job.value = job.fn(job)
+            job.returncode = 0
+        except Exception as e:
+            job.error = e
+            job.returncode = 1
+        finally:
+            # Callable berjalan di thread ini; RSS yang tersedia hanya milik proses sendiri
+            job.cpu_time = time.thread_time() - cpu_start
+            job.peak_rss = _self_peak_rss()
+
+    def _run_process(self, job: Job):
+        pipe_out = job.capture or job.on_stdout is not None
+        pipe_err = job.capture or job.on_stderr is not None
+        proc = subprocess.Popen(
+            job.cmd, shell=True, text=True, errors="replace",
+            stdout=subprocess.PIPE if pipe_out else None,
+            stderr=subprocess.PIPE if pipe_err else None,
+            start_new_session=(os.name != "nt"),
+        )
+        job._proc = proc
+        if job.cancel_requested.is_set():
+            _kill(proc)
+
+        readers = []
+        if pipe_out:
+            readers.append(threading.Thread(target=self._pump, args=(job, proc.stdout, "stdout", job.on_stdout)))
+        if pipe_err:
+            readers.append(threading.Thread(target=self._pump, args=(job, proc.stderr, "stderr", job.on_stderr)))
+        for r in readers:
+            r.daemon = True
+            r.start()
+
+        self._wait_process(job, proc)
+        for r in readers:
+            r.join()
+        job.returncode = proc.returncode
+
+    def _wait_process(self, job: Job, proc: subprocess.Popen):
+        """Wait with timeout; on POSIX reap via wait4 to get the child tree's CPU time and peak RSS"""
+        grace = job.timeout_grace if os.name != "nt" else None
+        if not hasattr(os, "wait4"):
+            try:
+                proc.wait(timeout=job.timeout)
+            except subprocess.TimeoutExpired:
+                job.timed_out = True
+                if grace:
+                    _kill(proc, signal.SIGTERM)
+                    try:
+                        proc.wait(timeout=grace)
+                    except subprocess.TimeoutExpired:
+                        _kill(proc)
+                else:
+                    _kill(proc)
+                proc.wait()
+            return
+
+        deadline = None if job.timeout is None else time.monotonic() + job.timeout
+        kill_at = None
+        delay = 0.005
+        while True:
+            try:
+                pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            except ChildProcessError:  # sudah di-reap di tempat lain
+                proc.wait()
+                return
+            if pid:
+                break
+            if deadline is not None and time.monotonic() >= deadline and not job.timed_out:
+                job.timed_out = True
+                if grace:
+                    # Seperti cancel(grace=...): proses sempat menghentikan proses tool-nya sendiri
+                    _kill(proc, signal.SIGTERM)
+                    kill_at = time.monotonic() + grace
+                else:
+                    _kill(proc)
+            if kill_at is not None and time.monotonic() >= kill_at:
+                kill_at = None
+                _kill(proc)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        job.cpu_time = usage.ru_utime + usage.ru_stime
+        # ru_maxrss: kilobytes on Linux, bytes on macOS
+        job.peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+    @staticmethod
+    def _pump(job: Job, stream, attr: str, callback):
+        chunks = []
+        for line in stream:
+            if callback:
+                try:
+                    callback(line.rstrip("\n"))
+                except Exception as e:
+                    # Pipe tetap dikuras; kalau tidak, proses tool macet saat buffer pipe penuh
+                    if job.error is None:
+                        job.error = e
+            if job.capture:
+                chunks.append(line)
+        stream.close()
+        if job.capture:
+            setattr(job, attr, "".join(chunks))
+
+    def running(self):
+        with self._lock:
+            return [j for j in self._active if j.started is not None]
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_executor() -> Executor:
+    """Process-wide shared executor used by every plugin"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Executor()
+        return _default
+
+
+def configure(max_workers=None, tool_limits=None) -> Executor:
+    """Replace the shared executor with new global/per-tool caps"""
+    global _default
+    with _default_lock:
+        _default = Executor(max_workers, tool_limits)
+        return _default
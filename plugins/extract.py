@@ -0,0 +1,202 @@
+# plugins/extract.py
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+from .dedup import ContentFingerprint
+
+
+class StreamExtractor(HTMLParser):
+    """Event-based link extractor: fed chunk by chunk, never builds a DOM.
+
+    With `fingerprint=True` visible text and links also go into a
+    ContentFingerprint (`self.fingerprint`) for duplicate detection.
+    """
+
+    def __init__(self, base_url: str, fingerprint=False):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links, self.actions = [], []
+        self.fingerprint = ContentFingerprint(base_url) if fingerprint else None
+        self._hidden = 0  # di dalam <script>/<style>
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._hidden += 1
+            return
+        if tag == 'a':
+            target = self.links
+            wanted = 'href'
+        elif tag == 'form':
+            target = self.actions
+            wanted = 'action'
+        else:
+            return
+        for key, value in attrs:
+            if key == wanted and value and value.strip():
+                target.append(urljoin(self.base_url, value.strip()))
+                if self.fingerprint is not None:
+                    self.fingerprint.feed_link(target[-1])
+                break
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._hidden:
+            self._hidden -= 1
+
+    def handle_data(self, data):
+        if self.fingerprint is not None and not self._hidden:
+            self.fingerprint.feed_text(data)
+
+    def result(self):
+        """Finish parsing; returns (links, form actions) as absolute URLs"""
+        self.close()
+        return self.links, self.actions
+
+
+class SoupExtractor:
+    """BeautifulSoup fallback: buffers the page and parses a full tree at the end"""
+
+    def __init__(self, base_url: str, fingerprint=False):
+        self.base_url = base_url
+        self._chunks = []
+        self.fingerprint = ContentFingerprint(base_url) if fingerprint else None
+
+    def feed(self, text: str):
+        self._chunks.append(text)
+
+    def result(self):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(''.join(self._chunks), 'html.parser')
+        links, actions = [], []
+
+        # Cari semua links
+        for link in soup.find_all('a', href=True):
+            href = link['href'].strip()
+            if href:
+                links.append(urljoin(self.base_url, href))
+
+        # Cari form actions
+        for form in soup.find_all('form', action=True):
+            action = form['action'].strip()
+            if action:
+                actions.append(urljoin(self.base_url, action))
+
+        if self.fingerprint is not None:
+            for tag in soup(['script', 'style']):
+                tag.decompose()
+            self.fingerprint.feed_text(soup.get_text(' '))
+            for link in links:
+                self.fingerprint.feed_link(link)
+        return links, actions
+
+
+EXTRACTORS = {
+    "stream": StreamExtractor,
+    "bs4": SoupExtractor,
+}
+
+
+def get_extractor(name: str = "stream"):
+    """Return the extractor class registered under `name`"""
+    try:
+        return EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown extractor '{name}', choose from: {', '.join(EXTRACTORS)}")
+
+
+def _in_scope(urls, scope):
+    """(URL without fragment, canonical key) pairs, one per key (order kept), whose host matches `scope`"""
+    from .frontier import canonicalize_url
+    result = {}
+    for url in urls:
+        url = url.strip().partition("#")[0]
+        key = canonicalize_url(url)
+        if key not in result and (scope is None or urlsplit(key).netloc == scope):
+            result[key] = url
+    return [(url, key) for key, url in result.items()]
+
+
+def parse_pages(extractor: str, scope, pages, fingerprint=False):
+    """Worker entry point: extract links from a batch of fetched pages.
+
+    `pages` holds (url, depth, body bytes, charset). Returns (url, depth,
+    links, actions, fingerprint) per page with links and actions as (url,
+    canonical key) pairs already in scope, so the crawler process only has
+    to dedup them.
+    The fingerprint is None unless `fingerprint` is set.
+    """
+    extractor_cls = get_extractor(extractor)
+    results = []
+    for url, depth, body, charset in pages:
+        try:
+            text = body.decode(charset or 'utf-8', errors='replace')
+        except LookupError:
+            text = body.decode('utf-8', errors='replace')
+        extractor_obj = extractor_cls(url, fingerprint=fingerprint)
+        extractor_obj.feed(text)
+        links, actions = extractor_obj.result()
+        results.append((url, depth, _in_scope(links, scope), _in_scope(actions, scope),
+                        extractor_obj.fingerprint.result() if fingerprint else None))
+    return results
+
+
+class ParsePool:
+    """HTML parsing and link extraction in worker processes, fed from an asyncio crawler.
+
+    `parse()` queues a page and resolves once its batch is parsed. Pages are
+    sent in batches of `batch_size` (or whatever arrived within
+    `batch_delay` seconds) so pickling and IPC cost stays small per page.
+    Workers are spawned, not forked, since the crawler runs on a thread.
+    """
+
+    def __init__(self, workers: int, extractor="stream", scope=None, batch_size=16, batch_delay=0.005,
+                 fingerprint=False):
+        self.extractor = extractor
+        self.scope = scope
+        self.fingerprint = fingerprint
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending = []  # ((url, depth, body, charset), future)
+        self._timer = None
+
+    async def parse(self, url: str, depth: int, body: bytes, charset=None):
+        """(url, depth, links, actions, fingerprint) for one page, parsed in a worker process"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((url, depth, body, charset), future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        job = asyncio.get_running_loop().run_in_executor(
+            self.executor, parse_pages, self.extractor, self.scope, [page for page, _ in batch], self.fingerprint)
+        job.add_done_callback(lambda done: self._deliver(batch, done))
+
+    @staticmethod
+    def _deliver(batch, job):
+        cancelled = job.cancelled()
+        error = None if cancelled else job.exception()
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if cancelled:
+                future.cancel()
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(job.result()[i])
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,269 @@
+# plugins/findings.py
+import os
+import re
+import sqlite3
+import threading
+from urllib.parse import urlsplit
+from .scan_nuclei import Nuclei
+from .scan_nmap import Nmap
+from .fuzz_ffuf import FFUF
+
+DEFAULT_DB = os.path.join("reports", "findings.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    id   INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    ip   TEXT
+);
+CREATE TABLE IF NOT EXISTS urls (
+    host_id INTEGER NOT NULL REFERENCES hosts(id),
+    url     TEXT NOT NULL,
+    source  TEXT NOT NULL,
+    UNIQUE (url, source)
+);
+CREATE TABLE IF NOT EXISTS ports (
+    host_id INTEGER NOT NULL REFERENCES hosts(id),
+    port    INTEGER NOT NULL,
+    proto   TEXT NOT NULL,
+    state   TEXT NOT NULL,
+    service TEXT,
+    version TEXT,
+    source  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    host_id  INTEGER NOT NULL REFERENCES hosts(id),
+    template TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    protocol TEXT,
+    url      TEXT,
+    detail   TEXT,
+    source   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fuzz_hits (
+    host_id INTEGER NOT NULL REFERENCES hosts(id),
+    url     TEXT NOT NULL,
+    status  INTEGER,
+    length  INTEGER,
+    words   INTEGER,
+    lines   INTEGER,
+    source  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ingested (
+    source TEXT PRIMARY KEY,
+    kind   TEXT NOT NULL,
+    size   INTEGER,
+    mtime  REAL,
+    rows   INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_urls_host       ON urls(host_id);
+CREATE INDEX IF NOT EXISTS idx_ports_host_port ON ports(host_id, port, state);
+CREATE INDEX IF NOT EXISTS idx_ports_port      ON ports(port, state);
+CREATE INDEX IF NOT EXISTS idx_findings_sev    ON findings(severity, host_id);
+CREATE INDEX IF NOT EXISTS idx_findings_tpl    ON findings(template);
+CREATE INDEX IF NOT EXISTS idx_findings_host   ON findings(host_id);
+CREATE INDEX IF NOT EXISTS idx_fuzz_status     ON fuzz_hits(status, length);
+CREATE INDEX IF NOT EXISTS idx_fuzz_host       ON fuzz_hits(host_id);
+CREATE INDEX IF NOT EXISTS idx_urls_source     ON urls(source);
+CREATE INDEX IF NOT EXISTS idx_ports_source    ON ports(source);
+CREATE INDEX IF NOT EXISTS idx_findings_source ON findings(source);
+CREATE INDEX IF NOT EXISTS idx_fuzz_source     ON fuzz_hits(source);
+"""
+
+# Prefix nama file report -> jenis parser
+REPORT_KINDS = [
+    ("nuclei_", "nuclei"),
+    ("ffuf_", "ffuf"),
+    ("katana_", "urls"),
+    ("simple_crawler_", "urls"),
+    ("subfinder_", "subdomains"),
+    ("nmap_", "nmap"),
+]
+
+NMAP_HOST = re.compile(r'^Nmap scan report for (\S+)(?: \(([^)]+)\))?')
+NMAP_PORT = re.compile(r'^(\d+)/(tcp|udp)\s+(\S+)\s+(\S+)(?:\s+(.*))?$')
+
+
+def report_kind(path: str):
+    base = os.path.basename(path)
+    for prefix, kind in REPORT_KINDS:
+        if base.startswith(prefix):
+            return kind
+    return None
+
+
+def host_of(target: str) -> str:
+    """Hostname of a URL or bare host[:port]"""
+    if "://" not in target:
+        target = "//" + target
+    return (urlsplit(target).hostname or "").lower()
+
+
+class FindingsIndex:
+    """Indexed SQLite store of every plugin's output.
+
+    Reports are loaded in one transaction per file; a file that did not
+    change since its last ingestion (same size and mtime) is skipped.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._host_ids = {}
+
+    def close(self):
+        self.conn.close()
+
+    def _host_id(self, name: str, ip=None) -> int:
+        host_id = self._host_ids.get(name)
+        if host_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO hosts(name, ip) VALUES (?, ?)", (name, ip))
+            host_id = self.conn.execute("SELECT id FROM hosts WHERE name = ?", (name,)).fetchone()[0]
+            self._host_ids[name] = host_id
+        if ip:
+            self.conn.execute("UPDATE hosts SET ip = ? WHERE id = ? AND ip IS NULL", (ip, host_id))
+        return host_id
+
+    # --- ingestion ---------------------------------------------------------
+
+    def ingest(self, path: str, kind=None, force=False) -> int:
+        """Load one report file; returns the number of rows stored (0 if unchanged/unknown)"""
+        kind = kind or report_kind(path)
+        if kind is None or not os.path.isfile(path):
+            return 0
+        st = os.stat(path)
+        source = os.path.abspath(path)
+        with self._lock:
+            row = self.conn.execute("SELECT size, mtime FROM ingested WHERE source = ?", (source,)).fetchone()
+            if row and not force and row[0] == st.st_size and row[1] == st.st_mtime:
+                return 0
+            with self.conn:  # satu transaksi per file
+                for table in ("urls", "ports", "findings", "fuzz_hits"):
+                    self.conn.execute(f"DELETE FROM {table} WHERE source = ?", (source,))
+                rows = getattr(self, f"_ingest_{kind}")(path, source)
+                self.conn.execute("INSERT OR REPLACE INTO ingested VALUES (?, ?, ?, ?, ?)",
+                                  (source, kind, st.st_size, st.st_mtime, rows))
+            return rows
+
+    def ingest_dir(self, reports_dir="reports") -> int:
+        """Ingest every known report in a folder (unchanged files are skipped)"""
+        total = 0
+        for fname in sorted(os.listdir(reports_dir)):
+            path = os.path.join(reports_dir, fname)
+            if os.path.isfile(path):
+                total += self.ingest(path)
+        return total
+
+    def _lines(self, path: str):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+
+    def _ingest_urls(self, path: str, source: str) -> int:
+        rows = ((self._host_id(host_of(u)), u, source) for u in self._lines(path))
+        return self.conn.executemany("INSERT OR IGNORE INTO urls VALUES (?, ?, ?)", rows).rowcount
+
+    def _ingest_subdomains(self, path: str, source: str) -> int:
+        count = 0
+        for name in self._lines(path):
+            self._host_id(name.lower())
+            count += 1
+        return count
+
+    def _ingest_nuclei(self, path: str, source: str) -> int:
+        rows = ((self._host_id(host_of(f["host"] or f["url"])), f["template"], f["severity"],
+                 f["protocol"], f["url"], f["detail"], source)
+                for f in Nuclei.iter_findings(path))
+        return self.conn.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?)", rows).rowcount
+
+    def _ingest_ffuf(self, path: str, source: str) -> int:
+        rows = ((self._host_id(host_of(r.get("url") or "")), r.get("url") or "", r.get("status"),
+                 r.get("length"), r.get("words"), r.get("lines"), source)
+                for r in FFUF.iter_results(path))
+        return self.conn.executemany("INSERT INTO fuzz_hits VALUES (?, ?, ?, ?, ?, ?, ?)", rows).rowcount
+
+    def _ingest_nmap(self, path: str, source: str) -> int:
+        rows = self._nmap_xml_rows(path, source) if path.endswith(".xml") else self._nmap_text_rows(path, source)
+        return self.conn.executemany("INSERT INTO ports VALUES (?, ?, ?, ?, ?, ?, ?)", rows).rowcount
+
+    def _nmap_xml_rows(self, path: str, source: str):
+        for host in Nmap.iter_hosts(path):
+            name = (host["hostnames"][0] if host["hostnames"] else host["address"] or "").lower()
+            host_id = self._host_id(name, host["address"])
+            for p in host["ports"]:
+                version = " ".join(v for v in (p["product"], p["version"]) if v) or None
+                yield (host_id, p["port"], p["proto"], p["state"], p["service"], version, source)
+
+    def _nmap_text_rows(self, path: str, source: str):
+        """Rows from a legacy `-oN` report"""
+        host_id = None
+        for line in self._lines(path):
+            m = NMAP_HOST.match(line)
+            if m:
+                name, ip = m.groups()
+                host_id = self._host_id(name.lower(), ip or (name if re.match(r'^[\d.]+$', name) else None))
+                continue
+            m = NMAP_PORT.match(line)
+            if m and host_id is not None:
+                port, proto, state, service, version = m.groups()
+                yield (host_id, int(port), proto, state, service, version, source)
+
+    # --- queries -------------------------------------------------------------
+
+    def query(self, sql: str, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def count(self, source: str) -> int:
+        """Rows stored for one report file"""
+        row = self.query("SELECT rows FROM ingested WHERE source = ?", (os.path.abspath(source),))
+        return row[0][0] if row else 0
+
+    def severity_counts(self):
+        return self.query("SELECT severity, COUNT(*) FROM findings GROUP BY severity ORDER BY COUNT(*) DESC")
+
+    def url_counts(self, limit=20):
+        """URL counts per host"""
+        return self.query("""
+            SELECT h.name, COUNT(DISTINCT u.url) AS n FROM urls u JOIN hosts h ON h.id = u.host_id
+            GROUP BY u.host_id ORDER BY n DESC LIMIT ?""", (limit,))
+
+    def findings_on_open_port(self, port=443, severities=("high", "critical")):
+        """Findings of the given severities on hosts where `port` is open"""
+        marks = ",".join("?" * len(severities))
+        return self.query(f"""
+            SELECT h.name, f.severity, f.template, f.url FROM findings f
+            JOIN hosts h ON h.id = f.host_id
+            WHERE f.severity IN ({marks})
+              AND EXISTS (SELECT 1 FROM ports p WHERE p.host_id = f.host_id AND p.port = ? AND p.state = 'open')
+            ORDER BY h.name, f.severity""", (*severities, port))
+
+    def fuzz_hits(self, status=None, min_length=None):
+        sql, params = "SELECT url, status, length, words, lines FROM fuzz_hits WHERE 1=1", []
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        if min_length is not None:
+            sql += " AND length >= ?"
+            params.append(min_length)
+        return self.query(sql, params)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_index() -> FindingsIndex:
+    """Process-wide shared findings index"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = FindingsIndex()
+        return _default
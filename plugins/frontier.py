@@ -0,0 +1,117 @@
+# plugins/frontier.py
+import math
+import hashlib
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize URL so equivalent links dedup to one entry.
+
+    Lowercases scheme and host, drops default ports and fragments,
+    sorts query parameters and gives an empty path a trailing "/".
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:  # IPv6 literal
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{userinfo}@{host}"
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc += f":{port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class BloomFilter:
+    """Compact probabilistic seen-set (false positives possible, no false negatives)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: two 64-bit halves of one digest give all k positions
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class Frontier:
+    """FIFO crawl frontier with canonicalization, host scope and dedup at enqueue time.
+
+    The canonical form of a URL is only its dedup key: URLs are queued, and
+    so fetched and reported, as the page wrote them (minus the fragment),
+    since `?flag` -> `flag=` or `%20` -> `+` can change what a server does.
+    """
+
+    def __init__(self, max_depth: int, scope: str = None, bloom_capacity: int = None,
+                 error_rate: float = 0.001):
+        self.max_depth = max_depth
+        self.scope = urlsplit(canonicalize_url(scope)).netloc if scope else None
+        self.queue = deque()  # (url, depth)
+        self.seen = BloomFilter(bloom_capacity, error_rate) if bloom_capacity else set()  # canonical keys
+        self.on_push = None   # callback(url, depth) untuk setiap URL yang masuk antrean, mis. checkpoint
+        self.guard = None     # callback(url) -> False untuk URL baru yang tidak boleh masuk antrean (trap)
+
+    def in_scope(self, url: str):
+        """(URL without fragment, canonical key) if the URL belongs to the crawl scope, else None"""
+        url = url.strip().partition("#")[0]
+        key = canonicalize_url(url)
+        if self.scope and urlsplit(key).netloc != self.scope:
+            return None
+        return url, key
+
+    def push(self, url: str, depth: int, key: str = None) -> bool:
+        """Queue URL if it is in scope, within depth and not seen before; returns True if queued.
+
+        A given canonical `key` skips canonicalization and the scope check for
+        URLs that already went through them (e.g. in a parse worker).
+        """
+        if depth > self.max_depth:
+            return False
+        if key is None:
+            found = self.in_scope(url)
+            if found is None:
+                return False
+            url, key = found
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        if self.guard is not None and not self.guard(url):
+            return False
+        self.queue.append((url, depth))
+        if self.on_push:
+            self.on_push(url, depth)
+        return True
+
+    def restore(self, pending, seen):
+        """Reload state from a checkpoint: `seen` URLs and `pending` (url, depth) still to fetch"""
+        for url in seen:
+            self.seen.add(canonicalize_url(url))
+        self.queue.extend(pending)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue)
@@ -1,13 +1,22 @@
 # plugins/fuzz_ffuf.py
 import os
 import re
+import csv
+import json
+import shutil
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from .base import Plugin
+from .wordlist import default_wordlist, parse_extensions, prepare_wordlist
+from .ratelimit import get_rate_limiter, host_of
 
 class FFUF(Plugin):
     name = "FFUF (Content Discovery)"
     category = "Fuzzer"
     description = "Fast web fuzzer for directories/params"
     bin_name = "ffuf"
+    version_flag = "-V"
     
     def clean_url_for_filename(self, url: str) -> str:
         """Clean URL for safe filename"""
@@ -18,30 +27,148 @@ class FFUF(Plugin):
     
     def get_default_wordlist(self, mode="dir"):
         """Get default wordlist based on mode"""
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-        if mode == "dir":
-            return os.path.join(base_dir, "wordlists", "common-dirs.txt")
-        else:  # param mode
-            return os.path.join(base_dir, "wordlists", "common-params.txt")
+        return default_wordlist(mode)
+
+    def run(self, url: str, wordlist: str, out_dir="reports", mode="dir", extra="", extensions=None,
+            shards=1, rate=None, force=False):
+        """Run ffuf with the deduplicated form of `wordlist` (see wordlist.prepare_wordlist).
 
-    def run(self, url: str, wordlist: str, out_dir="reports", mode="dir", extra=""):
+        `extensions` (".php,.bak") is passed to ffuf as -e. With `shards` > 1
+        the list is split into that many slices fuzzed by concurrent ffuf
+        processes and the reports are merged into one `ffuf_<stem>.json`.
+        `rate` req/s is passed as -rate (None = rate learned for the host, 0 =
+        none), split evenly over the shards.
+        """
         self.ensure_reports_dir(out_dir)
-        
-        # Use default wordlist if file doesn't exist
-        if not os.path.isfile(wordlist):
-            default_wl = self.get_default_wordlist(mode)
-            if os.path.isfile(default_wl):
-                print(f"File {wordlist} tidak ditemukan, menggunakan wordlist default: {default_wl}")
-                wordlist = default_wl
-            else:
-                print(f"Wordlist {wordlist} tidak ditemukan dan wordlist default tidak tersedia!")
-                return None
-        
+        wl = prepare_wordlist(wordlist, mode)
+        if wl is None:
+            return None
+        with wl:
+            return self._run(url, wl, out_dir, mode, extra, extensions, shards, rate, force)
+
+    def _run(self, url, wl, out_dir, mode, extra, extensions, shards, rate, force):
         stem = self.clean_url_for_filename(url)
         out_json = f"{out_dir}/ffuf_{stem}.json"
+        extensions = parse_extensions(extensions)
+        if extensions:
+            extra = f"-e {','.join(extensions)} {extra}"
+        shards = max(1, min(shards, len(wl)))
+        rate_flag = get_rate_limiter().rate_flag(self.bin_name, host_of(url), extra, rate, share=shards)
+        if shards > 1:
+            return self._run_sharded(url, wl, out_json, mode, extra, rate_flag, shards, force)
+        cmd = self._command(url, wl.path, out_json, mode, extra)
+        job = self.run_cmd_cached(f"{cmd} {rate_flag}".strip(), out_json, url, inputs=[wl.path], force=force,
+                                  key_cmd=cmd)
+        if job is None or job.ok:
+            self.record_run(out_json)
+        return out_json
+
+    @staticmethod
+    def _command(url, wordlist, out_json, mode, extra):
         if mode == "dir":
-            cmd = f"ffuf -u {url.rstrip('/')}/FUZZ -w {wordlist} -of json -o {out_json} {extra}"
-        else:  # param fuzz
-            cmd = f"ffuf -u '{url}?FUZZ=test' -w {wordlist} -of json -o {out_json} {extra}"
-        self.run_cmd(cmd)
+            return f"ffuf -u {url.rstrip('/')}/FUZZ -w {wordlist} -of json -o {out_json} {extra}"
+        return f"ffuf -u '{url}?FUZZ=test' -w {wordlist} -of json -o {out_json} {extra}"  # param fuzz
+
+    def _run_sharded(self, url, wl, out_json, mode, extra, rate_flag, shards, force):
+        """Fuzz `shards` slices of the wordlist with concurrent ffuf processes, then merge the reports"""
+        shard_dir = os.path.splitext(out_json)[0] + "_shards"
+        paths = wl.write_shards(shards, shard_dir)
+        print(f"FFUF sharded: {len(wl)} kata dalam {shards} shard paralel")
+        done, failed = {}, []
+        lock = threading.Lock()
+        # Batas paralel khusus panggilan ini; batas ffuf bersama tidak diubah
+        slot = threading.BoundedSemaphore(shards)
+
+        def fuzz(n, path):
+            shard_out = os.path.join(shard_dir, f"shard_{n:03d}.json")
+            cmd = self._command(url, path, shard_out, mode, extra)
+            job = self.run_cmd_cached(f"{cmd} {rate_flag}".strip(), shard_out, url, inputs=[path], force=force,
+                                      key_cmd=cmd, slot=slot)
+            with lock:
+                if job is None or job.ok:
+                    done[n] = shard_out
+                else:
+                    failed.append(n)
+
+        with ThreadPoolExecutor(max_workers=shards, thread_name_prefix="ffuf-shard") as pool:
+            for future in [pool.submit(fuzz, n, p) for n, p in enumerate(paths)]:
+                future.result()
+
+        self.merge_reports([done[n] for n in sorted(done)], out_json,
+                           commandline=self._command(url, wl.path, out_json, mode, extra))
+        for n in failed:
+            print(f"Shard {n} gagal: {paths[n]}")
+        if not failed:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            self.record_run(out_json)
         return out_json
+
+    @classmethod
+    def merge_reports(cls, paths, out: str, commandline=""):
+        """Concatenate the results of several ffuf JSON reports into one, streaming"""
+        position = 0
+        with open(out, "w", encoding="utf-8") as f:
+            f.write('{"commandline": ' + json.dumps(commandline) + ', "time": '
+                    + json.dumps(datetime.now(timezone.utc).isoformat()) + ', "results": [')
+            for path in paths:
+                if not os.path.isfile(path) or os.path.getsize(path) == 0:
+                    continue
+                for r in cls.iter_results(path):
+                    position += 1
+                    r["position"] = position
+                    f.write(("\n" if position == 1 else ",\n") + json.dumps(r))
+            f.write('\n], "config": ' + json.dumps({"shards": len(paths)}) + "}\n")
+        return out
+
+    @staticmethod
+    def iter_results(path: str, chunk_size=1 << 16):
+        """Yield result dicts from an ffuf report without loading the whole document.
+
+        `-of json` reports are scanned for the "results" array and decoded one
+        object at a time; `-of csv` reports are read row by row.
+        """
+        if path.endswith(".csv"):
+            with open(path, newline="", encoding="utf-8", errors="replace") as f:
+                for row in csv.DictReader(f):
+                    for key in ("status_code", "content_length", "content_words", "content_lines"):
+                        if row.get(key, "").isdigit():
+                            row[key] = int(row[key])
+                    yield {"url": row.get("url"), "status": row.get("status_code"),
+                           "length": row.get("content_length"), "words": row.get("content_words"),
+                           "lines": row.get("content_lines"), **row}
+            return
+
+        decoder = json.JSONDecoder()
+        with open(path, encoding="utf-8", errors="replace") as f:
+            buf, pos, in_results = "", 0, False
+            while True:
+                chunk = f.read(chunk_size)
+                buf = buf[pos:] + chunk
+                pos = 0
+                if not in_results:
+                    start = buf.find('"results"')
+                    if start < 0:
+                        if not chunk:
+                            return
+                        buf = buf[-16:]  # simpan ekor kalau kata kunci terpotong antar chunk
+                        continue
+                    bracket = buf.find("[", start)
+                    if bracket < 0:
+                        if not chunk:
+                            return
+                        continue
+                    pos = bracket + 1
+                    in_results = True
+                while True:
+                    while pos < len(buf) and buf[pos] in " \t\r\n,":
+                        pos += 1
+                    if pos < len(buf) and buf[pos] == "]":
+                        return
+                    try:
+                        obj, end = decoder.raw_decode(buf, pos)
+                    except ValueError:
+                        break  # objek belum lengkap, baca chunk berikutnya
+                    yield obj
+                    pos = end
+                if not chunk:
+                    return
@@ -0,0 +1,331 @@
+# plugins/fuzz_simple.py
+import re
+import json
+import time
+import shlex
+import random
+import string
+import asyncio
+import importlib.util
+from datetime import datetime, timezone
+from .base import Plugin
+from .metrics import Histogram, get_metrics
+from .wordlist import parse_extensions, prepare_wordlist
+from .ratelimit import BACKOFF_STATUS, get_rate_limiter, host_of
+from .http import get_http_client
+from rich.console import Console
+
+console = Console()
+
+DEFAULT_MATCH_STATUS = "200-299,301,302,307,401,403,405,500"  # sama dengan default ffuf -mc
+
+# Flag ffuf yang dipahami dari `extra`
+_EXTRA_FLAGS = {"-mc": "match_status", "-fc": "filter_status", "-fs": "filter_size",
+                "-fw": "filter_words", "-fl": "filter_lines", "-t": "concurrency", "-e": "extensions",
+                "-rate": "rate"}
+# Flag ffuf tanpa nilai; flag lain yang tidak dikenal dianggap memakan token berikutnya
+_FFUF_SWITCHES = {"-ac", "-ach", "-c", "-ic", "-json", "-noninteractive", "-or", "-r", "-raw", "-recursion",
+                  "-s", "-sa", "-se", "-sf", "-v", "-http2"}
+
+
+def parse_ranges(spec):
+    """'200,301-399' -> [(200, 200), (301, 399)]; None/'' -> None ('all' matches everything)"""
+    if spec is None or str(spec).strip() == "":
+        return None
+    if str(spec).strip() == "all":
+        return [(0, float("inf"))]
+    ranges = []
+    for part in str(spec).replace(" ", "").split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        ranges.append((int(lo), int(hi or lo)))
+    return ranges
+
+
+def in_ranges(value, ranges) -> bool:
+    return any(lo <= value <= hi for lo, hi in ranges)
+
+
+def parse_extra(extra: str):
+    """Options from the ffuf flags in `extra` that SimpleFuzzer understands (see _EXTRA_FLAGS).
+
+    Returns (options, errors); values of other flags are skipped, never read as flags.
+    """
+    try:
+        tokens = shlex.split(extra or "")
+    except ValueError as e:
+        return {}, [f"Extra tidak bisa diurai: {e}"]
+    opts, errors, i = {}, [], 0
+    while i < len(tokens):
+        flag = tokens[i]
+        takes_value = flag.startswith("-") and flag not in _FFUF_SWITCHES
+        value = tokens[i + 1] if takes_value and i + 1 < len(tokens) else None
+        i += 2 if takes_value else 1
+        if flag not in _EXTRA_FLAGS:
+            continue
+        if value is None:
+            errors.append(f"Flag {flag} butuh nilai")
+            continue
+        try:
+            if flag == "-t":
+                opts["concurrency"] = int(value)
+                if opts["concurrency"] < 1:
+                    raise ValueError
+            elif flag == "-rate":
+                opts["rate"] = float(value)
+                if opts["rate"] < 0:
+                    raise ValueError
+            elif flag == "-e":
+                opts["extensions"] = value
+            else:
+                parse_ranges(value)
+                opts[_EXTRA_FLAGS[flag]] = value
+        except ValueError:
+            errors.append(f"Nilai {flag} tidak valid: {value!r}")
+    return opts, errors
+
+
+class ResponseFilter:
+    """ffuf-style matchers and filters on status, size, words and lines.
+
+    A response is kept when its status is matched and no filter hits. Auto
+    calibration adds (status, field, value) filters learned from responses to
+    random paths, so soft-404 pages are dropped.
+    """
+
+    def __init__(self, match_status=DEFAULT_MATCH_STATUS, filter_status=None, filter_size=None,
+                 filter_words=None, filter_lines=None):
+        self.match_status = parse_ranges(match_status)
+        self.filters = {"status": parse_ranges(filter_status), "length": parse_ranges(filter_size),
+                        "words": parse_ranges(filter_words), "lines": parse_ranges(filter_lines)}
+        self.calibrated = set()  # (status, field, value)
+
+    def calibrate(self, probes):
+        """Learn soft-404 signatures from responses to random words.
+
+        Like ffuf, per status the first of length, words, lines that is identical
+        across all probes with that status becomes the filter; if none is
+        stable, the length of every probe is filtered.
+        """
+        by_status = {}
+        for r in probes:
+            by_status.setdefault(r["status"], []).append(r)
+        for status, rs in by_status.items():
+            field = next((f for f in ("length", "words", "lines") if len({r[f] for r in rs}) == 1), "length")
+            for r in rs:
+                self.calibrated.add((status, field, r[field]))
+
+    def keep(self, r) -> bool:
+        if self.match_status is not None and not in_ranges(r["status"], self.match_status):
+            return False
+        for field, ranges in self.filters.items():
+            if ranges is not None and in_ranges(r[field], ranges):
+                return False
+        return not any((r["status"], field, r[field]) in self.calibrated for field in ("length", "words", "lines"))
+
+
+class SimpleFuzzer(Plugin):
+    name = "Simple Fuzzer (Python)"
+    category = "Fuzzer"
+    description = "Built-in async content discovery (fallback for FFUF)"
+    bin_name = "python"
+
+    def clean_url_for_filename(self, url: str) -> str:
+        """Clean URL for safe filename"""
+        cleaned = url.replace("://", "_").replace("/", "_")
+        cleaned = re.sub(r'[<>:"/\\|?*]', '_', cleaned)
+        return cleaned
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec("aiohttp") is not None
+
+    def version(self) -> str:
+        import sys
+        import aiohttp
+        return f"python {sys.version.split()[0]} aiohttp {aiohttp.__version__}"
+
+    def run(self, url: str, wordlist: str, out_dir="reports", mode="dir", extra="", concurrency=50,
+            match_status=DEFAULT_MATCH_STATUS, filter_status=None, filter_size=None, filter_words=None,
+            filter_lines=None, extensions=None, shard=None, rate=None, calibrate=True, timeout=10.0,
+            max_body=5_000_000, force=False):
+        """Fuzz `url` with every word of `wordlist`; writes `ffuf_<stem>.json` in ffuf's JSON layout.
+
+        mode "dir" requests <url>/<word>, mode "param" requests <url>?<word>=test.
+        `wordlist` is deduplicated and may list several comma-separated files
+        (see wordlist.prepare_wordlist); `shard=(i, n)` fuzzes only slice i of n.
+        `rate` is the starting requests/s for the shared adaptive rate limiter
+        (None = learned or default, 0 = no limit).
+        `extra` may carry the ffuf flags -mc -fc -fs -fw -fl -t -e -rate.
+        """
+        opts = {"match_status": match_status, "filter_status": filter_status, "filter_size": filter_size,
+                "filter_words": filter_words, "filter_lines": filter_lines, "concurrency": concurrency,
+                "extensions": extensions, "rate": rate}
+        parsed, errors = parse_extra(extra)
+        if errors:
+            for error in errors:
+                console.print(f"[red]{error}[/red]")
+            return None
+        opts.update(parsed)
+
+        self.ensure_reports_dir(out_dir)
+        wl = prepare_wordlist(wordlist, mode)
+        if wl is None:
+            return None
+        with wl:
+            return self._run(url, wl, out_dir, mode, opts, shard, calibrate, timeout, max_body, force)
+
+    def _run(self, url, wl, out_dir, mode, opts, shard, calibrate, timeout, max_body, force):
+        opts["extensions"] = parse_extensions(opts["extensions"])
+        start, stop = wl.shard_bounds(*shard) if shard else (0, len(wl))
+
+        stem = self.clean_url_for_filename(url) + (f"_shard{shard[0]}of{shard[1]}" if shard else "")
+        out = f"{out_dir}/ffuf_{stem}.json"
+        flags = " ".join(f"{k}={v}" for k, v in sorted(opts.items()) if k not in ("concurrency", "rate"))
+        key = self.cache_key(url, f"mode={mode} calibrate={calibrate} range={start}-{stop} {flags}",
+                             inputs=[wl.path])
+        if self.cache_restore(key, out, force):
+            if not shard:
+                self.record_run(out)
+            return out
+
+        template = f"{url.rstrip('/')}/FUZZ" if mode == "dir" else f"{url}?FUZZ=test"
+        response_filter = ResponseFilter(opts["match_status"], opts["filter_status"], opts["filter_size"],
+                                         opts["filter_words"], opts["filter_lines"])
+        console.print(f"[cyan]Fuzzing {template} (concurrency: {opts['concurrency']})[/cyan]")
+        job = None
+        try:
+            words = wl.iter_range(start, stop, opts["extensions"])
+            job = self.run_call(lambda job: get_http_client().run(self._fuzz(
+                template, words, wl.path, out, response_filter, opts["concurrency"], calibrate, timeout,
+                max_body, opts["rate"], cancel=job.cancel_requested)), out=out)
+        except KeyboardInterrupt:
+            console.print("[yellow]Fuzzing dihentikan, hasil sementara tetap tersimpan[/yellow]")
+
+        if opts["rate"] != 0:
+            get_rate_limiter().save()
+        if job is not None and job.value:
+            totals, elapsed, latency = job.value
+            get_metrics().record_crawl(self.name, totals["requests"], totals["bytes"], elapsed, latency,
+                                       errors=totals["errors"])
+            console.print(f"[green]{totals['hits']} hasil dari {totals['requests']} request "
+                          f"({totals['requests'] / elapsed if elapsed else 0:.0f} req/s, "
+                          f"{totals['errors']} error)[/green]")
+        if job is not None and job.ok and job.error is None:
+            self.cache_store(key, out)
+            if not shard:
+                self.record_run(out)
+        return out
+
+    async def _request(self, client, template: str, word: str, timeout: float, max_body: int, limiter=None,
+                       rate=None, retries=2):
+        """One request through `limiter`; 429/503 are retried after the limiter's backoff"""
+        import aiohttp
+        if limiter is None:
+            return await self._send(client, template, word, timeout, max_body)
+        host = host_of(template)
+        for _ in range(retries + 1):
+            await limiter.acquire(host, rate)
+            try:
+                r, headers = await self._send(client, template, word, timeout, max_body, with_headers=True)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                limiter.observe(host, error=True)
+                raise
+            limiter.observe(host, r["status"], r["duration"] / 1e9, headers=headers)
+            if r["status"] not in BACKOFF_STATUS:
+                break
+        return r
+
+    async def _send(self, client, template: str, word: str, timeout: float, max_body: int, with_headers=False):
+        """One request; returns an ffuf-style result dict (body counted while streaming)"""
+        from urllib.parse import quote
+        url = template.replace("FUZZ", quote(word, safe="/.-_~"))
+        started = time.perf_counter()
+        async with client.stream(url, timeout=timeout, redirects=False, verify=False,
+                                 max_body=max_body) as response:
+            spaces, newlines = 0, 0
+            async for chunk in response.iter_chunks():
+                spaces += chunk.count(b" ")
+                newlines += chunk.count(b"\n")
+            length = response.received
+            result = {
+                "input": {"FUZZ": word},
+                "status": response.status,
+                "length": length,
+                # Cara hitung sama dengan ffuf: jumlah potongan hasil split spasi / newline
+                "words": spaces + 1 if length else 0,
+                "lines": newlines + 1 if length else 0,
+                "content-type": response.content_type,
+                "redirectlocation": response.headers.get("Location", ""),
+                "url": url,
+                "duration": int((time.perf_counter() - started) * 1e9),
+                "resultfile": "",
+                "host": response.host,
+            }
+            return (result, response.headers) if with_headers else result
+
+    async def _fuzz(self, template: str, words, wordlist: str, out: str, response_filter: ResponseFilter,
+                    concurrency: int, calibrate: bool, timeout: float, max_body: int, rate=None, cancel=None):
+        """Worker pool over the `words` iterator; matching results are appended to `out` as they arrive.
+
+        Returns (totals, elapsed seconds, latency histogram). A failing request
+        (any exception) is counted in totals["errors"]; the JSON report is
+        always closed, also when the run is interrupted.
+        """
+        totals = {"requests": 0, "hits": 0, "errors": 0, "bytes": 0}
+        latency = Histogram()
+        limiter = get_rate_limiter() if rate != 0 else None
+        started = time.perf_counter()
+        client = get_http_client()
+
+        if calibrate:
+            probes = [
+                "".join(random.choices(string.ascii_lowercase + string.digits, k=16)),
+                "".join(random.choices(string.ascii_lowercase + string.digits, k=24)),
+                "." + "".join(random.choices(string.ascii_lowercase, k=12)),
+                "admin" + "".join(random.choices(string.ascii_lowercase + string.digits, k=12)),
+            ]
+            results = await asyncio.gather(*(self._request(client, template, p, timeout, max_body, limiter, rate)
+                                             for p in probes), return_exceptions=True)
+            response_filter.calibrate([r for r in results if isinstance(r, dict)])
+            if response_filter.calibrated:
+                console.print(f"[dim]Auto-calibration: {len(response_filter.calibrated)} filter soft-404[/dim]")
+
+        position = iter(range(1, 1 << 62))
+        with open(out, "w", encoding="utf-8") as f:
+            f.write('{"commandline": ' + json.dumps(f"blackbox simple-fuzzer -u {template} -w {wordlist}")
+                    + ', "time": ' + json.dumps(datetime.now(timezone.utc).isoformat()) + ', "results": [')
+            first = True
+
+            async def worker():
+                nonlocal first
+                for word in words:  # generator dibagi bersama: tiap kata diambil satu worker
+                    if cancel is not None and cancel.is_set():
+                        return
+                    n = next(position)
+                    try:
+                        r = await self._request(client, template, word, timeout, max_body, limiter, rate)
+                    except Exception:
+                        # Bukan hanya ClientError/timeout: mis. UnicodeDecodeError atau OSError dari connector
+                        totals["errors"] += 1
+                        continue
+                    totals["requests"] += 1
+                    totals["bytes"] += r["length"]
+                    latency.observe(r["duration"] / 1e9)
+                    if not response_filter.keep(r):
+                        continue
+                    r["position"] = n
+                    totals["hits"] += 1
+                    f.write(("\n" if first else ",\n") + json.dumps(r))
+                    first = False
+                    console.print(f"[green][{r['status']}][/green] {r['url']} "
+                                  f"[dim](size {r['length']}, words {r['words']}, lines {r['lines']})[/dim]")
+
+            try:
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            finally:
+                f.write('\n], "config": ' + json.dumps({"url": template, "wordlist": wordlist,
+                                                        "threads": concurrency, "autocalibration": calibrate})
+                        + "}\n")
+
+        return totals, time.perf_counter() - started, latency
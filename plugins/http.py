@@ -0,0 +1,264 @@
+# plugins/http.py
+import atexit
+import asyncio
+import threading
+import importlib.util
+from contextlib import asynccontextmanager
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+DEFAULT_LIMIT = 256          # koneksi terbuka total di pool
+DEFAULT_LIMIT_PER_HOST = 100  # koneksi per host (0 = tanpa batas)
+DEFAULT_KEEPALIVE = 30.0     # detik koneksi idle dibiarkan terbuka
+DEFAULT_DNS_TTL = 300        # detik hasil DNS disimpan di cache
+DEFAULT_MAX_BODY = 5_000_000
+CHUNK_SIZE = 65536
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs httpx with the h2 extra (pip install 'httpx[http2]')"""
+    return importlib.util.find_spec("httpx") is not None and importlib.util.find_spec("h2") is not None
+
+
+class Response:
+    """A response whose headers are in and whose body is still streaming.
+
+    `iter_chunks()` yields the body and stops after `max_body` bytes
+    (`truncated` is then True); `read()` collects it. `received` counts the
+    bytes read so far.
+    """
+
+    def __init__(self, status: int, headers, url: str, host: str, charset, http_version: str, chunks,
+                 max_body: int):
+        self.status = status
+        self.headers = headers
+        self.url = url
+        self.host = host
+        self.charset = charset
+        self.http_version = http_version
+        self.max_body = max_body
+        self.received = 0
+        self.truncated = False
+        self._chunks = chunks
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("Content-Type", "")
+
+    async def iter_chunks(self):
+        async for chunk in self._chunks:
+            # Body tepat max_body byte tidak terpotong; baru byte berikutnya yang membuatnya truncated
+            if self.received + len(chunk) > self.max_body:
+                chunk = chunk[:self.max_body - self.received]
+                self.received += len(chunk)
+                self.truncated = True
+                if chunk:
+                    yield chunk
+                return
+            self.received += len(chunk)
+            yield chunk
+
+    async def read(self) -> bytes:
+        body = bytearray()
+        async for chunk in self.iter_chunks():
+            body += chunk
+        return bytes(body)
+
+
+async def _httpx_chunks(response):
+    # Error httpx diterjemahkan ke jenis aiohttp, supaya engine cukup menangkap satu keluarga error
+    import httpx
+    import aiohttp
+    try:
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            yield chunk
+    except httpx.TimeoutException as e:
+        raise asyncio.TimeoutError() from e
+    except httpx.TransportError as e:
+        raise aiohttp.ClientPayloadError(str(e) or type(e).__name__) from e
+
+
+class HttpClient:
+    """Pooled HTTP client shared by the Python engines (crawler, fuzzer, future probes).
+
+    aiohttp sessions belong to the event loop they were created on and every
+    asyncio.run() starts a new loop, so a session per run threw away its
+    keep-alive connections, TLS handshakes and DNS answers. This client owns
+    one long-lived loop in a daemon thread: engines run their coroutine with
+    `run(coro)` and send requests with `stream(url)`, and the connection
+    pool (`limit` in total, `limit_per_host` per host, idle for up to
+    `keepalive` seconds) and the DNS cache (`dns_ttl` seconds) carry over
+    from run to run. `stats` counts requests; with `trace=True` also new and
+    reused connections and DNS lookups and cache hits.
+
+    With `http2=True` and httpx[http2] installed, https requests go through
+    httpx over HTTP/2, where all requests to a host share one multiplexed
+    connection; plain http stays on aiohttp.
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT, limit_per_host=DEFAULT_LIMIT_PER_HOST, keepalive=DEFAULT_KEEPALIVE,
+                 dns_ttl=DEFAULT_DNS_TTL, max_body=DEFAULT_MAX_BODY, http2=False, user_agent=USER_AGENT,
+                 trace=False):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive = keepalive
+        self.dns_ttl = dns_ttl
+        self.max_body = max_body
+        self.http2 = http2 and http2_available()
+        self.user_agent = user_agent
+        self.trace = trace
+        self.stats = {"requests": 0, "connections": 0, "reused": 0, "dns_lookups": 0, "dns_hits": 0}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._h2 = {}  # verify -> httpx.AsyncClient
+        self._timeouts = {}
+
+    def configure(self, **settings):
+        """Change pool settings (same names as the constructor); open connections are closed"""
+        self.close()
+        for name, value in settings.items():
+            if not hasattr(self, name) or name.startswith("_") or name == "stats":
+                raise ValueError(f"Unknown HTTP client setting: {name}")
+            setattr(self, name, value)
+        self.http2 = self.http2 and http2_available()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="http-client", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro):
+        """Run `coro` on the client's loop and wait for its result (use instead of asyncio.run)"""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("HttpClient.run() dipanggil dari loop HTTP client sendiri; pakai await")
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result()
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def _aiohttp(self):
+        import aiohttp
+        if self._session is None or self._session.closed:
+            traces = []
+            if self.trace:
+                # Hook trace aiohttp membebani setiap request, jadi hanya aktif bila diminta
+                trace = aiohttp.TraceConfig()
+                trace.on_connection_create_end.append(self._count("connections"))
+                trace.on_connection_reuseconn.append(self._count("reused"))
+                trace.on_dns_resolvehost_end.append(self._count("dns_lookups"))
+                trace.on_dns_cache_hit.append(self._count("dns_hits"))
+                traces.append(trace)
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive, use_dns_cache=True,
+                                             ttl_dns_cache=self.dns_ttl)
+            self._session = aiohttp.ClientSession(connector=connector, headers={"User-Agent": self.user_agent},
+                                                  timeout=aiohttp.ClientTimeout(total=None),
+                                                  trace_configs=traces)
+        return self._session
+
+    def _timeout(self, seconds):
+        import aiohttp
+        timeout = self._timeouts.get(seconds)
+        if timeout is None:
+            timeout = self._timeouts[seconds] = aiohttp.ClientTimeout(total=seconds)
+        return timeout
+
+    def _count(self, name: str):
+        async def hook(session, ctx, params):
+            self.stats[name] += 1
+        return hook
+
+    def _httpx(self, verify: bool):
+        import httpx
+        client = self._h2.get(verify)
+        if client is None:
+            limits = httpx.Limits(max_connections=self.limit, max_keepalive_connections=self.limit,
+                                  keepalive_expiry=self.keepalive)
+            client = self._h2[verify] = httpx.AsyncClient(http2=True, limits=limits, verify=verify,
+                                                          headers={"User-Agent": self.user_agent})
+        return client
+
+    @asynccontextmanager
+    async def stream(self, url: str, method="GET", headers=None, timeout=10.0, redirects=True, verify=True,
+                     max_body=None):
+        """Send a request and yield its Response as soon as the headers are in.
+
+        Must be awaited inside a coroutine started with `run()`. The body is
+        read through the Response (capped at `max_body`, default the client's);
+        leaving the block releases the connection back to the pool.
+        Failures raise aiohttp.ClientError or asyncio.TimeoutError.
+        """
+        if asyncio.get_running_loop() is not self._loop:
+            raise RuntimeError("HttpClient.stream() hanya bisa dipakai di coroutine yang dijalankan lewat run()")
+        max_body = self.max_body if max_body is None else max_body
+        self.stats["requests"] += 1
+        if self.http2 and url.startswith("https://"):
+            async with self._stream_h2(url, method, headers, timeout, redirects, verify, max_body) as response:
+                yield response
+            return
+        import aiohttp
+        async with self._aiohttp().request(method, url, headers=headers, allow_redirects=redirects,
+                                           ssl=True if verify else False,
+                                           timeout=self._timeout(timeout)) as response:
+            yield Response(response.status, response.headers, str(response.url), response.url.host or "",
+                           response.charset, f"HTTP/{response.version.major}.{response.version.minor}",
+                           response.content.iter_chunked(CHUNK_SIZE), max_body)
+
+    @asynccontextmanager
+    async def _stream_h2(self, url, method, headers, timeout, redirects, verify, max_body):
+        import httpx
+        import aiohttp
+        try:
+            async with self._httpx(verify).stream(method, url, headers=headers, timeout=timeout,
+                                                  follow_redirects=redirects) as response:
+                yield Response(response.status_code, response.headers, str(response.url), response.url.host,
+                               response.charset_encoding, response.http_version, _httpx_chunks(response), max_body)
+        except httpx.TimeoutException as e:
+            raise asyncio.TimeoutError() from e
+        except httpx.TransportError as e:
+            raise aiohttp.ClientConnectionError(str(e) or type(e).__name__) from e
+
+    async def _aclose(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        for client in self._h2.values():
+            await client.aclose()
+        self._h2 = {}
+
+    def close(self):
+        """Close all pooled connections and stop the loop thread (the next run() starts a fresh pool)"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout=5)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide shared HTTP client (closed at interpreter exit)"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+            atexit.register(_default.close)
+        return _default
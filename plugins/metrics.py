@@ -0,0 +1,231 @@
+# plugins/metrics.py
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from .cache import file_lock
+
+METRICS_JSONL = os.path.join("reports", "metrics.jsonl")
+METRICS_PROM = os.path.join("reports", "metrics.prom")
+METRICS_STATE = os.path.join("reports", "metrics.state.json")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+
+
+@contextmanager
+def stage(name: str):
+    """Label every metric recorded in this thread with a pipeline/batch stage name"""
+    previous = getattr(_local, "stage", None)
+    _local.stage = name
+    try:
+        yield
+    finally:
+        _local.stage = previous
+
+
+def current_stage():
+    return getattr(_local, "stage", None)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # slot terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram"):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.sum += other.sum
+        self.count += other.count
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        hist = cls(data["buckets"])
+        hist.counts = list(data["counts"])
+        hist.sum = data["sum"]
+        hist.count = data["count"]
+        return hist
+
+    def to_dict(self):
+        return {"buckets": list(self.buckets), "counts": self.counts, "sum": round(self.sum, 6), "count": self.count}
+
+
+def output_stats(path: str):
+    """(bytes, lines) of a report file, or (None, None) if missing"""
+    if not path or not os.path.isfile(path):
+        return None, None
+    lines = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+    return os.path.getsize(path), lines
+
+
+class Metrics:
+    """Appends one JSON line per event and keeps a Prometheus textfile up to date.
+
+    The textfile (node_exporter textfile-collector format) holds totals,
+    labelled by plugin and stage, of every process writing to the same
+    reports/ (e.g. scheduler jobs). They are kept in `state_path` and updated
+    under a file lock, so `_total` counters only grow instead of jumping
+    between the session totals of different processes.
+    """
+
+    def __init__(self, jsonl_path=METRICS_JSONL, prom_path=METRICS_PROM, state_path=METRICS_STATE):
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._counters = {}    # (metric, labels) -> value
+        self._gauges = {}
+        self._histograms = {}  # (metric, labels) -> Histogram
+
+    def _labels(self, **labels):
+        return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+    def record_run(self, plugin: str, job, out=None):
+        """Record one finished executor Job (wall/CPU time, peak RSS, output size)"""
+        out_bytes, out_lines = output_stats(out)
+        status = "timeout" if job.timed_out else "cancelled" if job.cancelled else \
+            "ok" if job.returncode == 0 else "failed"
+        event = {
+            "event": "run", "plugin": plugin, "stage": current_stage(), "status": status,
+            "returncode": job.returncode, "wall_s": _round(job.duration), "cpu_s": _round(job.cpu_time),
+            "peak_rss_bytes": job.peak_rss, "output": out, "output_bytes": out_bytes, "output_lines": out_lines,
+            "cmd": job.cmd,
+        }
+        labels = self._labels(plugin=plugin, stage=current_stage())
+        with self._shared():
+            self._inc("blackbox_runs_total", self._labels(plugin=plugin, stage=current_stage(), status=status))
+            self._inc("blackbox_run_wall_seconds_total", labels, job.duration or 0.0)
+            self._inc("blackbox_run_cpu_seconds_total", labels, job.cpu_time or 0.0)
+            self._inc("blackbox_run_output_bytes_total", labels, out_bytes or 0)
+            self._inc("blackbox_run_output_lines_total", labels, out_lines or 0)
+            if job.peak_rss:
+                key = ("blackbox_run_peak_rss_bytes", labels)
+                self._gauges[key] = max(self._gauges.get(key, 0), job.peak_rss)
+            self._emit(event)
+
+    def record_crawl(self, plugin: str, pages: int, bytes_down: int, elapsed: float, latency: Histogram,
+                     errors=0):
+        """Record crawler throughput and the per-request latency histogram"""
+        event = {
+            "event": "crawl", "plugin": plugin, "stage": current_stage(), "pages": pages,
+            "errors": errors, "bytes": bytes_down, "elapsed_s": _round(elapsed),
+            "pages_per_s": _round(pages / elapsed if elapsed else 0.0), "latency": latency.to_dict(),
+        }
+        labels = self._labels(plugin=plugin, stage=current_stage())
+        with self._shared():
+            self._inc("blackbox_crawl_pages_total", labels, pages)
+            self._inc("blackbox_crawl_errors_total", labels, errors)
+            self._inc("blackbox_crawl_bytes_total", labels, bytes_down)
+            self._inc("blackbox_crawl_seconds_total", labels, elapsed)
+            self._gauges[("blackbox_crawl_pages_per_second", labels)] = pages / elapsed if elapsed else 0.0
+            key = ("blackbox_crawl_request_latency_seconds", labels)
+            self._histograms.setdefault(key, Histogram(latency.buckets)).merge(latency)
+            self._emit(event)
+
+    @contextmanager
+    def _shared(self):
+        """Update the totals shared with other processes: load them under the file lock, save them after"""
+        with self._lock, file_lock(self.state_path + ".lock"):
+            self._load_state()
+            yield
+            self._save_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+
+        def key(metric, labels):
+            return metric, tuple(tuple(pair) for pair in labels)
+
+        self._counters = {key(m, l): v for m, l, v in state.get("counters", [])}
+        self._gauges = {key(m, l): v for m, l, v in state.get("gauges", [])}
+        self._histograms = {key(m, l): Histogram.from_dict(h) for m, l, h in state.get("histograms", [])}
+
+    def _save_state(self):
+        state = {
+            "counters": [[m, l, v] for (m, l), v in self._counters.items()],
+            "gauges": [[m, l, v] for (m, l), v in self._gauges.items()],
+            "histograms": [[m, l, h.to_dict()] for (m, l), h in self._histograms.items()],
+        }
+        tmp = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    def _inc(self, metric: str, labels, value=1):
+        key = (metric, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _emit(self, event: dict):
+        event = {"ts": round(time.time(), 3), **event}
+        os.makedirs(os.path.dirname(self.jsonl_path) or ".", exist_ok=True)
+        with open(self.jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+        self._write_prom()
+
+    def _write_prom(self):
+        lines = []
+        by_metric = {}
+        for (metric, labels), value in list(self._counters.items()) + list(self._gauges.items()):
+            by_metric.setdefault(metric, []).append((labels, value))
+        for metric in sorted(by_metric):
+            kind = "counter" if metric.endswith("_total") else "gauge"
+            lines.append(f"# TYPE {metric} {kind}")
+            for labels, value in by_metric[metric]:
+                lines.append(f"{metric}{_fmt_labels(labels)} {value:g}")
+        for (metric, labels), hist in self._histograms.items():
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, n in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                cumulative += n
+                lines.append(f"{metric}_bucket{_fmt_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{metric}_sum{_fmt_labels(labels)} {hist.sum:g}")
+            lines.append(f"{metric}_count{_fmt_labels(labels)} {hist.count}")
+        # Tulis atomik supaya textfile collector tidak membaca file setengah jadi
+        tmp = f"{self.prom_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.prom_path)
+
+
+def _round(value, digits=4):
+    return None if value is None else round(value, digits)
+
+
+def _fmt_labels(labels) -> str:
+    if not labels:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels)
+    return "{" + body + "}"
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """Process-wide shared metrics sink"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Metrics()
+        return _default
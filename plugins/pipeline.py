@@ -0,0 +1,212 @@
+# plugins/pipeline.py
+import os
+import time
+import queue
+import inspect
+import shutil
+import functools
+import threading
+from rich.console import Console
+from .metrics import stage
+from .cluster import URLClusterer
+
+console = Console()
+
+_END = object()  # sentinel: upstream stage finished
+POLL = 0.2       # detik antar cek pembatalan saat menunggu antrean
+
+
+class StageInput:
+    """Iterator over a stage's bounded input queue; ends early once `cancel` is set"""
+
+    def __init__(self, q: queue.Queue, cancel: threading.Event = None):
+        self._q = q
+        self._cancel = cancel or threading.Event()
+        self._done = False
+
+    def _get(self, timeout=None):
+        """Next item, None when `timeout` passed; _END once cancelled"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._cancel.is_set():
+            wait = POLL if deadline is None else min(POLL, deadline - time.monotonic())
+            if wait <= 0:
+                return None
+            try:
+                return self._q.get(timeout=wait)
+            except queue.Empty:
+                pass
+        self._done = True
+        return _END
+
+    def __iter__(self):
+        while not self._done:
+            item = self._get()
+            if self._done:
+                return
+            if item is _END:
+                self._done = True
+                self._q.put(_END)  # let sibling workers see the end too
+                return
+            yield item
+
+    def batches(self, size=200, interval=15.0):
+        """Yield lists of up to `size` items; a partial batch is released after `interval` seconds"""
+        batch, started = [], None
+        while not self._done:
+            timeout = None if started is None else max(0.0, started + interval - time.monotonic())
+            item = self._get(timeout)
+            if self._done:
+                return  # dibatalkan: batch yang belum penuh tidak di-scan lagi
+            if item is _END:
+                self._done = True
+                self._q.put(_END)
+            elif item is not None:
+                batch.append(item)
+                started = started or time.monotonic()
+            if batch and (self._done or len(batch) >= size or time.monotonic() - started >= interval):
+                yield batch
+                batch, started = [], None
+
+
+class Pipeline:
+    """Linear chain of stages connected by bounded queues.
+
+    The first stage is a source `fn(emit)`; every later stage is
+    `fn(inp: StageInput, emit)`. Each stage runs in its own worker thread(s),
+    so stages overlap, and a full queue blocks `emit` (backpressure).
+    Ctrl-C sets `cancel`: inputs end, `emit` stops blocking, and stages that
+    take a cancel event (e.g. SimpleCrawler.run) stop their work.
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self.stages = []  # (name, fn, workers)
+        self.errors = []
+        self.cancel = threading.Event()
+
+    def _put(self, q: queue.Queue, item):
+        """Blocking put that gives up (drops the item) once the pipeline is cancelled"""
+        while not self.cancel.is_set():
+            try:
+                q.put(item, timeout=POLL)
+                return
+            except queue.Full:
+                pass
+
+    def add(self, name: str, fn, workers=1):
+        self.stages.append((name, fn, workers))
+        return self
+
+    def run(self):
+        queues = [queue.Queue(self.maxsize) for _ in self.stages]
+        threads = []
+        for i, (name, fn, workers) in enumerate(self.stages):
+            out_q = queues[i]
+            in_q = queues[i - 1] if i else None
+            remaining = [workers]
+            lock = threading.Lock()
+
+            def worker(name=name, fn=fn, in_q=in_q, out_q=out_q, remaining=remaining, lock=lock):
+                emit = functools.partial(self._put, out_q)
+                try:
+                    with stage(name):
+                        if in_q is None:
+                            fn(emit)
+                        else:
+                            fn(StageInput(in_q, self.cancel), emit)
+                except Exception as e:
+                    self.errors.append((name, e))
+                    console.print(f"[red]Stage {name} gagal: {e}[/red]")
+                    if in_q is not None:
+                        # Keep draining so upstream never blocks on a dead stage
+                        for _ in StageInput(in_q, self.cancel):
+                            pass
+                finally:
+                    with lock:
+                        remaining[0] -= 1
+                        if remaining[0] == 0:
+                            self._put(out_q, _END)
+
+            for _ in range(workers):
+                t = threading.Thread(target=worker, name=f"stage-{name}", daemon=True)
+                t.start()
+                threads.append(t)
+
+        try:
+            for t in threads:
+                t.join()
+        except KeyboardInterrupt:
+            self.cancel.set()
+            console.print("[yellow]Pipeline dihentikan, menunggu stage berhenti...[/yellow]")
+            for t in threads:
+                t.join()
+        return not self.errors and not self.cancel.is_set()
+
+
+def crawl_scan_pipeline(crawler, nuclei, url: str, out_dir="reports", depth=2,
+                        batch_size=200, batch_interval=15.0, scan_workers=1,
+                        severity=None, tags=None, extra="", per_cluster=1):
+    """Crawl and scan concurrently: crawled URLs flow to nuclei in batches while crawling continues.
+
+    Only the first `per_cluster` URLs of every URL shape (host, path template,
+    parameter names) are scanned; `per_cluster=0` scans every crawled URL.
+    Returns (urls_file, merged nuclei report or None).
+    """
+    urls_file = None
+    stem = crawler.clean_url_for_filename(url)
+    batch_dir = os.path.join(out_dir, f"pipeline_{stem}")
+    os.makedirs(batch_dir, exist_ok=True)
+    batch_reports = []
+    counter = iter(range(1, 1_000_000))
+    counter_lock = threading.Lock()
+    clusterer = URLClusterer(per_cluster) if per_cluster else None
+
+    pipeline = Pipeline(maxsize=batch_size * 4)
+
+    def crawl(emit):
+        nonlocal urls_file
+        seen = set()
+
+        def emit_new(found):
+            if found not in seen:
+                seen.add(found)
+                if clusterer is None or clusterer.add(found):
+                    emit(found)
+
+        kwargs = {"cancel": pipeline.cancel} if "cancel" in inspect.signature(crawler.run).parameters else {}
+        urls_file = crawler.run(url, out_dir=out_dir, depth=depth, on_url=emit_new, **kwargs)
+
+    def scan(inp, emit):
+        for batch in inp.batches(batch_size, batch_interval):
+            if pipeline.cancel.is_set():
+                return
+            with counter_lock:
+                n = next(counter)
+            batch_file = os.path.join(batch_dir, f"batch_{n:04d}.txt")
+            with open(batch_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(batch) + "\n")
+            console.print(f"[blue]Pipeline: batch {n} ({len(batch)} URL) ➜ nuclei[/blue]")
+            report = nuclei.run(batch_file, out_dir=batch_dir, use_urls_file=True,
+                                severity=severity, tags=tags, extra=extra, record=False)
+            with counter_lock:
+                batch_reports.append((n, report))
+
+    ok = pipeline.add("crawl", crawl).add("nuclei", scan, workers=scan_workers).run()
+    if clusterer is not None:
+        clusterer.summary()
+
+    if not batch_reports:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        return urls_file, None
+
+    # Gabungkan hasil per batch menjadi satu report
+    merged = os.path.join(out_dir, f"nuclei_{nuclei.clean_target_for_filename(urls_file or url)}.jsonl")
+    with open(merged, "w", encoding="utf-8") as out:
+        for _, report in sorted(batch_reports):
+            if report and os.path.isfile(report):
+                with open(report, encoding="utf-8", errors="replace") as f:
+                    shutil.copyfileobj(f, out)
+    if ok:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        nuclei.record_run(merged)
+    return urls_file, merged
@@ -0,0 +1,258 @@
+# plugins/ratelimit.py
+import os
+import json
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from .cache import CACHE_DIR, file_lock
+
+STATE_PATH = os.path.join(CACHE_DIR, "ratelimit.json")
+BACKOFF_STATUS = {429, 503}
+MIN_BASE_LATENCY = 0.05  # detik; latency dasar di bawah ini dianggap noise (localhost, cache)
+
+# Flag rate limit (request/detik) tiap tool eksternal
+TOOL_RATE_FLAGS = {"katana": "-rl", "nuclei": "-rl", "ffuf": "-rate"}
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date); None if unusable"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+    return max(0.0, when - (now if now is not None else time.time()))
+
+
+class HostLimiter:
+    """Token bucket for one host whose rate adapts AIMD-style to what the host reports back.
+
+    Starts in slow start (+1 req/s per good response, roughly doubling every
+    second) and then grows by `increase` req/s per second of good responses.
+    The rate only grows while the bucket is the bottleneck (callers are
+    waiting for tokens) and never past `growth_cap` x the highest rate
+    actually sent in one second, so a slow client cannot "learn" a rate the
+    host never saw. 429/503, connection errors and a smoothed latency above
+    `latency_factor` x the fastest observed response halve the rate, at most
+    once per cooldown. A Retry-After header holds every request to the host
+    until it expires.
+    """
+
+    def __init__(self, rate=10.0, min_rate=0.5, max_rate=500.0, burst=None, increase=1.0, decrease=0.5,
+                 latency_factor=4.0, growth_cap=2.0):
+        self.rate = max(min_rate, min(rate, max_rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.growth_cap = growth_cap
+        self.slow_start = True
+        self.tokens = 1.0
+        self.min_latency = None
+        self.srtt = None
+        self.stats = {"ok": 0, "backoff": 0, "errors": 0, "slow": 0}
+        self.peak_rate = 0.0  # request terbanyak yang benar-benar dikirim dalam satu detik penuh
+        self._second = None
+        self._second_count = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _capacity(self):
+        return self.burst or max(1.0, self.rate / 10)
+
+    def reserve(self, now=None) -> float:
+        """Take one token; returns how long the caller has to wait before sending"""
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            # Selama Retry-After `_updated` ada di masa depan: tidak ada token baru sampai saat itu
+            self.tokens = min(self._capacity(), self.tokens + max(0.0, now - self._updated) * self.rate)
+            self._updated = max(now, self._updated)
+            self.tokens -= 1.0
+            # Token negatif = antrean; setiap pemanggil menunggu gilirannya sendiri
+            wait = (self._updated - now) + (-self.tokens / self.rate if self.tokens < 0 else 0.0)
+            self._count_send(int(now + wait))
+            return wait
+
+    def _count_send(self, second):
+        """Count one send in the second it is scheduled for (per-second send rate)"""
+        if self._second is None or second > self._second:
+            if self._second is not None:
+                self.peak_rate = max(self.peak_rate, float(self._second_count))
+            self._second, self._second_count = second, 0
+        self._second_count += 1
+
+    def sent_rate(self) -> float:
+        """Highest measured send rate so far, including the second in progress"""
+        return max(self.peak_rate, float(self._second_count))
+
+    def _decrease(self, now):
+        cooldown = max(self.srtt or 0.0, 1.0 / self.rate, 0.2)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.slow_start = False
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.tokens = min(self.tokens, 0.0)
+
+    def observe(self, status=None, latency=None, error=False, retry_after=None, now=None):
+        """Feed back one response (status, seconds) or a failed request (error=True)"""
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            if retry_after is not None:
+                self._updated = max(self._updated, now + min(retry_after, 300.0))
+                self.tokens = min(self.tokens, 0.0)
+            if latency is not None and not error:
+                self.min_latency = latency if self.min_latency is None else min(self.min_latency, latency)
+                self.srtt = latency if self.srtt is None else 0.8 * self.srtt + 0.2 * latency
+            if error or status in BACKOFF_STATUS:
+                self.stats["errors" if error else "backoff"] += 1
+                self._decrease(now)
+            elif latency is not None and self.srtt > self.latency_factor * max(self.min_latency, MIN_BASE_LATENCY):
+                self.stats["slow"] += 1
+                self._decrease(now)
+            else:
+                self.stats["ok"] += 1
+                # Hanya naik bila bucket yang membatasi (token habis) dan tidak jauh di atas laju kirim nyata
+                cap = min(self.max_rate, self.growth_cap * max(self.sent_rate(), 1.0))
+                if self.tokens < 1.0 and self.rate < cap:
+                    step = 1.0 if self.slow_start else self.increase / self.rate
+                    self.rate = min(cap, self.rate + step)
+
+    def to_dict(self):
+        return {"rate": round(self.rate, 2), "sent_rate": self.sent_rate(), "slow_start": self.slow_start,
+                "min_latency": self.min_latency, **self.stats}
+
+    def learned_rate(self):
+        """Rate worth reusing next run: the bucket rate, but no more than was actually sent; None if unmeasured"""
+        if not self.peak_rate:
+            return None  # belum ada satu detik penuh: terlalu sedikit data
+        return max(self.min_rate, min(self.rate, self.peak_rate))
+
+
+class RateLimiter:
+    """Process-wide per-host rate limiting shared by every Python HTTP engine.
+
+    `acquire(host)` (asyncio) or `acquire_sync(host)` (threads) waits for the
+    host's next slot; `observe(...)` feeds the response back. Learned rates
+    are saved to reports/.cache/ratelimit.json and reused as the starting
+    rate (and as -rl/-rate flags for the external tools) in later runs.
+    """
+
+    def __init__(self, start_rate=10.0, min_rate=0.5, max_rate=500.0, path=STATE_PATH):
+        self.start_rate = start_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.path = path
+        self._hosts = {}
+        self._learned = None
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return {h: float(r) for h, r in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _load(self):
+        if self._learned is None:
+            self._learned = self._read()
+        return self._learned
+
+    def host(self, host: str, rate=None) -> HostLimiter:
+        """Limiter for `host`, created at `rate` (or the learned/start rate) on first use"""
+        host = host.lower()
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                learned = self._load().get(host)
+                start = rate if rate else learned or self.start_rate
+                limiter = self._hosts[host] = HostLimiter(start, self.min_rate, self.max_rate)
+                limiter.slow_start = learned is None
+            return limiter
+
+    async def acquire(self, host: str, rate=None):
+        wait = self.host(host, rate).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, host: str, rate=None):
+        wait = self.host(host, rate).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, host: str, status=None, latency=None, error=False, headers=None):
+        """Feed back a response; `headers` (any mapping) is checked for Retry-After"""
+        retry_after = parse_retry_after(headers.get("Retry-After")) if headers else None
+        self.host(host).observe(status, latency, error, retry_after)
+
+    def rate(self, host: str):
+        """Current (or previously learned) safe rate for `host`, None when it was never measured"""
+        host = host.lower()
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is not None:
+                return limiter.rate
+            return self._load().get(host)
+
+    def rate_flag(self, tool: str, host: str, extra="", rate=None, share=1) -> str:
+        """Rate flag for an external tool: `rate`, else the learned rate of `host`, split over `share` processes.
+
+        Empty when the rate is unknown or 0, or `extra` already sets one.
+        """
+        flag = TOOL_RATE_FLAGS.get(tool)
+        rate = self.rate(host) if rate is None else rate
+        if not flag or not rate or any(t in (extra or "").split() for t in (flag, "-rate-limit", "-rate")):
+            return ""
+        return f"{flag} {max(1, int(rate / share))}"
+
+    def save(self):
+        """Persist learned rates (merged with earlier runs) for the next process.
+
+        What is saved per host is the rate actually sustained against it (see
+        HostLimiter.learned_rate), not the bucket's ceiling. The file is
+        re-read under a file lock, so concurrent processes (scheduler jobs)
+        only overwrite the hosts they measured themselves.
+        """
+        with self._lock, file_lock(self.path + ".lock"):
+            learned = self._read()
+            for h, l in self._hosts.items():
+                rate = l.learned_rate() if sum(l.stats.values()) else None
+                if rate is not None:
+                    learned[h] = round(rate, 2)
+            self._learned = learned
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(learned, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+    def summary(self):
+        with self._lock:
+            return {h: l.to_dict() for h, l in self._hosts.items()}
+
+
+def host_of(url: str) -> str:
+    """host[:port] of a URL (or the string itself when it has no scheme)"""
+    rest = url.partition("://")[2] or url
+    return rest.split("/", 1)[0].split("?", 1)[0].lower()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide shared rate limiter"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RateLimiter()
+        return _default
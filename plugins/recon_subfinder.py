@@ -18,7 +18,7 @@ class Subfinder(Plugin):
         domain = re.sub(r'[<>:"/\\|?*]', '_', domain)
         return domain
 
-    def run(self, domain: str, out_dir="reports", extra=""):
+    def run(self, domain: str, out_dir="reports", extra="", force=False):
         self.ensure_reports_dir(out_dir)
         
         # Clean domain for filename
@@ -28,5 +28,7 @@ class Subfinder(Plugin):
         # Use original domain for the actual command
         original_domain = re.sub(r'^https?://', '', domain.rstrip('/'))
         cmd = f"subfinder -d {original_domain} -silent -o {out} {extra}"
-        self.run_cmd(cmd)
+        job = self.run_cmd_cached(cmd, out, original_domain, force=force)
+        if job is None or job.ok:
+            self.record_run(out)
         return out
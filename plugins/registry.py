@@ -0,0 +1,104 @@
+# plugins/registry.py
+import os
+import ast
+import shutil
+import importlib
+
+PLUGINS_DIR = os.path.dirname(os.path.abspath(__file__))
+CATEGORY_ORDER = ["Recon", "Crawler", "Fuzzer", "Scanner"]
+_META = ("name", "category", "description", "bin_name")
+
+
+class PluginSpec:
+    """Plugin metadata read from source; the module is imported only on first use"""
+
+    def __init__(self, module: str, class_name: str, meta: dict, custom_available: bool):
+        self.module = module
+        self.class_name = class_name
+        self.name = meta.get("name", class_name)
+        self.category = meta.get("category", "General")
+        self.description = meta.get("description", "")
+        self.bin_name = meta.get("bin_name")
+        self.custom_available = custom_available  # class overrides is_available()
+        self._instance = None
+        self._available = None
+
+    def load(self):
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+    def instance(self):
+        """Shared plugin instance, created once per session"""
+        if self._instance is None:
+            self._instance = self.load()()
+        return self._instance
+
+    def is_available(self) -> bool:
+        """Binary lookup (or the plugin's own check), cached per session"""
+        if self._available is None:
+            if self.custom_available:
+                self._available = self.instance().is_available()
+            else:
+                self._available = which(self.bin_name) is not None if self.bin_name else False
+        return self._available
+
+
+_which_cache = {}
+
+
+def which(bin_name: str):
+    """shutil.which memoized per session"""
+    if bin_name not in _which_cache:
+        _which_cache[bin_name] = shutil.which(bin_name)
+    return _which_cache[bin_name]
+
+
+def _scan_module(path: str, module: str):
+    """Yield PluginSpec for every `class X(Plugin)` in a module, without importing it"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if not any(isinstance(b, ast.Name) and b.id == "Plugin" for b in node.bases):
+            continue
+        meta, custom_available = {}, False
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                key = stmt.targets[0].id
+                if key in _META and isinstance(stmt.value, ast.Constant):
+                    meta[key] = stmt.value.value
+            elif isinstance(stmt, ast.FunctionDef) and stmt.name == "is_available":
+                custom_available = True
+        yield PluginSpec(module, node.name, meta, custom_available)
+
+
+class PluginRegistry:
+    """Discovers plugins in `plugins/` by reading their source, imports them lazily"""
+
+    def __init__(self, plugins_dir=PLUGINS_DIR, package="plugins"):
+        self.plugins_dir = plugins_dir
+        self.package = package
+        self._specs = None
+
+    def specs(self):
+        if self._specs is None:
+            found = []
+            for fname in sorted(os.listdir(self.plugins_dir)):
+                if not fname.endswith(".py") or fname.startswith("_") or fname == "base.py":
+                    continue
+                module = f"{self.package}.{fname[:-3]}"
+                found.extend(_scan_module(os.path.join(self.plugins_dir, fname), module))
+            rank = {c: i for i, c in enumerate(CATEGORY_ORDER)}
+            found.sort(key=lambda s: rank.get(s.category, len(rank)))
+            self._specs = found
+        return self._specs
+
+    def spec(self, class_name: str) -> PluginSpec:
+        for s in self.specs():
+            if s.class_name == class_name:
+                return s
+        raise KeyError(f"Plugin {class_name} tidak ditemukan di {self.plugins_dir}")
+
+    def get(self, class_name: str):
+        """Shared instance of a plugin class, importing its module on first use"""
+        return self.spec(class_name).instance()
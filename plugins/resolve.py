@@ -0,0 +1,355 @@
+# plugins/resolve.py
+import os
+import json
+import time
+import random
+import socket
+import string
+import struct
+import asyncio
+import threading
+from rich.console import Console
+
+console = Console()
+
+QTYPES = {"A": 1, "CNAME": 5, "AAAA": 28}
+NOERROR = 0
+NEGATIVE_TTL = 60  # detik untuk NXDOMAIN / jawaban kosong
+
+
+def system_nameserver(default="1.1.1.1") -> str:
+    """First nameserver in /etc/resolv.conf, else `default`"""
+    try:
+        with open("/etc/resolv.conf", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    return parts[1]
+    except OSError:
+        pass
+    return default
+
+
+def encode_name(name: str) -> bytes:
+    """Wire-format QNAME; labels are IDNA-encoded first so the length prefix counts bytes.
+
+    Raises ValueError for names that cannot be sent (bad IDN, empty or >63-byte
+    label, >255 bytes in total).
+    """
+    qname = b""
+    for label in name.rstrip(".").split("."):
+        try:
+            encoded = label.encode("idna")
+        except UnicodeError as e:
+            raise ValueError(f"label tidak valid {label!r}: {e}") from None
+        if not 0 < len(encoded) <= 63:
+            raise ValueError(f"panjang label tidak valid: {label!r}")
+        qname += bytes([len(encoded)]) + encoded
+    if len(qname) + 1 > 255:
+        raise ValueError(f"nama terlalu panjang: {name!r}")
+    return qname + b"\0"
+
+
+def build_query(qid: int, name: str, qtype: str = "A") -> bytes:
+    header = struct.pack(">HHHHHH", qid, 0x0100, 1, 0, 0, 0)  # RD=1, satu pertanyaan
+    return header + encode_name(name) + struct.pack(">HH", QTYPES[qtype], 1)
+
+
+def _read_name(data: bytes, offset: int):
+    """Decode a (possibly compressed) domain name; returns (name, offset after it)"""
+    labels, end, jumps = [], None, 0
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = struct.unpack(">H", data[offset:offset + 2])[0] & 0x3FFF
+            jumps += 1
+            if jumps > 32:
+                raise ValueError("compression loop")
+            continue
+        if length == 0:
+            return ".".join(labels), end if end is not None else offset + 1
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", "replace"))
+        offset += 1 + length
+
+
+def parse_response(data: bytes):
+    """(qid, rcode, answers) where answers is a list of (type name, value, ttl)"""
+    qid, flags, qdcount, ancount = struct.unpack(">HHHH", data[:8])
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = _read_name(data, offset)
+        offset += 4
+    answers = []
+    for _ in range(ancount):
+        _, offset = _read_name(data, offset)
+        rtype, _, ttl, rdlength = struct.unpack(">HHIH", data[offset:offset + 10])
+        offset += 10
+        rdata = data[offset:offset + rdlength]
+        if rtype == 1 and rdlength == 4:
+            answers.append(("A", socket.inet_ntoa(rdata), ttl))
+        elif rtype == 28 and rdlength == 16:
+            answers.append(("AAAA", socket.inet_ntop(socket.AF_INET6, rdata), ttl))
+        elif rtype == 5:
+            answers.append(("CNAME", _read_name(data, offset)[0].lower(), ttl))
+        offset += rdlength
+    return qid, flags & 0x000F, answers
+
+
+class TTLCache:
+    """Thread-safe (nameserver, port, name, qtype) -> addresses cache honouring record TTLs"""
+
+    def __init__(self, max_ttl=3600):
+        self.max_ttl = max_ttl
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def put(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + min(ttl, self.max_ttl), value)
+
+
+_shared_cache = TTLCache()
+
+
+class _DNSProtocol(asyncio.DatagramProtocol):
+    def __init__(self, pending: dict):
+        self.pending = pending
+
+    def datagram_received(self, data, addr):
+        try:
+            qid, rcode, answers = parse_response(data)
+        except (ValueError, struct.error, IndexError):
+            return
+        future = self.pending.pop(qid, None)
+        if future is not None and not future.done():
+            future.set_result((rcode, answers))
+
+    def error_received(self, exc):
+        pass  # timeout di resolve() akan mengulang query
+
+
+class AsyncResolver:
+    """Minimal asyncio stub resolver speaking DNS over UDP to one nameserver.
+
+    `nameserver` may carry a port (`127.0.0.1:5353`, `[::1]:5353`). Queries
+    share a single socket and are matched by id; at most `concurrency` are in
+    flight. Answers (including NXDOMAIN) are kept in a TTL cache shared by
+    every resolver in the process.
+    """
+
+    def __init__(self, nameserver=None, port=53, timeout=2.0, retries=2, concurrency=200, cache=None):
+        nameserver = nameserver or system_nameserver()
+        if nameserver.startswith("["):
+            host, _, rest = nameserver[1:].partition("]")
+            nameserver, port = host, int(rest.lstrip(":") or port)
+        elif nameserver.count(":") == 1:
+            host, _, p = nameserver.partition(":")
+            nameserver, port = host, int(p)
+        self.nameserver = nameserver
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.cache = cache if cache is not None else _shared_cache
+        self._sem = asyncio.Semaphore(concurrency)
+        self._pending = {}
+        self._transport = None
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET6 if ":" in self.nameserver else socket.AF_INET, socket.SOCK_DGRAM)
+        # Buffer besar supaya ratusan jawaban yang datang bersamaan tidak di-drop kernel
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sock.setblocking(False)
+        sock.connect((self.nameserver, self.port))
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: _DNSProtocol(self._pending), sock=sock)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._transport.close()
+
+    async def _query(self, name: str, qtype: str):
+        """(rcode, answers), or None when every attempt timed out"""
+        loop = asyncio.get_running_loop()
+        async with self._sem:
+            for _ in range(self.retries + 1):
+                qid = random.randrange(1 << 16)
+                while qid in self._pending:
+                    qid = random.randrange(1 << 16)
+                packet = build_query(qid, name, qtype)  # ValueError sebelum future didaftarkan
+                future = self._pending[qid] = loop.create_future()
+                try:
+                    self._transport.sendto(packet)
+                    return await asyncio.wait_for(future, self.timeout)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._pending.pop(qid, None)
+        return None
+
+    async def resolve(self, name: str, qtype: str = "A", _depth=0):
+        """Addresses for `name` (CNAME chains followed); [] if it does not resolve, None on timeout.
+
+        Raises ValueError when `name` is not a valid DNS name.
+        """
+        name = name.strip().rstrip(".").lower()
+        key = (self.nameserver, self.port, name, qtype)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return list(cached)
+        reply = await self._query(name, qtype)
+        if reply is None:
+            return None
+        rcode, answers = reply
+        addresses = sorted({value for rtype, value, _ in answers if rtype == qtype})
+        ttl = min((t for rtype, _, t in answers), default=NEGATIVE_TTL)
+        if not addresses and rcode == NOERROR and _depth < 8:
+            # Server hanya memberi CNAME; ikuti sendiri
+            target = next((value for rtype, value, _ in answers if rtype == "CNAME"), None)
+            if target:
+                addresses = await self.resolve(target, qtype, _depth + 1) or []
+        self.cache.put(key, tuple(addresses), ttl if addresses else NEGATIVE_TTL)
+        return addresses
+
+
+class Resolution:
+    """Outcome of resolving a host list"""
+
+    def __init__(self):
+        self.live = {}       # name -> [ip, ...]
+        self.dead = []       # NXDOMAIN / tanpa alamat
+        self.failed = []     # timeout: tidak pasti mati, tetap jadi target
+        self.invalid = []    # nama yang tidak bisa dikirim sebagai query DNS
+        self.wildcard = []   # (name, zone) dibuang karena wildcard DNS
+        self.wildcard_zones = {}  # zone -> [ip, ...]
+
+    def groups(self):
+        """IP set -> names sharing it, so every address is scanned once"""
+        grouped = {}
+        for name, ips in self.live.items():
+            grouped.setdefault(tuple(ips), []).append(name)
+        return grouped
+
+    def targets(self):
+        """One representative name (shortest, then alphabetical) per IP group, plus every name that timed out.
+
+        Only NXDOMAIN and wildcard matches are known not to be hosts; a slow
+        resolver must not shrink the scan scope.
+        """
+        representatives = {min(names, key=lambda n: (len(n), n)) for names in self.groups().values()}
+        return sorted(representatives | set(self.failed))
+
+    def to_dict(self):
+        return {
+            "targets": self.targets(),
+            "groups": [{"ips": list(ips), "names": sorted(names)} for ips, names in self.groups().items()],
+            "dead": sorted(self.dead),
+            "failed": sorted(self.failed),
+            "invalid": sorted(self.invalid),
+            "wildcard": [{"name": n, "zone": z} for n, z in sorted(self.wildcard)],
+            "wildcard_zones": self.wildcard_zones,
+        }
+
+
+def _parent_zones(name: str, root: str = None):
+    """Parent zones of `name` up to (and including) `root`, nearest first"""
+    labels = name.split(".")
+    for i in range(1, len(labels) - 1):
+        zone = ".".join(labels[i:])
+        yield zone
+        if root and zone == root:
+            return
+
+
+async def resolve_hosts(names, nameserver=None, port=53, concurrency=200, timeout=2.0, retries=2,
+                        qtype="A", wildcard_probes=2, root=None) -> Resolution:
+    """Resolve names concurrently, dropping entries that only match a wildcard record.
+
+    A zone is wildcard when `wildcard_probes` random labels under it all
+    resolve; a name whose addresses all belong to its zone's wildcard set is
+    treated as a wildcard hit, not a real host.
+    """
+    names = list(dict.fromkeys(n.strip().rstrip(".").lower() for n in names if n.strip()))
+    result = Resolution()
+    zone_tasks = {}
+
+    async with AsyncResolver(nameserver, port, timeout, retries, concurrency) as resolver:
+        async def wildcard_ips(zone):
+            probes = ["".join(random.choices(string.ascii_lowercase + string.digits, k=16)) + "." + zone
+                      for _ in range(wildcard_probes)]
+            answers = await asyncio.gather(*(resolver.resolve(p, qtype) for p in probes), return_exceptions=True)
+            if all(a and not isinstance(a, BaseException) for a in answers):
+                return set().union(*answers)
+            return None
+
+        def zone_check(zone):
+            if zone not in zone_tasks:
+                zone_tasks[zone] = asyncio.ensure_future(wildcard_ips(zone))
+            return zone_tasks[zone]
+
+        async def one(name):
+            try:
+                ips = await resolver.resolve(name, qtype)
+            except ValueError:
+                # Satu nama rusak dari subfinder tidak boleh menggagalkan seluruh daftar
+                result.invalid.append(name)
+                return
+            if ips is None:
+                result.failed.append(name)
+                return
+            if not ips:
+                result.dead.append(name)
+                return
+            for zone in _parent_zones(name, root):
+                wild = await zone_check(zone)
+                if wild and set(ips) <= wild:
+                    result.wildcard.append((name, zone))
+                    result.wildcard_zones[zone] = sorted(wild)
+                    return
+            result.live[name] = ips
+
+        await asyncio.gather(*(one(n) for n in names))
+    return result
+
+
+def resolve_file(path: str, out_dir="reports", nameserver=None, port=53, concurrency=200, timeout=2.0,
+                 retries=2, root=None):
+    """Resolve a host list file (e.g. subfinder output) into live, unique targets.
+
+    Writes `dns_<stem>.txt` (one target per distinct IP set) and
+    `dns_<stem>.json` (groups, dead, wildcard entries); returns the .txt path.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        names = [line.strip() for line in f if line.strip()]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    stem = stem[len("subfinder_"):] if stem.startswith("subfinder_") else stem
+    out = os.path.join(out_dir, f"dns_{stem}.txt")
+
+    started = time.monotonic()
+    result = asyncio.run(resolve_hosts(names, nameserver, port, concurrency, timeout, retries, root=root))
+    elapsed = time.monotonic() - started
+
+    os.makedirs(out_dir, exist_ok=True)
+    targets = result.targets()
+    with open(out, "w", encoding="utf-8") as f:
+        f.writelines(t + "\n" for t in targets)
+    with open(os.path.splitext(out)[0] + ".json", "w", encoding="utf-8") as f:
+        json.dump(result.to_dict(), f, indent=2)
+    console.print(f"[green]DNS: {len(names)} nama ➜ {len(result.live)} hidup, {len(targets)} target unik "
+                  f"({len(result.dead)} mati, {len(result.wildcard)} wildcard, "
+                  f"{len(result.failed)} timeout tetap di-scan, {len(result.invalid)} tidak valid) "
+                  f"dalam {elapsed:.1f}s[/green]")
+    for zone, ips in result.wildcard_zones.items():
+        console.print(f"[yellow]Wildcard DNS: *.{zone} ➜ {', '.join(ips)}[/yellow]")
+    return out
@@ -0,0 +1,268 @@
+# plugins/runs.py
+import os
+import re
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from .cache import file_digest, file_lock
+from .writer import external_sort
+
+RUNS_DIR = os.path.join("reports", "runs")
+DEFAULT_KEEP = 20  # run per report yang disimpan
+
+NMAP_HOST = re.compile(r'^Nmap scan report for (\S+)')
+NMAP_PORT = re.compile(r'^(\d+)/(tcp|udp)\s+open\s')
+
+
+def _field(value) -> str:
+    # Tanpa whitespace di dalam field: baris key tetap satu token per kolom dan
+    # tidak ada karakter < "\n" yang mengacaukan urutan external_sort
+    return "_".join(str(value or "").split()) or "-"
+
+
+def report_keys(path: str, kind: str):
+    """Yield one comparable key line per item of a report.
+
+    subdomains/urls: the line itself; nmap: `host:port/proto` of open ports;
+    nuclei: `severity template url`; ffuf: `status url`.
+    """
+    from .findings import host_of
+    if kind in ("subdomains", "urls"):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield _field(line.lower() if kind == "subdomains" else line)
+    elif kind == "nmap":
+        yield from _nmap_keys(path)
+    elif kind == "nuclei":
+        from .scan_nuclei import Nuclei
+        for f in Nuclei.iter_findings(path):
+            yield f"{_field(f['severity'])} {_field(f['template'])} {_field(f['url'] or host_of(f['host']))}"
+    elif kind == "ffuf":
+        from .fuzz_ffuf import FFUF
+        for r in FFUF.iter_results(path):
+            yield f"{_field(r.get('status'))} {_field(r.get('url'))}"
+    else:
+        raise ValueError(f"Jenis report tidak dikenal: {kind}")
+
+
+def _nmap_keys(path: str):
+    if path.endswith(".xml") or _is_xml(path):
+        from .scan_nmap import Nmap
+        for host in Nmap.iter_hosts(path):
+            name = (host["hostnames"][0] if host["hostnames"] else host["address"] or "").lower()
+            for p in host["ports"]:
+                if p["state"] == "open":
+                    yield f"{_field(name)}:{p['port']}/{p['proto']}"
+        return
+    name = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            m = NMAP_HOST.match(line)
+            if m:
+                name = m.group(1).lower()
+                continue
+            m = NMAP_PORT.match(line)
+            if m and name:
+                yield f"{_field(name)}:{m.group(1)}/{m.group(2)}"
+
+
+def _is_xml(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(64).lstrip().startswith(b"<")
+
+
+def key_target(kind: str, key: str) -> str:
+    """Follow-up scan target of a key line: the host of a port, the URL of a finding"""
+    if kind == "nmap":
+        return key.rpartition(":")[0]
+    if kind in ("nuclei", "ffuf"):
+        return key.rsplit(" ", 1)[-1]
+    return key
+
+
+def diff_sorted(old_path, new_path: str, added_out: str, removed_out: str):
+    """Merge two sorted, unique key files; writes added/removed lines and returns their counts.
+
+    Streams both files once, so memory stays flat regardless of their size.
+    `old_path=None` treats every line of `new_path` as added.
+    """
+    added = removed = 0
+    with open(new_path, encoding="utf-8") as new, \
+            (open(old_path, encoding="utf-8") if old_path else open(os.devnull)) as old, \
+            open(added_out, "w", encoding="utf-8") as add, open(removed_out, "w", encoding="utf-8") as rem:
+        a, b = old.readline(), new.readline()
+        while a or b:
+            if b and (not a or b < a):
+                add.write(b)
+                added += 1
+                b = new.readline()
+            elif a and (not b or a < b):
+                rem.write(a)
+                removed += 1
+                a = old.readline()
+            else:
+                a, b = old.readline(), new.readline()
+    return added, removed
+
+
+class RunStore:
+    """Versioned copies of reports, one folder per report name, and diffs between runs.
+
+    Reports such as `subfinder_<domain>.txt` are overwritten by every run;
+    `record(path)` keeps a copy under reports/runs/<report>/<run>.report
+    (hard-linked when nothing changed); run ids are assigned under a file
+    lock, so concurrent processes never get the same id. For diffs each run is reduced once to
+    a sorted, unique `<run>.keys` file (external sort) and two runs are
+    compared with a streaming merge, so multi-million-line reports diff in
+    bounded memory.
+    """
+
+    def __init__(self, root=RUNS_DIR, keep=DEFAULT_KEEP):
+        self.root = root
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def _dir(self, path: str) -> str:
+        return os.path.join(self.root, os.path.basename(path))
+
+    def _file(self, path: str, run: str, suffix: str) -> str:
+        return os.path.join(self._dir(path), f"{run}.{suffix}")
+
+    def runs(self, path: str):
+        """Run ids of a report, oldest first"""
+        folder = self._dir(path)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(name[:-len(".report")] for name in os.listdir(folder) if name.endswith(".report"))
+
+    def record(self, path: str):
+        """Store the current content of a report as a new run; returns the run id (None without report)"""
+        from .findings import report_kind
+        if report_kind(path) is None or not os.path.isfile(path):
+            return None
+        folder = self._dir(path)
+        with self._lock, file_lock(os.path.join(folder, "record.lock")):
+            runs = self.runs(path)
+            run = datetime.now().strftime("%Y%m%d-%H%M%S")
+            if runs and run <= runs[-1]:
+                # Beberapa run dalam detik yang sama: id harus tetap naik
+                last = runs[-1]  # YYYYmmdd-HHMMSS[-NN]
+                run = f"{last[:15]}-{int(last[16:] or 0) + 1:02d}"
+            dst = self._file(path, run, "report")
+            last = self._file(path, runs[-1], "report") if runs else None
+            if last and file_digest(last) == file_digest(path):
+                # Isi sama dengan run sebelumnya: cukup link, key-nya juga bisa dipakai ulang
+                self._link(last, dst)
+                if os.path.isfile(self._file(path, runs[-1], "keys")):
+                    self._link(self._file(path, runs[-1], "keys"), self._file(path, run, "keys"))
+            else:
+                tmp = f"{dst}.{os.getpid()}.tmp"
+                shutil.copyfile(path, tmp)
+                os.replace(tmp, dst)
+            self._prune(path, runs + [run])
+        return run
+
+    @staticmethod
+    def _link(src: str, dst: str):
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+    def _prune(self, path: str, runs):
+        folder = self._dir(path)
+        for run in runs[:-self.keep] if self.keep else []:
+            for name in os.listdir(folder):
+                if name.startswith(run + ".") or name.startswith(run + "_") or f"_{run}." in name:
+                    os.remove(os.path.join(folder, name))
+
+    def keys(self, path: str, run: str) -> str:
+        """Sorted unique key file of one run (built on first use)"""
+        from .findings import report_kind
+        out = self._file(path, run, "keys")
+        if not os.path.isfile(out):
+            kind = report_kind(path)
+            tmp = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self._dir(path),
+                                              suffix=".keys.tmp", delete=False)
+            try:
+                with tmp:
+                    for key in report_keys(self._file(path, run, "report"), kind):
+                        tmp.write(key + "\n")
+                external_sort(tmp.name, out_path=tmp.name)
+                os.replace(tmp.name, out)
+            finally:
+                if os.path.exists(tmp.name):
+                    os.remove(tmp.name)
+        return out
+
+    def diff(self, path: str, old=None, new=None):
+        """Compare run `old` with run `new` of a report (default: the last run with the one before it).
+
+        Returns a dict with kind, old, new, added/removed counts and the paths
+        of the added/removed key files, or None when the report has no runs.
+        Without an earlier run every item counts as added. Raises ValueError
+        when `old` or `new` is not a run of the report.
+        """
+        from .findings import report_kind
+        runs = self.runs(path)
+        if not runs:
+            return None
+        unknown = [r for r in (old, new) if r is not None and r not in runs]
+        if unknown:
+            # Id dipakai sebagai nama file: hanya run yang benar-benar ada
+            raise ValueError(f"Run tidak ditemukan untuk {os.path.basename(path)}: {', '.join(unknown)}")
+        new = new or runs[-1]
+        if old is None:
+            earlier = [r for r in runs if r < new]
+            old = earlier[-1] if earlier else None
+        name = f"{old or 'none'}_{new}"
+        added_path = self._file(path, name, "added")
+        removed_path = self._file(path, name, "removed")
+        new_keys = self.keys(path, new)
+        old_keys = self.keys(path, old) if old else None
+        if old_keys and os.path.samefile(old_keys, new_keys):
+            open(added_path, "w").close()
+            open(removed_path, "w").close()
+            added = removed = 0
+        else:
+            added, removed = diff_sorted(old_keys, new_keys, added_path, removed_path)
+        return {"kind": report_kind(path), "old": old, "new": new, "added": added, "removed": removed,
+                "added_path": added_path, "removed_path": removed_path}
+
+    def changed_targets(self, path: str, diff=None):
+        """File of follow-up targets for what is new in the last run ("changed only" mode).
+
+        Subdomains and URLs are listed as-is, hosts with newly open ports once
+        each, and findings by URL. Returns (path, count) or None without runs.
+        """
+        diff = diff or self.diff(path)
+        if diff is None:
+            return None
+        out = diff["added_path"][:-len(".added")] + ".targets"
+        kind = diff["kind"]
+        if kind in ("subdomains", "urls"):
+            shutil.copyfile(diff["added_path"], out)
+            return out, diff["added"]
+        with open(diff["added_path"], encoding="utf-8") as f, open(out, "w", encoding="utf-8") as dst:
+            for line in f:
+                dst.write(key_target(kind, line.rstrip("\n")) + "\n")
+        external_sort(out)
+        with open(out, encoding="utf-8") as f:
+            count = sum(1 for _ in f)
+        return out, count
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_run_store() -> RunStore:
+    """Process-wide shared run store"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RunStore()
+        return _default
@@ -1,13 +1,148 @@
 # plugins/scan_nmap.py
 import re
 import os
-from .base import Plugin
+import math
+import shutil
+import ipaddress
+import threading
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+from concurrent.futures import ThreadPoolExecutor
+from .base import Plugin, console
+
+CIDR = re.compile(r'^(\d{1,3}(\.\d{1,3}){3}|[0-9a-fA-F]*:[0-9a-fA-F:.]*)/\d{1,3}$')
+
+
+def split_targets(targets, hosts_per_shard=16):
+    """Group targets into shards of about `hosts_per_shard` addresses.
+
+    CIDR ranges larger than a shard are split into equal subnets; hostnames,
+    single IPs and nmap ranges (`10.0.0.1-20`) are packed together.
+    """
+    shards, current, size = [], [], 0
+    for target in targets:
+        try:
+            net = ipaddress.ip_network(target, strict=False) if CIDR.match(target) else None
+        except ValueError:
+            net = None
+        if net is not None and net.num_addresses > hosts_per_shard:
+            # Subnet terkecil yang masih memuat hosts_per_shard alamat
+            new_prefix = max(net.prefixlen, net.max_prefixlen - int(math.log2(max(hosts_per_shard, 1))))
+            shards.extend([str(sub)] for sub in net.subnets(new_prefix=new_prefix))
+            continue
+        weight = net.num_addresses if net is not None else 1
+        if current and size + weight > hosts_per_shard:
+            shards.append(current)
+            current, size = [], 0
+        current.append(target)
+        size += weight
+    if current:
+        shards.append(current)
+    return shards
+
+
+def split_ports(ports: str, shards: int):
+    """Split a numeric port spec (`1-1000,8080`) into up to `shards` contiguous specs.
+
+    Specs nmap interprets itself (`T:`/`U:` prefixes, service names, `-`) are returned whole.
+    """
+    if not ports or shards <= 1 or not re.fullmatch(r'[\d,\-\s]+', ports):
+        return [ports]
+    numbers = set()
+    for part in ports.replace(" ", "").split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        if not lo or (_ and not hi):
+            return [ports]
+        numbers.update(range(int(lo), int(hi or lo) + 1))
+    numbers = sorted(numbers)
+    step = math.ceil(len(numbers) / shards)
+    return [_compress_ports(numbers[i:i + step]) for i in range(0, len(numbers), step)]
+
+
+def _compress_ports(numbers):
+    ranges, start = [], numbers[0]
+    for prev, cur in zip(numbers, numbers[1:] + [None]):
+        if cur != prev + 1:
+            ranges.append(str(start) if start == prev else f"{start}-{prev}")
+            start = cur
+    return ",".join(ranges)
+
+
+def _host_key(host):
+    address = next((a.get("addr") for a in host.findall("address") if a.get("addrtype") in ("ipv4", "ipv6")), None)
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        hostname = host.find("hostnames/hostname")
+        return (1, address or (hostname.get("name") if hostname is not None else ""))
+    # IPv4 dan IPv6 tidak bisa dibandingkan langsung: urut per versi dulu
+    return (0, ip.version, ip)
+
+
+def merge_xml(paths, out: str, args: str = ""):
+    """Merge per-shard nmap XML reports into one.
+
+    Hosts seen in several shards (port sharding) get their ports combined;
+    hosts are written in address order with a recomputed runstats block.
+    """
+    hosts, scaninfo, header = {}, [], None
+    for path in paths:
+        context = ET.iterparse(path, events=("start", "end"))
+        _, root = next(context)
+        if header is None:
+            header = dict(root.attrib)
+        for event, elem in context:
+            if event != "end":
+                continue
+            if elem.tag == "scaninfo":
+                key = (elem.get("type"), elem.get("protocol"), elem.get("services"))
+                if key not in [(s.get("type"), s.get("protocol"), s.get("services")) for s in scaninfo]:
+                    scaninfo.append(elem)
+            elif elem.tag == "host":
+                key = _host_key(elem)
+                known = hosts.get(key)
+                if known is None:
+                    hosts[key] = elem
+                else:
+                    known_ports = known.find("ports")
+                    if known_ports is None:
+                        known_ports = ET.SubElement(known, "ports")
+                    for port in elem.iterfind("ports/port"):
+                        known_ports.append(port)
+                    status = elem.find("status")
+                    if status is not None and status.get("state") == "up":
+                        known_status = known.find("status")
+                        if known_status is None:
+                            known_status = ET.SubElement(known, "status")
+                        known_status.set("state", "up")
+                root.clear()
+
+    header = header or {"scanner": "nmap"}
+    if args:
+        header["args"] = args
+    up = sum(1 for h in hosts.values() if h.find("status") is not None and h.find("status").get("state") == "up")
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write("<nmaprun" + "".join(f" {k}={quoteattr(v)}" for k, v in header.items()) + ">\n")
+        for elem in scaninfo:
+            f.write(ET.tostring(elem, encoding="unicode").strip() + "\n")
+        for key in sorted(hosts):
+            f.write(ET.tostring(hosts[key], encoding="unicode").strip() + "\n")
+        f.write(f'<runstats><hosts up="{up}" down="{len(hosts) - up}" total="{len(hosts)}"/></runstats>\n')
+        f.write("</nmaprun>\n")
+    os.replace(tmp, out)
+    return out
+
 
 class Nmap(Plugin):
     name = "Nmap (Network Scanner)"
     category = "Scanner"
     description = "Network discovery and security auditing"
     bin_name = "nmap"
+    version_flag = "--version"
 
     def clean_target_for_filename(self, target: str) -> str:
         """Clean target for safe filename"""
@@ -20,45 +155,153 @@ class Nmap(Plugin):
         """Clean target for Nmap command - remove protocol and paths"""
         # Remove protocol (http://, https://, etc.)
         target = re.sub(r'^https?://', '', target)
+        # Network range (192.168.1.0/24) tetap utuh
+        if CIDR.match(target):
+            return target
         # Remove trailing paths/slashes
         target = target.split('/')[0]
-        # Remove port if specified (nmap will handle ports separately)
-        target = target.split(':')[0]
+        # Remove port if specified (nmap will handle ports separately): host:port atau [v6]:port;
+        # IPv6 polos (lebih dari satu ':') tetap utuh
+        if target.startswith('['):
+            return target[1:].split(']', 1)[0]
+        if target.count(':') == 1:
+            target = target.split(':')[0]
         return target
 
-    def run(self, target: str, out_dir="reports", scan_type="basic", ports=None, extra=""):
+    @staticmethod
+    def scan_flags(scan_type: str, ports=None) -> str:
+        """nmap flags for a scan type (ports are only used by `custom`)"""
+        if scan_type == "basic":
+            return "-sS -O -sV"
+        elif scan_type == "fast":
+            return "-F"
+        elif scan_type == "comprehensive":
+            return "-sS -sU -O -sV -sC --script vuln"
+        elif scan_type == "stealth":
+            return "-sS -f -T2"
+        elif scan_type == "custom" and ports:
+            return f"-p {ports}"
+        return ""
+
+    def expand_targets(self, target: str):
+        """Targets from a whitespace/comma separated string or a file with one target per line"""
+        if os.path.isfile(target):
+            with open(target, encoding="utf-8", errors="replace") as f:
+                tokens = [t for line in f for t in re.split(r'[\s,]+', line.split('#', 1)[0]) if t]
+        else:
+            tokens = [t for t in re.split(r'[\s,]+', target) if t]
+        return list(dict.fromkeys(self.clean_target_for_nmap(t) for t in tokens))
+
+    def run(self, target: str, out_dir="reports", scan_type="basic", ports=None, extra="", force=False):
         self.ensure_reports_dir(out_dir)
         
         # Clean target for filename (keep original for filename)
         stem = self.clean_target_for_filename(target)
-        out = f"{out_dir}/nmap_{stem}.txt"
+        out = f"{out_dir}/nmap_{stem}.xml"
         
         # Clean target for nmap command (remove protocol, paths)
         clean_target = self.clean_target_for_nmap(target)
         
-        # Build scan command based on type
-        if scan_type == "basic":
-            cmd = f"nmap -sS -O -sV {clean_target} -oN {out}"
-        elif scan_type == "fast":
-            cmd = f"nmap -F {clean_target} -oN {out}"
-        elif scan_type == "comprehensive":
-            cmd = f"nmap -sS -sU -O -sV -sC --script vuln {clean_target} -oN {out}"
-        elif scan_type == "stealth":
-            cmd = f"nmap -sS -f -T2 {clean_target} -oN {out}"
-        elif scan_type == "custom":
-            if ports:
-                cmd = f"nmap -p {ports} {clean_target} -oN {out}"
-            else:
-                cmd = f"nmap {clean_target} -oN {out}"
-        else:
-            cmd = f"nmap {clean_target} -oN {out}"
-        
-        # Add extra flags if provided
-        if extra:
-            cmd += f" {extra}"
-        
+        cmd = f"nmap {self.scan_flags(scan_type, ports)} {clean_target} -oX {out} {extra}"
         # Clean up extra spaces
         cmd = " ".join(cmd.split())
         
-        self.run_cmd(cmd)
+        job = self.run_cmd_cached(cmd, out, clean_target, force=force)
+        if job is None or job.ok:
+            self.record_run(out)
+        return out
+
+    def run_sharded(self, target: str, out_dir="reports", scan_type="basic", ports=None, extra="",
+                    hosts_per_shard=16, port_shards=1, parallel=None, retries=2, force=False):
+        """Split targets (and optionally the port list) into shards scanned by concurrent nmap processes.
+
+        `target` may hold several hosts/ranges or be a file of targets. At most
+        `parallel` shards run at once (default: CPU count); a failed shard is
+        retried up to `retries` times. Shard reports are cached individually, so
+        re-running a wide scan only repeats shards that failed or expired. The
+        shard XML files are merged into one `nmap_<stem>.xml`.
+        """
+        self.ensure_reports_dir(out_dir)
+        name = os.path.basename(target) if os.path.isfile(target) else target
+        stem = self.clean_target_for_filename(re.sub(r'[\s,]+', '_', name.strip()))
+        out = f"{out_dir}/nmap_{stem}.xml"
+        shard_dir = os.path.join(out_dir, f"nmap_{stem}_shards")
+        os.makedirs(shard_dir, exist_ok=True)
+
+        port_specs = split_ports(ports, port_shards) if scan_type == "custom" else [ports]
+        plan = [(hosts, spec) for hosts in split_targets(self.expand_targets(target), hosts_per_shard)
+                for spec in port_specs]
+        parallel = parallel or os.cpu_count() or 1
+        console.print(f"[cyan]Nmap sharded: {len(plan)} shard, {parallel} paralel[/cyan]")
+
+        done, failed = {}, []
+        lock = threading.Lock()
+        # Batas paralel khusus panggilan ini; batas nmap bersama tidak diubah (run lain bisa jalan bersamaan)
+        slot = threading.BoundedSemaphore(parallel)
+
+        def scan(n, hosts, spec):
+            shard_out = os.path.join(shard_dir, f"shard_{n:04d}.xml")
+            cmd = " ".join(f"nmap {self.scan_flags(scan_type, spec)} {' '.join(hosts)} -oX {shard_out} {extra}".split())
+            for attempt in range(retries + 1):
+                job = self.run_cmd_cached(cmd, shard_out, " ".join(hosts), force=force or attempt > 0, slot=slot)
+                if job is None or job.ok:
+                    with lock:
+                        done[n] = shard_out
+                    return
+                if job.cancelled:
+                    break
+                console.print(f"[yellow]Shard {n} gagal (percobaan {attempt + 1}/{retries + 1})[/yellow]")
+            with lock:
+                failed.append((n, hosts, spec))
+
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="nmap-shard") as pool:
+            for future in [pool.submit(scan, n, hosts, spec) for n, (hosts, spec) in enumerate(plan)]:
+                future.result()
+
+        # Shard "sukses" bisa saja tidak menulis XML (mis. nmap keluar 0 tanpa target valid)
+        shard_files = [done[n] for n in sorted(done) if os.path.isfile(done[n]) and os.path.getsize(done[n]) > 0]
+        if shard_files:
+            merge_xml(shard_files, out, args=f"nmap {self.scan_flags(scan_type, ports)} {target} {extra}".strip())
+        for n, hosts, spec in failed:
+            console.print(f"[red]Shard {n} gagal permanen: {' '.join(hosts)}" + (f" -p {spec}" if spec else "") + "[/red]")
+        if not failed:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            self.record_run(out)
+        console.print(f"[green]{len(done)}/{len(plan)} shard selesai, digabung ke {out}[/green]")
         return out
+
+    @staticmethod
+    def iter_hosts(path: str):
+        """Yield hosts one at a time from an nmap XML report using incremental parsing.
+
+        Each host is a dict: address, hostnames, status and a list of ports
+        (port, proto, state, service, product, version). Parsed elements are
+        cleared immediately so memory stays flat for very large scans.
+        """
+        context = ET.iterparse(path, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end" or elem.tag != "host":
+                continue
+            addresses = {a.get("addrtype"): a.get("addr") for a in elem.findall("address")}
+            status = elem.find("status")
+            ports = []
+            for port in elem.iterfind("ports/port"):
+                state = port.find("state")
+                service = port.find("service")
+                ports.append({
+                    "port": int(port.get("portid")),
+                    "proto": port.get("protocol"),
+                    "state": state.get("state") if state is not None else "unknown",
+                    "service": service.get("name") if service is not None else None,
+                    "product": service.get("product") if service is not None else None,
+                    "version": service.get("version") if service is not None else None,
+                })
+            yield {
+                "address": addresses.get("ipv4") or addresses.get("ipv6"),
+                "hostnames": [h.get("name") for h in elem.iterfind("hostnames/hostname")],
+                "status": status.get("state") if status is not None else None,
+                "ports": ports,
+            }
+            elem.clear()
+            root.clear()
@@ -1,6 +1,11 @@
 # plugins/scan_nuclei.py
 import re
+import json
 from .base import Plugin
+from .ratelimit import get_rate_limiter, host_of
+
+# Format teks lama: [template:matcher] [protocol] [severity] url [extra]
+TEXT_LINE = re.compile(r'^\[([^\]]+)\] \[([^\]]+)\] \[([^\]]+)\] (\S+)(?: (.*))?$')
 
 class Nuclei(Plugin):
     name = "Nuclei (Vulnerability Scan)"
@@ -15,22 +20,69 @@ class Nuclei(Plugin):
         cleaned = re.sub(r'[<>:"/\\|?*]', '_', cleaned)
         return cleaned
 
-    def run(self, target: str, out_dir="reports", use_urls_file=False, severity=None, tags=None, extra=""):
+    def run(self, target: str, out_dir="reports", use_urls_file=False, severity=None, tags=None, extra="",
+            rate=None, record=True, force=False):
+        """Scan a URL or a file of URLs; `rate` req/s as -rl (None = rate learned for a single target's host).
+
+        `record=False` keeps the report out of the run history (e.g. partial batches).
+        """
         self.ensure_reports_dir(out_dir)
         stem = self.clean_target_for_filename(target)
-        out = f"{out_dir}/nuclei_{stem}.txt"
+        out = f"{out_dir}/nuclei_{stem}.jsonl"
         
         # Build command parts
         sev_flag = f"-severity {severity}" if severity else ""
         tags_flag = f"-tags {tags}" if tags else ""
         
         if use_urls_file:
-            cmd = f"nuclei -l {target} -o {out} {sev_flag} {tags_flag} {extra}".strip()
+            cmd = f"nuclei -l {target} -jsonl -o {out} {sev_flag} {tags_flag} {extra}".strip()
         else:
-            cmd = f"nuclei -u {target} -o {out} {sev_flag} {tags_flag} {extra}".strip()
+            cmd = f"nuclei -u {target} -jsonl -o {out} {sev_flag} {tags_flag} {extra}".strip()
         
         # Clean up extra spaces
         cmd = " ".join(cmd.split())
+        host = None if use_urls_file else host_of(target)
+        rate_flag = get_rate_limiter().rate_flag(self.bin_name, host, extra, rate) if host or rate else ""
         
-        self.run_cmd(cmd)
+        # Untuk file URLs, isi file ikut menentukan kunci cache
+        inputs = [target] if use_urls_file else []
+        job = self.run_cmd_cached(f"{cmd} {rate_flag}".strip(), out, target, inputs=inputs, force=force,
+                                  key_cmd=cmd)
+        if record and (job is None or job.ok):
+            self.record_run(out)
         return out
+
+    @staticmethod
+    def iter_findings(path: str):
+        """Yield findings one at a time from a nuclei JSONL report (or a legacy text report).
+
+        Each item is a dict with template, severity, protocol, url, host and detail.
+        """
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("{"):
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    template = rec.get("template-id", "")
+                    if rec.get("matcher-name"):
+                        template += f":{rec['matcher-name']}"
+                    extracted = rec.get("extracted-results")
+                    yield {
+                        "template": template,
+                        "severity": (rec.get("info") or {}).get("severity", "unknown").lower(),
+                        "protocol": rec.get("type"),
+                        "url": rec.get("matched-at") or rec.get("host", ""),
+                        "host": rec.get("host", ""),
+                        "detail": json.dumps(extracted) if extracted else None,
+                    }
+                else:
+                    m = TEXT_LINE.match(line)
+                    if m:
+                        template, protocol, severity, url, detail = m.groups()
+                        yield {"template": template, "severity": severity.lower(), "protocol": protocol,
+                               "url": url, "host": url, "detail": detail}
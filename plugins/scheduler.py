@@ -0,0 +1,565 @@
+# plugins/scheduler.py
+import os
+import sys
+import json
+import hmac
+import time
+import shlex
+import signal
+import socket
+import secrets
+import sqlite3
+import threading
+import traceback
+from rich.console import Console
+from rich.markup import escape
+from .executor import configure
+from .ratelimit import host_of
+
+console = Console()
+
+DEFAULT_DB = os.path.join("reports", "scheduler.db")
+LOG_DIR = os.path.join("reports", "scheduler")
+TOKEN_PATH = os.path.join("reports", "scheduler.token")
+DEFAULT_PORT = 8765
+DEFAULT_SLOTS = 2
+HEARTBEAT = 5.0        # detik antar update heartbeat job yang berjalan
+STALE_AFTER = 60.0     # job tanpa heartbeat selama ini dianggap yatim (daemon mati)
+GRACE = 10.0           # detik antara SIGTERM dan SIGKILL saat job dihentikan
+METHODS = ("run", "run_sharded")  # method plugin yang boleh dijadwalkan
+STATES = ("queued", "running", "done", "failed", "cancelled")
+MAIN_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY,
+    plugin       TEXT NOT NULL,
+    method       TEXT NOT NULL DEFAULT 'run',
+    args         TEXT NOT NULL DEFAULT '[]',
+    kwargs       TEXT NOT NULL DEFAULT '{}',
+    target       TEXT NOT NULL,
+    priority     INTEGER NOT NULL DEFAULT 0,
+    state        TEXT NOT NULL DEFAULT 'queued',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    timeout      REAL,
+    cancel       INTEGER NOT NULL DEFAULT 0,
+    interrupted  INTEGER NOT NULL DEFAULT 0,
+    submitted    REAL NOT NULL,
+    started      REAL,
+    finished     REAL,
+    heartbeat    REAL,
+    worker       TEXT,
+    pid          INTEGER,
+    exit_code    INTEGER,
+    result       TEXT,
+    error        TEXT
+);
+CREATE TABLE IF NOT EXISTS targets (
+    name   TEXT PRIMARY KEY,
+    served INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(state, target, priority, id);
+"""
+
+_COLUMNS = ("id", "plugin", "method", "args", "kwargs", "target", "priority", "state", "attempts", "max_attempts",
+            "timeout", "cancel", "interrupted", "submitted", "started", "finished", "heartbeat", "worker", "pid",
+            "exit_code", "result", "error")
+
+
+def job_target(args, kwargs) -> str:
+    """Fairness key of a job: the host of its URL/domain/target argument"""
+    value = next((kwargs[k] for k in ("target", "url", "domain") if kwargs.get(k)), None)
+    if value is None and args:
+        value = args[0]
+    host = host_of(str(value or "-"))
+    name, sep, port = host.rpartition(":")
+    # Port dibuang: https://x:8443 dan x:443 tetap satu target (kecuali literal IPv6)
+    return name if sep and port.isdigit() and (name.endswith("]") or ":" not in name) else host
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class JobQueue:
+    """Persistent job queue in SQLite, shared by the daemon, its job processes, the API and the CLI.
+
+    Jobs are claimed highest priority first; within a priority the target
+    with the fewest running jobs and then the one served longest ago goes
+    next (round robin), so one big target cannot starve the others.
+    `max_per_target` caps the running jobs per target. Running jobs carry
+    the claiming daemon and a heartbeat; `recover()` puts jobs of a dead
+    daemon back in the queue until `max_attempts` is used up.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self, sql: str, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params)
+
+    @staticmethod
+    def _row(row):
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        job["args"] = json.loads(job["args"])
+        job["kwargs"] = json.loads(job["kwargs"])
+        job["cancel"] = bool(job["cancel"])
+        job["interrupted"] = bool(job["interrupted"])
+        return job
+
+    # --- submit / query ---------------------------------------------------
+
+    def submit(self, plugin: str, args=(), kwargs=None, method="run", target=None, priority=0, max_attempts=3,
+               timeout=None) -> int:
+        """Queue `plugin.method(*args, **kwargs)`; returns the job id"""
+        if method not in METHODS:
+            raise ValueError(f"Method '{method}' tidak bisa dijadwalkan, pilih: {', '.join(METHODS)}")
+        kwargs = dict(kwargs or {})
+        args = list(args)
+        target = target or job_target(args, kwargs)
+        cur = self._write(
+            "INSERT INTO jobs(plugin, method, args, kwargs, target, priority, max_attempts, timeout, submitted) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (plugin, method, json.dumps(args), json.dumps(kwargs), target, int(priority), int(max_attempts),
+             timeout, time.time()))
+        return cur.lastrowid
+
+    def get(self, job_id: int):
+        row = self.conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row)
+
+    def list(self, state=None, limit=50):
+        """Newest jobs first, optionally of one state"""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM jobs"
+        params = []
+        if state:
+            sql += " WHERE state = ?"
+            params.append(state)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(int(limit))
+        return [self._row(r) for r in self.conn.execute(sql, params)]
+
+    def counts(self) -> dict:
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return counts
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued job now, or ask the daemon to stop a running one; False if already finished"""
+        now = time.time()
+        with self._lock:
+            cur = self.conn.execute("UPDATE jobs SET state = 'cancelled', cancel = 1, finished = ? "
+                                    "WHERE id = ? AND state = 'queued'", (now, job_id))
+            if cur.rowcount:
+                return True
+            cur = self.conn.execute("UPDATE jobs SET cancel = 1 WHERE id = ? AND state = 'running'", (job_id,))
+            return cur.rowcount > 0
+
+    # --- daemon side ---------------------------------------------------------
+
+    def claim(self, worker: str, max_per_target=None):
+        """Mark the next job running for `worker` and return it (None when nothing can run)"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "WITH busy AS (SELECT target, COUNT(*) AS n FROM jobs WHERE state = 'running' GROUP BY target), "
+                    "head AS (SELECT target, priority, MIN(id) AS id FROM jobs WHERE state = 'queued' "
+                    "GROUP BY target, priority) "
+                    "SELECT head.id, head.target FROM head "
+                    "LEFT JOIN busy ON busy.target = head.target LEFT JOIN targets ON targets.name = head.target "
+                    "WHERE ? IS NULL OR COALESCE(busy.n, 0) < ? "
+                    "ORDER BY head.priority DESC, COALESCE(busy.n, 0), COALESCE(targets.served, 0), head.id "
+                    "LIMIT 1", (max_per_target, max_per_target)).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+                job_id, target = row
+                now = time.time()
+                self.conn.execute("UPDATE jobs SET state = 'running', attempts = attempts + 1, worker = ?, "
+                                  "started = ?, heartbeat = ?, pid = NULL, exit_code = NULL, error = NULL "
+                                  "WHERE id = ?", (worker, now, now, job_id))
+                self.conn.execute("INSERT INTO targets(name, served) "
+                                  "VALUES (?, (SELECT COALESCE(MAX(served), 0) + 1 FROM targets)) "
+                                  "ON CONFLICT(name) DO UPDATE SET served = excluded.served", (target,))
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return self.get(job_id)
+
+    def heartbeat(self, worker: str):
+        self._write("UPDATE jobs SET heartbeat = ? WHERE state = 'running' AND worker = ?", (time.time(), worker))
+
+    def cancel_requested(self, worker: str):
+        """Ids of this worker's running jobs that were cancelled"""
+        return [r[0] for r in self.conn.execute(
+            "SELECT id FROM jobs WHERE state = 'running' AND worker = ? AND cancel = 1", (worker,))]
+
+    def started(self, job_id: int, pid: int):
+        """Called by the job process itself: its process group, for cleanup after a daemon crash"""
+        self._write("UPDATE jobs SET pid = ? WHERE id = ?", (pid, job_id))
+
+    def set_result(self, job_id: int, result=None, error=None):
+        self._write("UPDATE jobs SET result = ?, error = ? WHERE id = ?",
+                    (None if result is None else str(result), error, job_id))
+
+    def finish(self, job_id: int, state: str, exit_code=None, error=None):
+        self._write("UPDATE jobs SET state = ?, finished = ?, exit_code = ?, error = COALESCE(?, error), "
+                    "heartbeat = NULL WHERE id = ?", (state, time.time(), exit_code, error, job_id))
+
+    def release(self, job_id: int):
+        """Put a running job back in the queue without counting the attempt (daemon shutdown)"""
+        self._write("UPDATE jobs SET state = 'queued', attempts = MAX(attempts - 1, 0), interrupted = 1, "
+                    "worker = NULL, pid = NULL, heartbeat = NULL, error = NULL "
+                    "WHERE id = ? AND state = 'running'", (job_id,))
+
+    def recover(self, stale=STALE_AFTER, host=None):
+        """Requeue running jobs whose daemon is gone; returns (requeued, failed) ids.
+
+        A job is orphaned when its heartbeat is older than `stale` seconds,
+        or at once when its daemon ran on this host and that process is dead.
+        A job process that outlived its daemon is killed first. Jobs out of
+        attempts fail; cancelled ones end as cancelled.
+        """
+        host = host or socket.gethostname()
+        now = time.time()
+        requeued, failed = [], []
+        rows = self.conn.execute("SELECT id, worker, pid, heartbeat, attempts, max_attempts, cancel FROM jobs "
+                                 "WHERE state = 'running'").fetchall()
+        for job_id, worker, pid, beat, attempts, max_attempts, cancel in rows:
+            worker_host, _, worker_pid = (worker or "").rpartition(":")
+            local = worker_host == host and worker_pid.isdigit()
+            if local and int(worker_pid) == os.getpid():
+                continue
+            if not (local and not _alive(int(worker_pid))) and beat is not None and now - beat < stale:
+                continue
+            if local and pid:
+                _kill_group(pid)
+            if cancel:
+                self.finish(job_id, "cancelled", error="dibatalkan; daemon berhenti di tengah job")
+            elif attempts >= max_attempts:
+                self.finish(job_id, "failed", error=f"daemon berhenti di tengah job ({attempts}x)")
+                failed.append(job_id)
+            else:
+                self._write("UPDATE jobs SET state = 'queued', interrupted = 1, worker = NULL, pid = NULL, "
+                            "heartbeat = NULL WHERE id = ? AND state = 'running'", (job_id,))
+                requeued.append(job_id)
+        return requeued, failed
+
+
+def _kill_group(pid: int, grace=GRACE):
+    """SIGTERM a job's process group (it cancels its tool processes), SIGKILL whatever is left after `grace`"""
+    try:
+        if os.name == "nt":
+            os.kill(pid, signal.SIGTERM)
+            return
+        os.killpg(pid, signal.SIGTERM)
+        deadline = time.monotonic() + grace
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            os.killpg(pid, 0)  # ProcessLookupError bila grup sudah habis
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def _interrupt(signum, frame):
+    # SIGTERM dari daemon: jalur Ctrl-C plugin menghentikan proses tool-nya sendiri
+    raise KeyboardInterrupt
+
+
+def execute(job_id: int, registry, db_path=DEFAULT_DB) -> int:
+    """Body of one job process: call the plugin method and store its return value; returns the exit code.
+
+    A job that was interrupted before (daemon crash or stop) and whose
+    method accepts `resume` is started again with resume=True, so
+    checkpointed crawls continue where they were.
+    """
+    import inspect
+    queue = JobQueue(db_path)
+    job = queue.get(job_id)
+    if job is None:
+        console.print(f"[red]Job {job_id} tidak ada di {db_path}[/red]")
+        return 2
+    queue.started(job_id, os.getpgid(0) if os.name != "nt" else os.getpid())
+    signal.signal(signal.SIGTERM, _interrupt)
+    console.print(f"[cyan]Job {job_id}: {job['plugin']}.{job['method']}"
+                  f"({', '.join([repr(a) for a in job['args']] + [f'{k}={v!r}' for k, v in job['kwargs'].items()])})"
+                  f" percobaan {job['attempts']}/{job['max_attempts']}[/cyan]")
+    try:
+        fn = getattr(registry.get(job["plugin"]), job["method"])
+        kwargs = dict(job["kwargs"])
+        if job["interrupted"] and "resume" in inspect.signature(fn).parameters:
+            kwargs.setdefault("resume", True)
+        result = fn(*job["args"], **kwargs)
+    except KeyboardInterrupt:
+        queue.set_result(job_id, error="dihentikan")
+        return 130
+    except Exception as e:
+        traceback.print_exc()
+        queue.set_result(job_id, error=f"{type(e).__name__}: {e}")
+        return 1
+    finally:
+        sys.stdout.flush()
+    if result is None:
+        queue.set_result(job_id, error="plugin tidak menghasilkan output")
+        return 1
+    queue.set_result(job_id, result=result)
+    return 0
+
+
+class Scheduler:
+    """Headless daemon: runs queued jobs in `slots` parallel job processes.
+
+    Each job runs as `python main.py exec-job <id>` through the shared
+    executor, with its output in reports/scheduler/<id>.log, so a plugin
+    that crashes or hangs takes only its own process down and cancelling
+    kills the whole process group. Stale jobs of a previous daemon are
+    recovered at start and every heartbeat. SIGTERM/Ctrl-C stops the job
+    processes and puts their jobs back in the queue for the next start.
+    """
+
+    def __init__(self, slots=DEFAULT_SLOTS, db_path=DEFAULT_DB, max_per_target=None, poll=1.0):
+        self.slots = slots
+        self.db_path = db_path
+        self.max_per_target = max_per_target
+        self.poll = poll
+        self.queue = JobQueue(db_path)
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.running = {}  # job id -> executor Job
+        self.cancelling = set()
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        # Executor di proses daemon hanya menjalankan proses job
+        self.executor = configure(max_workers=slots, tool_limits={"scheduler": slots})
+
+    def _command(self, job_id: int) -> str:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        log = os.path.join(LOG_DIR, f"{job_id}.log")
+        return (f"{shlex.quote(sys.executable)} {shlex.quote(MAIN_PY)} --db {shlex.quote(self.db_path)} "
+                f"exec-job {job_id} >> {shlex.quote(log)} 2>&1")
+
+    def _start(self, job):
+        console.print(f"[cyan]▶ job {job['id']} {job['plugin']}.{job['method']} {escape(job['target'])} "
+                      f"(prioritas {job['priority']}, percobaan {job['attempts']}/{job['max_attempts']})[/cyan]")
+        # Timeout lewat SIGTERM dulu (seperti cancel): proses job menghentikan tool di session-nya sendiri
+        self.running[job["id"]] = self.executor.submit(self._command(job["id"]), "scheduler", timeout=job["timeout"],
+                                                       timeout_grace=GRACE)
+
+    def _reap(self):
+        for job_id, proc in list(self.running.items()):
+            if not proc.done():
+                continue
+            del self.running[job_id]
+            self.cancelling.discard(job_id)
+            job = self.queue.get(job_id)
+            if job["cancel"]:
+                state, error = "cancelled", None
+            elif proc.timed_out:
+                state, error = "failed", f"timeout setelah {job['timeout']:.0f}s"
+            elif proc.returncode == 0:
+                state, error = "done", None
+            else:
+                state, error = "failed", None if job["error"] else f"exit code {proc.returncode}"
+            self.queue.finish(job_id, state, proc.returncode, error)
+            color = {"done": "green", "cancelled": "yellow"}.get(state, "red")
+            console.print(f"[{color}]■ job {job_id} {state}[/{color}] [dim]({proc.duration or 0:.1f}s"
+                          f"{', ' + escape(error or job['error']) if state == 'failed' else ''})[/dim]")
+
+    def step(self):
+        """One scheduling round: reap finished jobs, stop cancelled ones, fill free slots"""
+        self._reap()
+        for job_id in self.queue.cancel_requested(self.worker):
+            if job_id in self.running and job_id not in self.cancelling:
+                self.cancelling.add(job_id)
+                self.running[job_id].cancel(grace=GRACE)
+        while len(self.running) < self.slots and not self.stopping.is_set():
+            job = self.queue.claim(self.worker, self.max_per_target)
+            if job is None:
+                break
+            self._start(job)
+
+    def recover(self):
+        requeued, failed = self.queue.recover()
+        if requeued or failed:
+            console.print(f"[yellow]Pemulihan: {len(requeued)} job dikembalikan ke antrean, "
+                          f"{len(failed)} gagal (batas percobaan)[/yellow]")
+
+    def serve(self, api_port=DEFAULT_PORT):
+        """Run until SIGTERM/Ctrl-C; `api_port` None disables the JSON API"""
+        api = None
+        if api_port is not None:
+            api = start_api(self, api_port)
+            console.print(f"[green]API: http://127.0.0.1:{api.server_port} (token di {TOKEN_PATH})[/green]")
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+        console.print(f"[green]Scheduler jalan: {self.slots} slot, antrean {self.db_path}[/green]")
+        self.recover()
+        last_beat = time.monotonic()
+        try:
+            while not self.stopping.is_set():
+                self.step()
+                if time.monotonic() - last_beat >= HEARTBEAT:
+                    self.queue.heartbeat(self.worker)
+                    self.recover()
+                    last_beat = time.monotonic()
+                self.wake.wait(self.poll)
+                self.wake.clear()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            if api is not None:
+                api.shutdown()
+
+    def stop(self):
+        """Stop job processes; their jobs go back in the queue (cancelled ones end as cancelled)"""
+        self.stopping.set()
+        for proc in self.running.values():
+            proc.cancel(grace=GRACE)
+        for job_id, proc in list(self.running.items()):
+            proc.wait()
+            if self.queue.get(job_id)["cancel"]:
+                self.queue.finish(job_id, "cancelled", proc.returncode)
+            else:
+                self.queue.release(job_id)
+        if self.running:
+            console.print(f"[yellow]{len(self.running)} job dikembalikan ke antrean[/yellow]")
+        self.running.clear()
+
+
+def api_token() -> str:
+    """Token the JSON API expects as `Authorization: Bearer <token>` (created on first use, mode 0600)"""
+    if os.path.isfile(TOKEN_PATH):
+        with open(TOKEN_PATH, encoding="utf-8") as f:
+            return f.read().strip()
+    os.makedirs(os.path.dirname(TOKEN_PATH) or ".", exist_ok=True)
+    token = secrets.token_urlsafe(24)
+    fd = os.open(TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token + "\n")
+    return token
+
+
+def start_api(scheduler: Scheduler, port=DEFAULT_PORT, host="127.0.0.1"):
+    """Local JSON API in a background thread.
+
+        GET  /status              slots, running jobs, counts per state
+        GET  /jobs?state=&limit=  newest jobs first
+        GET  /jobs/<id>           one job
+        POST /jobs                {"plugin", "args", "kwargs", "method", "target", "priority",
+                                   "max_attempts", "timeout"} -> {"id"}
+        POST /jobs/<id>/cancel    -> {"cancelled": bool}
+
+    Every request needs the token from api_token(): jobs run plugin commands,
+    so an open port would let any local user run them.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlsplit, parse_qs
+    token = api_token()
+    queue = JobQueue(scheduler.db_path)
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            pass
+
+        def _reply(self, status: int, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _authorized(self) -> bool:
+            given = self.headers.get("Authorization", "")
+            if hmac.compare_digest(given.encode(), f"Bearer {token}".encode()):
+                return True
+            self._reply(401, {"error": "token salah atau tidak ada"})
+            return False
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            url = urlsplit(self.path)
+            parts = url.path.strip("/").split("/")
+            if parts == ["status"]:
+                self._reply(200, {"slots": scheduler.slots, "running": sorted(scheduler.running),
+                                  "counts": queue.counts()})
+            elif parts == ["jobs"]:
+                query = parse_qs(url.query)
+                limit = query.get("limit", ["50"])[0]
+                self._reply(200, queue.list(query.get("state", [None])[0], int(limit) if limit.isdigit() else 50))
+            elif len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+                job = queue.get(int(parts[1]))
+                self._reply(200 if job else 404, job or {"error": "job tidak ada"})
+            else:
+                self._reply(404, {"error": "endpoint tidak ada"})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            parts = urlsplit(self.path).path.strip("/").split("/")
+            if len(parts) == 3 and parts[0] == "jobs" and parts[1].isdigit() and parts[2] == "cancel":
+                cancelled = queue.cancel(int(parts[1]))
+                scheduler.wake.set()
+                self._reply(200, {"cancelled": cancelled})
+                return
+            if parts != ["jobs"]:
+                self._reply(404, {"error": "endpoint tidak ada"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                job_id = submit_job(queue, body)
+            except (ValueError, KeyError, TypeError) as e:
+                self._reply(400, {"error": str(e.args[0] if e.args else e)})
+                return
+            scheduler.wake.set()
+            self._reply(201, {"id": job_id})
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="scheduler-api", daemon=True).start()
+    return server
+
+
+def submit_job(queue: JobQueue, spec: dict, registry=None) -> int:
+    """Validate a job spec (API body / CLI) and queue it"""
+    from .registry import PluginRegistry
+    if not isinstance(spec, dict) or not spec.get("plugin"):
+        raise ValueError("field 'plugin' wajib diisi (nama class, mis. Nmap)")
+    (registry or PluginRegistry()).spec(spec["plugin"])  # KeyError bila plugin tidak ada
+    args, kwargs = spec.get("args") or [], spec.get("kwargs") or {}
+    if not isinstance(args, list) or not isinstance(kwargs, dict):
+        raise ValueError("'args' harus list dan 'kwargs' harus object")
+    timeout = spec.get("timeout")
+    if timeout is not None:
+        # Kolom timeout REAL juga menerima teks: tanpa validasi executor gagal saat menunggu job
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            raise ValueError("'timeout' harus angka (detik)") from None
+        if not timeout > 0:
+            raise ValueError("'timeout' harus lebih dari 0 detik")
+    return queue.submit(spec["plugin"], args, kwargs, method=spec.get("method") or "run",
+                        target=spec.get("target"), priority=int(spec.get("priority") or 0),
+                        max_attempts=int(spec.get("max_attempts") or 3), timeout=timeout)
@@ -0,0 +1,257 @@
+# plugins/wordlist.py
+import os
+import mmap
+import heapq
+import shutil
+import struct
+import hashlib
+import tempfile
+from array import array
+from .cache import CACHE_DIR, file_digest
+
+WORDLIST_CACHE = os.path.join(CACHE_DIR, "wordlists")
+INDEX_VERSION = 1
+WORDLIST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wordlists")
+
+
+def normalize(line: str, lowercase=False):
+    """Wordlist entry from a raw line: stripped, comments/blank lines dropped, no leading '/'"""
+    word = line.strip()
+    if not word or word.startswith("#"):
+        return None
+    word = word.lstrip("/")
+    return (word.lower() if lowercase else word) or None
+
+
+def parse_extensions(spec):
+    """'php,.bak' or ['php', '.bak'] -> ('.php', '.bak'), in ffuf's -e format"""
+    if not spec:
+        return ()
+    parts = spec.split(",") if isinstance(spec, str) else spec
+    return tuple(dict.fromkeys("." + p.strip().lstrip(".") for p in parts if p.strip().lstrip(".")))
+
+
+def _read_sources(paths, lowercase=False):
+    """Normalized words of every source in order, read through mmap"""
+    for path in paths:
+        if os.path.getsize(path) == 0:
+            continue
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                word = normalize(raw.decode("utf-8", "replace"), lowercase)
+                if word is not None and "\t" not in word:
+                    yield word
+
+
+def _spill(items, key, tmp_dir, chunk_lines):
+    """Sort `items` ("a\\tb" strings) in chunks on disk; return the chunk paths"""
+    chunks, buf = [], []
+
+    def flush():
+        buf.sort(key=key)
+        path = os.path.join(tmp_dir, f"chunk_{len(chunks):05d}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(item + "\n" for item in buf)
+        chunks.append(path)
+        buf.clear()
+
+    for item in items:
+        buf.append(item)
+        if len(buf) >= chunk_lines:
+            flush()
+    if buf:
+        flush()
+    return chunks
+
+
+def _merge(chunks, key):
+    files = [open(p, encoding="utf-8") for p in chunks]
+    try:
+        yield from heapq.merge(*((line.rstrip("\n") for line in f) for f in files), key=key)
+    finally:
+        for f in files:
+            f.close()
+
+
+def unique_in_order(words, chunk_lines=500_000, tmp_dir=None):
+    """Yield each distinct word once, in order of first occurrence, with bounded memory.
+
+    Two external sorts: by word (dropping repeats, keeping the first position),
+    then by position to restore the original order.
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="wordlist_") as tmp:
+        by_word = _spill((f"{w}\t{i:012d}" for i, w in enumerate(words)),
+                         lambda s: s.rpartition("\t")[0], os.path.join(tmp), chunk_lines)
+        if not by_word:
+            return
+        first_dir = os.path.join(tmp, "first")
+        os.makedirs(first_dir)
+
+        def firsts():
+            previous = None
+            # heapq.merge stabil: untuk kata sama, chunk lebih awal (posisi lebih kecil) keluar dulu
+            for item in _merge(by_word, lambda s: s.rpartition("\t")[0]):
+                word, _, pos = item.rpartition("\t")
+                if word != previous:
+                    previous = word
+                    yield f"{pos}\t{word}"
+
+        by_pos = _spill(firsts(), None, first_dir, chunk_lines)
+        for item in _merge(by_pos, None):
+            yield item.partition("\t")[2]
+
+
+class Wordlist:
+    """Deduplicated, normalized wordlist backed by a memory-mapped on-disk index.
+
+    The index is built once per set of sources (keyed on their content hash
+    and the normalization options) under reports/.cache/wordlists:
+    `<key>.words` holds one word per line - a valid wordlist for ffuf - and
+    `<key>.idx` holds the uint64 start offset of every line, so any word or
+    slice is read straight from the mapping without loading the list.
+    """
+
+    def __init__(self, sources, lowercase=False, cache_dir=WORDLIST_CACHE, chunk_lines=500_000):
+        self.sources = [sources] if isinstance(sources, str) else list(sources)
+        missing = [p for p in self.sources if not os.path.isfile(p)]
+        if missing:
+            raise FileNotFoundError(f"Wordlist tidak ditemukan: {', '.join(missing)}")
+        self.lowercase = lowercase
+        parts = [f"v{INDEX_VERSION}", f"lower={lowercase}"] + [file_digest(p) for p in self.sources]
+        self.key = hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+        self.path = os.path.join(cache_dir, f"{self.key}.words")
+        self.index_path = os.path.join(cache_dir, f"{self.key}.idx")
+        if not (os.path.isfile(self.path) and os.path.isfile(self.index_path)):
+            self._build(chunk_lines)
+        self._open()
+
+    def _build(self, chunk_lines):
+        cache_dir = os.path.dirname(self.path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Nama tmp per proses: beberapa job scheduler bisa membangun wordlist yang sama bersamaan
+        tmp_words, tmp_index = f"{self.path}.{os.getpid()}.tmp", f"{self.index_path}.{os.getpid()}.tmp"
+        offset = 0
+        offsets = array("Q")
+        with open(tmp_words, "wb") as wf, open(tmp_index, "wb") as xf:
+            for word in unique_in_order(_read_sources(self.sources, self.lowercase), chunk_lines, cache_dir):
+                data = word.encode("utf-8") + b"\n"
+                offsets.append(offset)
+                offset += len(data)
+                wf.write(data)
+                if len(offsets) >= 65536:
+                    offsets.tofile(xf)
+                    offsets = array("Q")
+            offsets.append(offset)  # sentinel: akhir kata terakhir
+            offsets.tofile(xf)
+        os.replace(tmp_words, self.path)
+        os.replace(tmp_index, self.index_path)
+
+    def _open(self):
+        self._count = os.path.getsize(self.index_path) // 8 - 1
+        self._words_file = open(self.path, "rb")
+        self._index_file = open(self.index_path, "rb")
+        size = os.path.getsize(self.path)
+        self._words = mmap.mmap(self._words_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        for handle in (self._words, self._index):
+            if isinstance(handle, mmap.mmap):
+                handle.close()
+        self._words_file.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, i: int) -> int:
+        return struct.unpack_from("<Q", self._index, i * 8)[0]
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._words[self._offset(i):self._offset(i + 1) - 1].decode("utf-8")
+
+    def iter_range(self, start=0, stop=None, extensions=()):
+        """Words [start, stop) read from the mapping; each followed by word+ext for every extension"""
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return
+        pos, end = self._offset(start), self._offset(stop)
+        while pos < end:
+            nl = self._words.find(b"\n", pos, end)
+            word = self._words[pos:nl].decode("utf-8")
+            pos = nl + 1
+            yield word
+            for ext in extensions:
+                yield word + ext
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def shard_bounds(self, shard: int, shards: int):
+        """[start, stop) of slice `shard` out of `shards` near-equal slices"""
+        return self._count * shard // shards, self._count * (shard + 1) // shards
+
+    def shard(self, shard: int, shards: int, extensions=()):
+        """Lazy iterator over one slice of the list"""
+        return self.iter_range(*self.shard_bounds(shard, shards), extensions=extensions)
+
+    def write(self, path: str, start=0, stop=None, extensions=()) -> str:
+        """Write words [start, stop) (with extensions) to a plain wordlist file, streaming"""
+        stop = self._count if stop is None else stop
+        with open(path, "wb") as f:
+            if not extensions:
+                # Tanpa ekstensi: salin bytes langsung dari mapping
+                f.write(self._words[self._offset(start):self._offset(min(stop, self._count))])
+            else:
+                for word in self.iter_range(start, stop, extensions):
+                    f.write(word.encode("utf-8") + b"\n")
+        return path
+
+    def write_shards(self, shards: int, out_dir: str, extensions=()):
+        """Write `shards` slice files (`shard_NNN.txt`) for parallel workers; returns their paths"""
+        os.makedirs(out_dir, exist_ok=True)
+        return [self.write(os.path.join(out_dir, f"shard_{i:03d}.txt"), *self.shard_bounds(i, shards),
+                           extensions=extensions)
+                for i in range(shards)]
+
+
+def default_wordlist(mode="dir") -> str:
+    """Bundled wordlist for a fuzz mode ("dir" or "param")"""
+    return os.path.join(WORDLIST_DIR, "common-dirs.txt" if mode == "dir" else "common-params.txt")
+
+
+def prepare_wordlist(wordlist: str, mode="dir"):
+    """Deduplicated Wordlist for one path or several comma-separated paths (merged in order).
+
+    Missing paths are skipped; when none exist the default wordlist for
+    `mode` is used. Returns None if there is nothing to fuzz with. The
+    caller closes the returned Wordlist.
+    """
+    paths = [p.strip() for p in (wordlist or "").split(",") if p.strip()]
+    found = [p for p in paths if os.path.isfile(p)]
+    if not found:
+        default_wl = default_wordlist(mode)
+        if not os.path.isfile(default_wl):
+            print(f"Wordlist {wordlist} tidak ditemukan dan wordlist default tidak tersedia!")
+            return None
+        print(f"File {wordlist} tidak ditemukan, menggunakan wordlist default: {default_wl}")
+        found = [default_wl]
+    elif len(found) < len(paths):
+        print(f"Wordlist dilewati (tidak ditemukan): {', '.join(p for p in paths if p not in found)}")
+    wl = Wordlist(found)
+    print(f"Wordlist: {len(wl)} kata unik dari {len(found)} file")
+    return wl
+
+
+def clear_cache(cache_dir=WORDLIST_CACHE):
+    shutil.rmtree(cache_dir, ignore_errors=True)
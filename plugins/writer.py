@@ -0,0 +1,112 @@
+# plugins/writer.py
+import os
+import time
+import heapq
+import tempfile
+
+
+class StreamWriter:
+    """Append unique lines to a report as they are found, flushed in batches.
+
+    The file is readable (e.g. `tail -f`) while the producer is still running;
+    call `external_sort` afterwards for the final sorted version. `on_write`
+    is called with every new line, e.g. to feed a pipeline stage. Lines are
+    deduplicated on `key(line)` (default the line itself).
+    """
+
+    def __init__(self, path: str, batch_size=100, flush_interval=2.0, seen=None, on_write=None, key=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.seen = seen if seen is not None else set()
+        self.on_write = on_write
+        self.key = key
+        self.count = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._fh = open(path, 'w', encoding='utf-8')
+
+    def write(self, line: str, key: str = None) -> bool:
+        """Queue a line if not written before (or its precomputed `key`); returns True if it was new"""
+        if key is None:
+            key = self.key(line) if self.key else line
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self._buffer.append(line)
+        self.count += 1
+        if self.on_write:
+            self.on_write(line)
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return True
+
+    def restore(self, lines):
+        """Re-write lines from an earlier session: deduplicated but without calling `on_write`"""
+        for line in lines:
+            key = self.key(line) if self.key else line
+            if key not in self.seen:
+                self.seen.add(key)
+                self._buffer.append(line)
+                self.count += 1
+        self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._fh.write('\n'.join(self._buffer) + '\n')
+            self._buffer.clear()
+        self._fh.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._fh.closed:
+            self.flush()
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def external_sort(path: str, out_path: str = None, chunk_lines=100_000, unique=True) -> str:
+    """Sort a line file in bounded memory: sorted chunk files merged with heapq.merge.
+
+    Sorts in place when `out_path` is not given. Returns the sorted file path.
+    """
+    out_path = out_path or path
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    chunks = []
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            while True:
+                lines = [line.rstrip('\n') for _, line in zip(range(chunk_lines), f)]
+                if not lines:
+                    break
+                lines.sort()
+                chunk = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=out_dir,
+                                                    suffix='.sortchunk', delete=False)
+                with chunk:
+                    chunk.writelines(line + '\n' for line in lines)
+                chunks.append(chunk.name)
+
+        handles = [open(name, encoding='utf-8') for name in chunks]
+        tmp_out = out_path + '.sorting'
+        try:
+            with open(tmp_out, 'w', encoding='utf-8') as out:
+                previous = None
+                for line in heapq.merge(*handles):
+                    if unique and line == previous:
+                        continue
+                    if line.strip():
+                        out.write(line)
+                    previous = line
+        finally:
+            for h in handles:
+                h.close()
+        os.replace(tmp_out, out_path)
+    finally:
+        for name in chunks:
+            os.remove(name)
+    return out_path
@@ -0,0 +1,42 @@
+# tests/conftest.py
+import os
+import sys
+import subprocess
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from plugins import cache, executor, findings, metrics, ratelimit, runs  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Every test runs in its own directory with fresh shared singletons (reports/ lands in tmp_path)"""
+    monkeypatch.chdir(tmp_path)
+    for module in (cache, executor, findings, metrics, ratelimit, runs):
+        monkeypatch.setattr(module, "_default", None)
+    return tmp_path
+
+
+@pytest.fixture
+def in_processes(workdir):
+    """Run a Python snippet in `n` concurrent processes in the test directory (argv[1] = process number)"""
+    def run(code, n=4):
+        env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+        procs = [subprocess.Popen([sys.executable, "-c", code, str(i)], cwd=workdir, env=env,
+                                  stderr=subprocess.PIPE, text=True) for i in range(n)]
+        for proc in procs:
+            _, err = proc.communicate(timeout=120)
+            assert proc.returncode == 0, err
+    return run
+
+
+@pytest.fixture
+def site():
+    """Small synthetic site (50 pages, no traps) on 127.0.0.1"""
+    from bench.harness import SiteShape, SyntheticSite
+    with SyntheticSite(SiteShape(pages=50, depth=3, page_bytes=256)) as s:
+        yield s
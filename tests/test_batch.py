@@ -0,0 +1,77 @@
+# tests/test_batch.py
+import threading
+from functools import partial
+
+from bench.harness import StubDNSServer, use_stubs
+from plugins import batch
+from plugins.batch import BatchRunner, read_targets
+from plugins.executor import configure
+from plugins.recon_subfinder import Subfinder
+from plugins.scan_nmap import Nmap
+from plugins.scan_nuclei import Nuclei
+
+
+class TrackedNmap(Nmap):
+    """Stub-backed nmap that records how many scans overlap and fails for one host"""
+
+    def __init__(self, fail_host=None):
+        super().__init__()
+        self.fail_host = fail_host
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def run(self, target, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if target == self.fail_host:
+                raise RuntimeError(f"nmap gagal untuk {target}")
+            return super().run(target, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_read_targets(tmp_path):
+    path = tmp_path / "domains.txt"
+    path.write_text("# daftar\nhttps://A.example/\na.example\n\nb.example  # komentar\n", encoding="utf-8")
+    assert read_targets(str(path)) == ["a.example", "b.example"]
+
+
+def test_batch_fans_out_and_isolates_failures(monkeypatch):
+    use_stubs()
+    monkeypatch.setenv("BENCH_STUB_DELAY", "0.2")
+    monkeypatch.setenv("BENCH_SUBDOMAINS", "3")
+    configure(max_workers=16, tool_limits={"nmap": 8, "nuclei": 8, "subfinder": 4})
+    nmap = TrackedNmap(fail_host="sub1.a.example")
+    runner = BatchRunner(Subfinder(), nmap, Nuclei(), workers=16)
+    hosts_file = runner.run(["a.example", "b.example"], name="test")
+
+    hosts = [f"sub{i}.{d}" for d in ("a.example", "b.example") for i in range(3)] + ["a.example", "b.example"]
+    assert open(hosts_file, encoding="utf-8").read().splitlines() == sorted(hosts)
+    # Scan per host berjalan bersamaan, bukan satu per satu
+    assert nmap.peak > 1
+    # Satu scan gagal: job lain tetap selesai dan hasilnya terkumpul
+    assert runner.progress.failed == 1
+    assert runner.progress.done == runner.progress.total == 2 + 2 * len(hosts)
+    by_tool = {}
+    for tool, target, report in runner.reports:
+        by_tool.setdefault(tool, set()).add(target)
+    assert by_tool["subfinder"] == {"a.example", "b.example"}
+    assert by_tool["nuclei"] == set(hosts)
+    assert by_tool["nmap"] == set(hosts) - {"sub1.a.example"}
+    assert all(report and open(report).read() for tool, _, report in runner.reports if tool == "nmap")
+
+
+def test_batch_resolve_keeps_timed_out_names(monkeypatch):
+    use_stubs()
+    monkeypatch.setenv("BENCH_SUBDOMAINS", "3")
+    monkeypatch.setattr(batch, "resolve_hosts", partial(batch.resolve_hosts, timeout=0.3, retries=0))
+    records = {"a.example": ["10.0.0.1"], "sub0.a.example": ["10.0.0.1"]}
+    with StubDNSServer(records=records, silent=["sub1.a.example"]) as dns:
+        runner = BatchRunner(Subfinder(), TrackedNmap(), resolve=True, nameserver=f"127.0.0.1:{dns.port}")
+        runner.run(["a.example"], name="dns")
+    # sub0 berbagi IP dengan a.example, sub2 NXDOMAIN, sub1 timeout tetap di-scan
+    assert runner.hosts == {"a.example", "sub1.a.example"}
+    assert {target for tool, target, _ in runner.reports if tool == "nmap"} == {"a.example", "sub1.a.example"}
@@ -0,0 +1,18 @@
+# tests/test_bench.py
+from bench.harness import SiteShape, compare_results, load_results, save_results
+
+
+def test_site_shape_is_a_bounded_tree():
+    shape = SiteShape(pages=1000, depth=2, fanout=3, dup_ratio=0)
+    assert shape.pages == 1 + 3 + 9
+    assert list(shape.children(0)) == [1, 2, 3] and not list(shape.children(4))
+    assert shape.links(0) == ["/p/1?a=1&b=2", "/p/2?a=1&b=2", "/p/3?a=1&b=2"]
+
+
+def test_compare_results_flags_only_timed_regressions(tmp_path):
+    path = save_results("test", {"crawl": {"pages_per_s": 100.0, "wall_s": 2.0, "urls": 50}, "_shape": {"pages": 1}},
+                        path=str(tmp_path / "baseline.json"))
+    current = {"crawl": {"pages_per_s": 80.0, "wall_s": 2.1, "urls": 10}, "_shape": {"pages": 2}}
+    rows = {metric: regressed for _, metric, _, _, _, regressed in compare_results(load_results(path), current)}
+    # Throughput turun 20% (> toleransi 10%), waktu naik 5%, jumlah URL tidak pernah ditandai
+    assert rows == {"pages_per_s": True, "wall_s": False, "urls": False}
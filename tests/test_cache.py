@@ -0,0 +1,31 @@
+# tests/test_cache.py
+import time
+
+from plugins.cache import RunCache
+
+
+def test_put_get_and_expiry(tmp_path):
+    cache = RunCache(root=str(tmp_path / "cache"), ttl=60)
+    report = tmp_path / "report.txt"
+    report.write_text("a\n")
+    key = cache.key("subfinder", "Example.com/", flags="-all  -silent")
+    assert key == cache.key("subfinder", "example.com", flags="-all -silent")
+    cache.put(key, str(report))
+    out = tmp_path / "restored.txt"
+    assert cache.restore(key, str(out)) and out.read_text() == "a\n"
+    cache.put(key, str(report), ttl=0.01)
+    time.sleep(0.05)
+    assert cache.get(key) is None
+
+
+def test_concurrent_processes_keep_every_index_entry(in_processes):
+    in_processes(
+        "import sys\n"
+        "from plugins.cache import RunCache\n"
+        "cache = RunCache()\n"
+        "for n in range(10):\n"
+        "    out = f'report_{sys.argv[1]}_{n}.txt'\n"
+        "    open(out, 'w').write(out)\n"
+        "    cache.put(cache.key('tool', out), out)\n")
+    cache = RunCache()
+    assert len(cache._load()) == 4 * 10
@@ -0,0 +1,28 @@
+# tests/test_checkpoint.py
+from plugins.checkpoint import CrawlCheckpoint
+
+
+def test_replay_keeps_unfinished_urls_pending(tmp_path):
+    path = str(tmp_path / "crawl.log")
+    with CrawlCheckpoint(path, {"url": "http://a/"}).open(resume=False) as cp:
+        cp.queued("http://a/", 0)
+        cp.queued("http://a/x", 1)
+        cp.queued("http://a/y", 1)
+        cp.emitted("http://a/")
+        cp.fetched("http://a/")
+        cp.skipped("http://a/x?sid=1", "trap")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("D\thttp://a/x")  # record terakhir terpotong
+
+    cp = CrawlCheckpoint(path, {})
+    assert cp.header() == {"url": "http://a/"}
+    pending, seen, emitted, fetched, skipped = cp.replay()
+    assert pending == [("http://a/x", 1), ("http://a/y", 1)]
+    assert seen == ["http://a/", "http://a/x", "http://a/y", "http://a/x?sid=1"]
+    assert (emitted, fetched, skipped) == (["http://a/"], 1, [("http://a/x?sid=1", "trap")])
+
+    with cp.open(resume=True):
+        cp.fetched("http://a/y")
+    assert cp.replay()[0] == [("http://a/x", 1)]
+    cp.remove()
+    assert not cp.exists()
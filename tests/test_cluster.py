@@ -0,0 +1,56 @@
+# tests/test_cluster.py
+import pytest
+
+from plugins.cluster import URLClusterer, format_shape, reduce_file, url_shape
+
+
+@pytest.mark.parametrize("url, path", [
+    ("http://a/users/42", "/users/{int}"),
+    ("http://a/users/42.json", "/users/{int}.json"),
+    ("http://a/o/3f2b8c1e-0d4a-4b6e-9f7a-1c2d3e4f5a6b", "/o/{uuid}"),
+    ("http://a/archive/2024-01-31/", "/archive/{date}/"),
+    ("http://a/blob/0123456789abcdef0123", "/blob/{hex}"),
+    ("http://a/s/Ab_cd-EF1234567890xyzQ", "/s/{token}"),
+    ("http://a/post-123/item_7", "/post-{int}/item_{int}"),
+    ("http://a/v2/about", "/v2/about"),
+    ("http://a/", "/"),
+])
+def test_url_shape_paths(url, path):
+    assert url_shape(url)[2] == path
+
+
+def test_url_shape_host_port_and_params():
+    assert url_shape("HTTPS://Example.com:443/x?b=1&a=2&b=3#frag") == ("https", "example.com", "/x", ("a", "b"))
+    assert url_shape("http://example.com:8080") == ("http", "example.com:8080", "/", ())
+    assert url_shape("ftp://example.com/") is None
+    assert url_shape("not a url") is None
+
+
+def test_clusterer_keeps_per_cluster_representatives():
+    clusterer = URLClusterer(per_cluster=2)
+    kept = [u for u in [f"http://a/item/{i}?id={i}" for i in range(10)] + ["http://a/about", "mailto:x"]
+            if clusterer.add(u)]
+    assert kept == ["http://a/item/0?id=0", "http://a/item/1?id=1", "http://a/about", "mailto:x"]
+    assert (clusterer.total, clusterer.kept, clusterer.invalid) == (12, 3, 1)
+    assert clusterer.largest(1) == [(10, "http://a/item/{int}?id=*")]
+    assert format_shape(url_shape("http://a/")) == "http://a/"
+
+
+def test_reduce_file(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("http://a/p/1\n\nhttp://a/p/2\nhttp://a/q\n", encoding="utf-8")
+    out, clusterer = reduce_file(str(path))
+    assert out == str(tmp_path / "urls_reduced.txt")
+    assert open(out, encoding="utf-8").read().splitlines() == ["http://a/p/1", "http://a/q"]
+    assert clusterer.ratio == pytest.approx(1 / 3)
+
+
+def test_reduce_file_passes_bare_hosts_through(tmp_path):
+    path = tmp_path / "subfinder_example.com.txt"
+    path.write_text("a.example.com\nb.example.com\nhttps://a.example.com/p/1\nhttps://a.example.com/p/2\n",
+                    encoding="utf-8")
+    out, clusterer = reduce_file(str(path))
+    assert open(out, encoding="utf-8").read().splitlines() == \
+        ["a.example.com", "b.example.com", "https://a.example.com/p/1"]
+    assert (clusterer.total, clusterer.kept, clusterer.invalid) == (4, 1, 2)
+    assert clusterer.ratio == pytest.approx(1 / 4)
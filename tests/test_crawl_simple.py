@@ -0,0 +1,93 @@
+# tests/test_crawl_simple.py
+import os
+
+from bench.harness import SiteShape, SyntheticSite
+from plugins.crawl_simple import SimpleCrawler
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def test_crawl_finds_every_page(site):
+    out = SimpleCrawler().run(site.url, depth=3, concurrency=8, per_host_rate=0, dedup="off")
+    urls = read_lines(out)
+    pages = {u for u in urls if "/p/" in u}
+    assert len(pages) == site.shape.pages
+    assert urls == sorted(set(urls))
+
+
+def test_crawl_respects_depth():
+    with SyntheticSite(SiteShape(pages=50, depth=3, dup_ratio=0)) as site:
+        out = SimpleCrawler().run(site.url, depth=1, concurrency=8, per_host_rate=0, dedup="off")
+    pages = {u for u in read_lines(out) if "/p/" in u}
+    assert len(pages) == 1 + site.shape.fanout
+
+
+def test_crawl_with_parse_workers(site):
+    out = SimpleCrawler().run(site.url, depth=3, concurrency=8, per_host_rate=0, dedup="off", parse_workers=1)
+    pages = {u for u in read_lines(out) if "/p/" in u}
+    assert len(pages) == site.shape.pages
+
+
+class FlakySite(SyntheticSite):
+    """SyntheticSite whose pages in `failing` answer 500"""
+
+    def __init__(self, shape, failing=()):
+        super().__init__(shape)
+        self.failing = set(failing)
+
+    async def _page(self, request):
+        from aiohttp import web
+        if int(request.match_info["i"]) in self.failing:
+            self.requests += 1
+            raise web.HTTPInternalServerError()
+        return await super()._page(request)
+
+
+def test_failed_pages_stay_pending_until_resume():
+    checkpoints = os.path.join("reports", ".checkpoints")
+    with FlakySite(SiteShape(pages=50, depth=3, dup_ratio=0, page_bytes=256), failing={1}) as site:
+        out = SimpleCrawler().run(site.url, depth=3, concurrency=8, per_host_rate=0, dedup="off")
+        pages = {u for u in read_lines(out) if "/p/" in u}
+        assert f"{site.url.rsplit('/', 1)[0]}/1?a=1&b=2" not in pages and len(pages) < site.shape.pages
+        assert os.listdir(checkpoints)  # tidak complete: journal disimpan
+
+        site.failing.clear()
+        out = SimpleCrawler().run(site.url, depth=3, concurrency=8, per_host_rate=0, dedup="off", resume=True)
+    pages = {u for u in read_lines(out) if "/p/" in u}
+    assert len(pages) == site.shape.pages
+    assert not os.listdir(checkpoints)
+
+
+class CatchAllSite(SyntheticSite):
+    """SyntheticSite whose unknown paths redirect to the seed page, or (`serve`) answer with it directly"""
+
+    def __init__(self, shape, serve=False):
+        super().__init__(shape)
+        self.serve = serve
+
+    def routes(self, app):
+        from aiohttp import web
+        super().routes(app)
+
+        async def catch_all(request):
+            if self.serve:
+                return web.Response(text=self.shape.render(0), content_type="text/html")
+            raise web.HTTPFound("/p/0")
+        app.router.add_get("/{tail:.*}", catch_all)
+
+
+def test_redirecting_unknown_paths_do_not_hide_the_seed():
+    with CatchAllSite(SiteShape(pages=30, depth=3, dup_ratio=0, page_bytes=256)) as site:
+        out = SimpleCrawler().run(site.url, depth=3, concurrency=8, per_host_rate=0, dedup="near")
+    pages = {u for u in read_lines(out) if "/p/" in u}
+    assert len(pages) == site.shape.pages
+
+
+def test_seed_is_never_a_soft_404():
+    with CatchAllSite(SiteShape(pages=30, depth=3, dup_ratio=0, page_bytes=256), serve=True) as site:
+        out = SimpleCrawler().run(site.url, depth=3, concurrency=8, per_host_rate=0, dedup="near")
+    pages = {u for u in read_lines(out) if "/p/" in u}
+    assert site.url in pages and len(pages) > 1
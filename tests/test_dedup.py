@@ -0,0 +1,52 @@
+# tests/test_dedup.py
+from plugins.dedup import MIN_FEATURES, ContentFingerprint, ContentIndex, CrawlFilter, TrapGuard, similarity
+
+
+def fingerprint(url, words):
+    fp = ContentFingerprint(url)
+    fp.feed_text(" ".join(words))
+    return fp.result()
+
+
+WORDS = [f"word{i}" for i in range(40)]
+
+
+def test_fingerprint_ignores_url_words_and_link_queries():
+    a = ContentFingerprint("http://a/missing/abc")
+    a.feed_text("Page missing abc not found")
+    a.feed_link("http://a/x?sid=1#f")
+    b = ContentFingerprint("http://a/missing/xyz")
+    b.feed_text("Page missing xyz not found")
+    b.feed_link("http://a/x?sid=2")
+    assert a.result() == b.result()
+
+
+def test_exact_and_near_duplicates():
+    index = ContentIndex()
+    assert index.check("http://a/p/1", fingerprint("http://a/p/1", WORDS)) is None
+    assert index.check("http://a/q", fingerprint("http://a/q", WORDS)).startswith("duplicate http://a/p/1")
+    near = fingerprint("http://a/p/2", WORDS[:-2] + ["other1", "other2"])
+    assert similarity(near[1], fingerprint("x", WORDS)[1]) > 0.8
+    assert index.check("http://a/p/2", near).startswith("near-duplicate http://a/p/1")
+    small = fingerprint("http://a/p/3", WORDS[:MIN_FEATURES - 1] + ["z"])
+    assert index.check("http://a/p/3", small) is None  # terlalu kecil untuk near-duplicate
+
+
+def test_soft_404_is_skipped_except_for_the_seed():
+    skipped = []
+    crawl_filter = CrawlFilter("near", on_skip=lambda url, reason: skipped.append((url, reason)))
+    crawl_filter.calibrate(fingerprint("http://a/random", WORDS))
+    assert crawl_filter.page("http://a/", fingerprint("http://a/", WORDS), seed=True)
+    assert not crawl_filter.page("http://a/other", fingerprint("http://a/other", WORDS))
+    assert skipped == [("http://a/other", "soft-404")]
+
+
+def test_trap_guard_closes_duplicate_patterns():
+    guard = TrapGuard(min_samples=3, dup_ratio=0.8, max_per_pattern=10)
+    assert guard.check("http://a/" + "x/" * 4) == "repeating-path"
+    assert guard.check("http://a/" + "y" * 3000) == "url-too-long"
+    closed = []
+    for i in range(3):
+        assert guard.admit(f"http://a/cal/{i}") is None
+        closed += guard.observe(f"http://a/cal/{i}", duplicate=True)
+    assert closed and guard.check("http://a/cal/99").startswith("pattern-closed")
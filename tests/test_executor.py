@@ -0,0 +1,114 @@
+# tests/test_executor.py
+import os
+import sys
+import time
+import signal
+import threading
+
+from plugins.executor import Executor
+
+PY = sys.executable
+
+
+def test_command_capture_and_returncode():
+    job = Executor().submit(f"{PY} -c \"print('hi'); import sys; sys.exit(3)\"", "python", capture=True).wait()
+    assert job.returncode == 3 and not job.ok
+    assert job.stdout == "hi\n"
+
+
+def test_on_stdout_sees_every_line():
+    lines = []
+    job = Executor().submit(f"{PY} -c \"[print(i) for i in range(5)]\"", "python", on_stdout=lines.append).wait()
+    assert job.ok and lines == ["0", "1", "2", "3", "4"]
+
+
+def test_failing_callback_keeps_draining_the_pipe():
+    def boom(line):
+        raise RuntimeError("downstream gagal")
+
+    # 2 MB output: jauh di atas buffer pipe, macet bila pipe berhenti dikuras
+    cmd = f"{PY} -c \"import sys; sys.stdout.write(('x' * 1023 + chr(10)) * 2048)\""
+    started = time.monotonic()
+    job = Executor().submit(cmd, "python", timeout=20, on_stdout=boom).wait()
+    assert not job.timed_out and job.returncode == 0
+    assert time.monotonic() - started < 10
+    assert isinstance(job.error, RuntimeError)
+
+
+def test_timeout_kills_the_process():
+    job = Executor().submit(f"{PY} -c \"import time; time.sleep(30)\"", "python", timeout=0.5).wait()
+    assert job.timed_out and not job.ok and job.duration < 10
+
+
+# Proses yang menjalankan tool-nya di session sendiri (seperti job scheduler) dan menghentikannya saat SIGTERM
+TOOL_OWNER = """
+import signal, subprocess, sys, time
+def stop(*_):
+    raise KeyboardInterrupt
+signal.signal(signal.SIGTERM, stop)
+tool = subprocess.Popen(["sleep", "30"], start_new_session=True)
+open(sys.argv[1], "w").write(str(tool.pid))
+try:
+    time.sleep(30)
+except KeyboardInterrupt:
+    tool.kill()
+    tool.wait()
+"""
+
+
+def test_timeout_grace_lets_the_process_stop_its_own_tools(tmp_path):
+    script, pid_file = tmp_path / "owner.py", tmp_path / "tool.pid"
+    script.write_text(TOOL_OWNER)
+    job = Executor().submit(f"{PY} {script} {pid_file}", "python", timeout=1, timeout_grace=10).wait()
+    assert job.timed_out and not job.ok and job.duration < 10
+    pid = int(pid_file.read_text())
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return
+    os.kill(pid, signal.SIGKILL)
+    raise AssertionError("tool masih berjalan setelah timeout")
+
+
+def test_cancel_running_process():
+    job = Executor().submit(f"{PY} -c \"import time; time.sleep(30)\"", "python")
+    time.sleep(0.3)
+    job.cancel()
+    job.wait(10)
+    assert job.done() and job.cancelled
+
+
+def test_tool_limit_caps_concurrency():
+    executor = Executor(max_workers=8, tool_limits={"t": 2})
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def work(job):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+
+    jobs = [executor.submit_call(work, "t") for _ in range(8)]
+    for job in jobs:
+        job.wait()
+    assert peak[0] == 2 and all(job.ok for job in jobs)
+
+
+def test_callables_do_not_hold_global_slots():
+    # Dua wrapper yang masing-masing menunggu job anak: dengan 1 slot global ini dulu deadlock
+    executor = Executor(max_workers=1, tool_limits={"wrapper": 4})
+
+    def wrapper(job):
+        return executor.submit(f"{PY} -c \"print(1)\"", "python", capture=True).wait(10).stdout
+
+    jobs = [executor.submit_call(wrapper, "wrapper") for _ in range(2)]
+    for job in jobs:
+        job.wait(10)
+    assert [job.value for job in jobs] == ["1\n", "1\n"]
+
+
+def test_callable_error_is_recorded():
+    job = Executor().submit_call(lambda job: 1 / 0, "python").wait()
+    assert job.returncode == 1 and isinstance(job.error, ZeroDivisionError)
@@ -0,0 +1,38 @@
+# tests/test_extract.py
+import pytest
+
+from plugins.extract import StreamExtractor, get_extractor, parse_pages
+
+PAGE = ('<html><head><script>var a = "<a href=/nope>";</script></head><body>'
+        '<a href="/a">A</a><a href=" b/c?x=1#f ">B</a><a>none</a><a href="">empty</a>'
+        '<form action="/search"><input name="q"></form><p>Hello world</p></body></html>')
+
+
+def test_stream_extractor_fed_in_chunks():
+    extractor = StreamExtractor("http://example.com/dir/page")
+    for i in range(0, len(PAGE), 7):
+        extractor.feed(PAGE[i:i + 7])
+    links, actions = extractor.result()
+    assert links == ["http://example.com/a", "http://example.com/dir/b/c?x=1#f"]
+    assert actions == ["http://example.com/search"]
+
+
+def test_fingerprint_ignores_scripts_and_url_words():
+    extractor = StreamExtractor("http://example.com/hello", fingerprint=True)
+    extractor.feed(PAGE)
+    extractor.result()
+    features = extractor.fingerprint.features
+    assert "world" in features and "hello" not in features and "nope" not in features
+
+
+def test_parse_pages_returns_in_scope_pairs():
+    page = b'<a href="http://example.com/x?b=1&a=2#f">x</a><a href="/x?a=2&b=1">y</a><a href="http://other/">z</a>'
+    [(url, depth, links, actions, fingerprint)] = parse_pages("stream", "example.com",
+                                                              [("http://example.com/", 1, page, None)])
+    assert (url, depth, actions, fingerprint) == ("http://example.com/", 1, [], None)
+    assert links == [("http://example.com/x?b=1&a=2", "http://example.com/x?a=2&b=1")]
+
+
+def test_unknown_extractor():
+    with pytest.raises(ValueError):
+        get_extractor("lxml")
@@ -0,0 +1,87 @@
+# tests/test_findings.py
+import os
+import json
+
+import pytest
+
+from plugins.findings import FindingsIndex, report_kind
+
+NMAP_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap">
+<host><status state="up"/><address addr="10.0.0.1" addrtype="ipv4"/>
+<hostnames><hostname name="A.example.com"/></hostnames>
+<ports><port protocol="tcp" portid="443"><state state="open"/>
+<service name="https" product="nginx" version="1.25"/></port>
+<port protocol="tcp" portid="22"><state state="closed"/></port></ports></host>
+<host><status state="up"/><address addr="10.0.0.2" addrtype="ipv4"/>
+<hostnames><hostname name="b.example.com"/></hostnames>
+<ports><port protocol="tcp" portid="80"><state state="open"/></port></ports></host>
+</nmaprun>
+"""
+
+
+def nuclei_line(template, severity, host):
+    return json.dumps({"template-id": template, "info": {"severity": severity}, "type": "http",
+                       "host": host, "matched-at": f"https://{host}/x"})
+
+
+@pytest.fixture
+def reports(tmp_path):
+    folder = tmp_path / "reports"
+    folder.mkdir()
+    (folder / "nmap_example.xml").write_text(NMAP_XML, encoding="utf-8")
+    (folder / "nuclei_example.jsonl").write_text("\n".join([
+        nuclei_line("cve-1", "high", "a.example.com"),
+        nuclei_line("cve-2", "critical", "b.example.com"),
+        nuclei_line("tech", "info", "a.example.com"),
+    ]) + "\n", encoding="utf-8")
+    (folder / "ffuf_example.json").write_text(json.dumps({"results": [
+        {"url": "https://a.example.com/admin", "status": 200, "length": 512, "words": 40, "lines": 10},
+        {"url": "https://a.example.com/.git", "status": 403, "length": 100, "words": 5, "lines": 2},
+    ]}), encoding="utf-8")
+    (folder / "katana_example.txt").write_text("https://a.example.com/\nhttps://a.example.com/login\n"
+                                                "https://b.example.com/\nhttps://a.example.com/\n", encoding="utf-8")
+    (folder / "subfinder_example.com.txt").write_text("a.example.com\nC.example.com\n", encoding="utf-8")
+    (folder / "notes.txt").write_text("bukan report\n", encoding="utf-8")
+    return folder
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = FindingsIndex(str(tmp_path / "findings.db"))
+    yield idx
+    idx.close()
+
+
+def test_report_kind():
+    assert report_kind("reports/nuclei_x.jsonl") == "nuclei" and report_kind("reports/simple_crawler_x.txt") == "urls"
+    assert report_kind("reports/notes.txt") is None
+
+
+def test_ingest_dir_and_queries(reports, index):
+    assert index.ingest_dir(str(reports)) == 3 + 3 + 2 + 3 + 2
+    assert index.count(str(reports / "nuclei_example.jsonl")) == 3
+    assert sorted(index.severity_counts()) == [("critical", 1), ("high", 1), ("info", 1)]
+    assert index.url_counts() == [("a.example.com", 2), ("b.example.com", 1)]
+    # Hanya a.example.com yang port 443-nya terbuka
+    assert index.findings_on_open_port(443) == [("a.example.com", "high", "cve-1", "https://a.example.com/x")]
+    assert index.findings_on_open_port(80) == [("b.example.com", "critical", "cve-2", "https://b.example.com/x")]
+    assert [r[0] for r in index.fuzz_hits(status=200)] == ["https://a.example.com/admin"]
+    assert [r[0] for r in index.fuzz_hits(min_length=101)] == ["https://a.example.com/admin"]
+    names = {name for name, in index.query("SELECT name FROM hosts")}
+    assert {"a.example.com", "b.example.com", "c.example.com"} <= names
+    assert index.query("SELECT ip FROM hosts WHERE name = 'a.example.com'") == [("10.0.0.1",)]
+
+
+def test_reingest_replaces_rows_of_the_same_report(reports, index):
+    nuclei = reports / "nuclei_example.jsonl"
+    index.ingest_dir(str(reports))
+    assert index.ingest(str(nuclei)) == 0  # tidak berubah: dilewati
+    assert index.ingest(str(nuclei), force=True) == 3
+    assert index.query("SELECT COUNT(*) FROM findings") == [(3,)]
+
+    nuclei.write_text(nuclei_line("cve-3", "medium", "a.example.com") + "\n", encoding="utf-8")
+    os.utime(nuclei, (1, 1))  # mtime pasti berbeda dari ingest sebelumnya
+    assert index.ingest(str(nuclei)) == 1
+    assert index.severity_counts() == [("medium", 1)]
+    assert index.count(str(nuclei)) == 1
@@ -0,0 +1,61 @@
+# tests/test_frontier.py
+import pytest
+
+from plugins.frontier import BloomFilter, Frontier, canonicalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTP://Example.COM", "http://example.com/"),
+    ("http://example.com:80/a", "http://example.com/a"),
+    ("https://example.com:8443/a", "https://example.com:8443/a"),
+    ("http://example.com/a?b=2&a=1#top", "http://example.com/a?a=1&b=2"),
+    ("http://[::1]:8080/x", "http://[::1]:8080/x"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    items = [f"http://example.com/p/{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"http://example.com/q/{i}" in bloom for i in range(10000))
+    assert false_positives < 50
+
+
+@pytest.mark.parametrize("bloom_capacity", [None, 1000])
+def test_frontier_dedups_on_canonical_form(bloom_capacity):
+    frontier = Frontier(2, scope="http://example.com/", bloom_capacity=bloom_capacity)
+    assert frontier.push("http://example.com/a?b=2&a=1#x", 0)
+    assert not frontier.push("http://EXAMPLE.com:80/a?a=1&b=2", 0)
+    assert not frontier.push("http://other.com/a", 0)
+    assert not frontier.push("http://example.com/deep", 3)
+    assert len(frontier) == 1
+
+
+def test_frontier_queues_the_url_as_written():
+    frontier = Frontier(2, scope="http://example.com/")
+    frontier.push("http://example.com/search?flag#frag", 0)
+    frontier.push("http://example.com/a%20b?q=x%20y", 0)
+    assert frontier.pop() == ("http://example.com/search?flag", 0)
+    assert frontier.pop() == ("http://example.com/a%20b?q=x%20y", 0)
+
+
+def test_frontier_guard_and_on_push():
+    pushed = []
+    frontier = Frontier(2, scope="http://example.com/")
+    frontier.on_push = lambda url, depth: pushed.append((url, depth))
+    frontier.guard = lambda url: "trap" not in url
+    assert frontier.push("http://example.com/ok", 1)
+    assert not frontier.push("http://example.com/trap", 1)
+    assert not frontier.push("http://example.com/trap", 1)  # tetap tercatat sebagai sudah dilihat
+    assert pushed == [("http://example.com/ok", 1)]
+
+
+def test_frontier_restore():
+    frontier = Frontier(2, scope="http://example.com/")
+    frontier.restore([("http://example.com/b?y=1&x=2", 1)], ["http://example.com/a", "http://example.com/b?y=1&x=2"])
+    assert not frontier.push("http://example.com/b?x=2&y=1", 1)
+    assert frontier.pop() == ("http://example.com/b?y=1&x=2", 1)
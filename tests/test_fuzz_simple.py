@@ -0,0 +1,64 @@
+# tests/test_fuzz_simple.py
+import json
+
+import pytest
+
+from bench.harness import FuzzTarget
+from plugins.fuzz_simple import ResponseFilter, SimpleFuzzer, parse_extra, parse_ranges
+
+
+def test_parse_ranges():
+    assert parse_ranges("200, 301-399") == [(200, 200), (301, 399)]
+    assert parse_ranges("") is None and parse_ranges(None) is None
+    assert parse_ranges("all") == [(0, float("inf"))]
+
+
+def test_parse_extra_skips_values_of_other_flags():
+    opts, errors = parse_extra("-H '-t 1' -ac -t 7 -mc 200,301 -rate 2.5 -e php,bak -x http://proxy")
+    assert errors == []
+    assert opts == {"concurrency": 7, "match_status": "200,301", "rate": 2.5, "extensions": "php,bak"}
+
+
+@pytest.mark.parametrize("extra, error", [
+    ("-t abc", "Nilai -t tidak valid: 'abc'"),
+    ("-t 0", "Nilai -t tidak valid: '0'"),
+    ("-rate fast", "Nilai -rate tidak valid: 'fast'"),
+    ("-fc 40x", "Nilai -fc tidak valid: '40x'"),
+    ("-mc", "Flag -mc butuh nilai"),
+])
+def test_parse_extra_reports_bad_values(extra, error):
+    assert parse_extra(extra)[1] == [error]
+
+
+def test_bad_extra_stops_the_run_before_any_request():
+    assert SimpleFuzzer().run("http://127.0.0.1:9/", "", extra="-t abc") is None
+
+
+def test_response_filter_calibration():
+    f = ResponseFilter(filter_size="0")
+    f.calibrate([{"status": 200, "length": 50, "words": 5, "lines": 1},
+                 {"status": 200, "length": 60, "words": 5, "lines": 1}])
+    assert f.calibrated == {(200, "words", 5)}
+    assert not f.keep({"status": 200, "length": 70, "words": 5, "lines": 3})
+    assert f.keep({"status": 200, "length": 70, "words": 9, "lines": 3})
+    assert not f.keep({"status": 200, "length": 0, "words": 0, "lines": 0})
+    assert not f.keep({"status": 404, "length": 70, "words": 9, "lines": 3})
+
+
+def test_unexpected_request_errors_are_counted_and_the_report_stays_valid(tmp_path, monkeypatch):
+    send = SimpleFuzzer._send
+
+    async def flaky_send(self, client, template, word, *args, **kwargs):
+        if word == "boom":
+            raise OSError("connector gagal")  # bukan aiohttp.ClientError
+        return await send(self, client, template, word, *args, **kwargs)
+
+    monkeypatch.setattr(SimpleFuzzer, "_send", flaky_send)
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("admin\nboom\nmissing\nlogin\n", encoding="utf-8")
+    with FuzzTarget(paths=["admin", "login"]) as target:
+        out = SimpleFuzzer().run(target.url, str(wordlist), concurrency=2, rate=0, calibrate=False)
+    report = json.load(open(out, encoding="utf-8"))
+    assert sorted(r["input"]["FUZZ"] for r in report["results"]) == ["admin", "login"]
+    events = [json.loads(line) for line in open("reports/metrics.jsonl", encoding="utf-8")]
+    assert (events[-1]["pages"], events[-1]["errors"]) == (3, 1)
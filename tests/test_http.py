@@ -0,0 +1,45 @@
+# tests/test_http.py
+import asyncio
+
+import pytest
+
+from plugins.http import HttpClient, Response
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def read(parts, max_body):
+    response = Response(200, {}, "http://a/", "a", None, "HTTP/1.1", chunks(*parts), max_body)
+    body = asyncio.run(response.read())
+    return body, response.truncated, response.received
+
+
+@pytest.mark.parametrize("parts, max_body, expected", [
+    ([b"abc", b"def"], 6, (b"abcdef", False, 6)),
+    ([b"abc", b"def"], 7, (b"abcdef", False, 6)),
+    ([b"abc", b"def"], 5, (b"abcde", True, 5)),
+    ([b"abc", b"def"], 3, (b"abc", True, 3)),
+    ([b"abcdef"], 6, (b"abcdef", False, 6)),
+])
+def test_iter_chunks_caps_the_body_at_max_body(parts, max_body, expected):
+    assert read(parts, max_body) == expected
+
+
+def test_client_streams_a_page(site):
+    client = HttpClient()
+
+    async def fetch(max_body=None):
+        async with client.stream(site.url, max_body=max_body) as response:
+            return response.status, await response.read(), response.truncated
+
+    try:
+        status, body, truncated = client.run(fetch())
+        assert status == 200 and body and not truncated
+        assert client.run(fetch(max_body=len(body))) == (200, body, False)
+        assert client.run(fetch(max_body=len(body) - 1)) == (200, body[:-1], True)
+        assert client.stats["requests"] == 3
+    finally:
+        client.close()
@@ -0,0 +1,59 @@
+# tests/test_metrics.py
+import re
+import json
+from types import SimpleNamespace
+
+from plugins.metrics import Histogram, Metrics, stage
+
+JOB = SimpleNamespace(timed_out=False, cancelled=False, returncode=0, duration=0.5, cpu_time=0.2, peak_rss=None,
+                      cmd="tool")
+
+
+def runs_total(path):
+    text = open(path, encoding="utf-8").read()
+    return int(re.search(r'^blackbox_runs_total\{.*status="ok"\} (\d+)$', text, re.M).group(1))
+
+
+def test_histogram_buckets_and_merge():
+    latency = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 2.0):
+        latency.observe(value)
+    other = Histogram(buckets=(0.1, 1.0))
+    other.observe(0.1)
+    latency.merge(other)
+    assert latency.counts == [2, 1, 1] and latency.count == 4
+
+
+def test_run_event_and_textfile():
+    metrics = Metrics()
+    with stage("scan"):
+        metrics.record_run("nmap", JOB)
+    [event] = [json.loads(line) for line in open(metrics.jsonl_path, encoding="utf-8")]
+    assert (event["event"], event["plugin"], event["stage"], event["status"]) == ("run", "nmap", "scan", "ok")
+    assert runs_total(metrics.prom_path) == 1
+
+
+def test_totals_are_shared_between_processes():
+    # Dua instance = dua proses job: counter terus naik, tidak bergantian antar total sesi
+    first, second = Metrics(), Metrics()
+    first.record_run("nmap", JOB)
+    second.record_run("nmap", JOB)
+    first.record_run("nmap", JOB)
+    assert runs_total(first.prom_path) == 3
+
+    latency = Histogram()
+    latency.observe(0.2)
+    first.record_crawl("crawl_simple", 1, 100, 1.0, latency)
+    second.record_crawl("crawl_simple", 1, 100, 1.0, latency)
+    assert 'blackbox_crawl_request_latency_seconds_count{plugin="crawl_simple"} 2' in open(first.prom_path).read()
+
+
+def test_concurrent_processes_add_up(in_processes):
+    in_processes(
+        "from types import SimpleNamespace\n"
+        "from plugins.metrics import get_metrics\n"
+        "job = SimpleNamespace(timed_out=False, cancelled=False, returncode=0, duration=0.5, cpu_time=0.2,\n"
+        "                      peak_rss=None, cmd='tool')\n"
+        "for _ in range(10):\n"
+        "    get_metrics().record_run('nmap', job)\n")
+    assert runs_total(Metrics().prom_path) == 4 * 10
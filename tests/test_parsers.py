@@ -0,0 +1,77 @@
+# tests/test_parsers.py
+import json
+
+from plugins.fuzz_ffuf import FFUF
+from plugins.scan_nmap import Nmap
+from plugins.scan_nuclei import Nuclei
+
+NMAP_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap" args="nmap -F 10.0.0.1">
+<host><status state="up"/><address addr="10.0.0.1" addrtype="ipv4"/>
+<hostnames><hostname name="a.example.com"/></hostnames>
+<ports><port protocol="tcp" portid="22"><state state="open"/><service name="ssh" product="OpenSSH" version="9.6"/></port>
+<port protocol="tcp" portid="25"><state state="closed"/></port></ports></host>
+<host><status state="down"/><address addr="10.0.0.2" addrtype="ipv4"/></host>
+</nmaprun>
+"""
+
+
+def test_nuclei_jsonl_and_text_lines(tmp_path):
+    path = tmp_path / "nuclei.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"template-id": "cve-1", "matcher-name": "m", "info": {"severity": "HIGH"}, "type": "http",
+                    "matched-at": "http://a/x", "host": "a", "extracted-results": ["v1"]}),
+        "{broken json",
+        "",
+        "[tech-detect] [http] [info] http://b/ [nginx]",
+        "garbage line",
+    ]) + "\n", encoding="utf-8")
+    findings = list(Nuclei.iter_findings(str(path)))
+    assert findings == [
+        {"template": "cve-1:m", "severity": "high", "protocol": "http", "url": "http://a/x", "host": "a",
+         "detail": '["v1"]'},
+        {"template": "tech-detect", "severity": "info", "protocol": "http", "url": "http://b/", "host": "http://b/",
+         "detail": "[nginx]"},
+    ]
+
+
+def test_nmap_iter_hosts(tmp_path):
+    path = tmp_path / "nmap.xml"
+    path.write_text(NMAP_XML, encoding="utf-8")
+    hosts = list(Nmap.iter_hosts(str(path)))
+    assert [h["address"] for h in hosts] == ["10.0.0.1", "10.0.0.2"]
+    assert hosts[0]["hostnames"] == ["a.example.com"] and hosts[1]["status"] == "down"
+    assert hosts[0]["ports"][0] == {"port": 22, "proto": "tcp", "state": "open", "service": "ssh",
+                                    "product": "OpenSSH", "version": "9.6"}
+    assert hosts[0]["ports"][1]["state"] == "closed"
+
+
+def test_ffuf_json_streamed_in_small_chunks(tmp_path):
+    results = [{"url": f"http://a/{i}", "status": 200, "input": {"FUZZ": "x]" * i}} for i in range(50)]
+    path = tmp_path / "ffuf.json"
+    path.write_text(json.dumps({"commandline": "ffuf -u x", "results": results, "config": {}}), encoding="utf-8")
+    assert list(FFUF.iter_results(str(path), chunk_size=7)) == results
+
+
+def test_ffuf_empty_and_csv(tmp_path):
+    empty = tmp_path / "empty.json"
+    empty.write_text('{"commandline": "", "results": []}', encoding="utf-8")
+    assert list(FFUF.iter_results(str(empty))) == []
+    csv_path = tmp_path / "ffuf.csv"
+    csv_path.write_text("url,status_code,content_length,content_words,content_lines\nhttp://a/x,301,10,2,1\n",
+                        encoding="utf-8")
+    [row] = FFUF.iter_results(str(csv_path))
+    assert (row["url"], row["status"], row["length"]) == ("http://a/x", 301, 10)
+
+
+def test_ffuf_merge_reports_renumbers(tmp_path):
+    paths = []
+    for n in range(2):
+        path = tmp_path / f"shard{n}.json"
+        path.write_text(json.dumps({"results": [{"url": f"http://a/{n}-{i}", "position": i} for i in range(3)]}),
+                        encoding="utf-8")
+        paths.append(str(path))
+    out = FFUF.merge_reports(paths + [str(tmp_path / "missing.json")], str(tmp_path / "merged.json"))
+    merged = json.load(open(out, encoding="utf-8"))["results"]
+    assert [r["position"] for r in merged] == list(range(1, 7))
+    assert merged[3]["url"] == "http://a/1-0"
@@ -0,0 +1,74 @@
+# tests/test_pipeline.py
+import time
+import asyncio
+import threading
+
+from plugins.crawl_simple import SimpleCrawler
+from plugins.http import get_http_client
+from plugins.pipeline import Pipeline
+
+
+def test_pipeline_passes_every_item_with_backpressure():
+    got = []
+
+    def source(emit):
+        for i in range(500):
+            emit(i)
+
+    def double(inp, emit):
+        for item in inp:
+            emit(item * 2)
+
+    def sink(inp, emit):
+        for batch in inp.batches(size=64, interval=0.1):
+            got.extend(batch)
+
+    assert Pipeline(maxsize=8).add("source", source).add("double", double, workers=3).add("sink", sink).run()
+    assert sorted(got) == [i * 2 for i in range(500)]
+
+
+def test_pipeline_cancel_unblocks_a_full_queue():
+    pipeline = Pipeline(maxsize=2)
+    consumed = []
+
+    def source(emit):
+        for i in range(1000):
+            emit(i)
+
+    def slow(inp, emit):
+        for item in inp:
+            consumed.append(item)
+            time.sleep(0.05)
+
+    threading.Timer(0.3, pipeline.cancel.set).start()
+    started = time.monotonic()
+    assert not pipeline.add("source", source).add("slow", slow).run()
+    assert time.monotonic() - started < 5
+    assert len(consumed) < 100
+
+
+def test_blocking_on_url_does_not_stall_the_shared_loop(site):
+    release, cancel = threading.Event(), threading.Event()
+    got = []
+
+    def on_url(line):
+        got.append(line)
+        release.wait(10)
+
+    crawl = threading.Thread(target=SimpleCrawler().run, args=(site.url,),
+                             kwargs={"depth": 3, "per_host_rate": 0, "dedup": "off", "on_url": on_url,
+                                     "cancel": cancel})
+    crawl.start()
+    deadline = time.monotonic() + 10
+    while not got and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert got
+
+    started = time.monotonic()
+    get_http_client().run(asyncio.sleep(0))
+    assert time.monotonic() - started < 1
+
+    cancel.set()
+    release.set()
+    crawl.join(10)
+    assert not crawl.is_alive()
@@ -0,0 +1,84 @@
+# tests/test_ratelimit.py
+import time
+
+from plugins.ratelimit import HostLimiter, RateLimiter, host_of, parse_retry_after
+
+
+def drive(limiter, requests, gap, status=200, latency=0.01):
+    """Client that sends every `gap` seconds (or later when the bucket says so); returns the end time"""
+    now = time.monotonic()
+    for _ in range(requests):
+        now += limiter.reserve(now=now)
+        limiter.observe(status, latency, now=now)
+        now += gap
+    return now
+
+
+def test_slow_client_does_not_inflate_the_rate():
+    limiter = HostLimiter(rate=10)
+    drive(limiter, 2000, gap=0.05)  # ~20 req/s
+    assert 19 <= limiter.peak_rate <= 21
+    assert limiter.rate <= limiter.growth_cap * 21
+    assert limiter.learned_rate() <= 21
+
+
+def test_rate_grows_while_the_bucket_limits():
+    limiter = HostLimiter(rate=10)
+    drive(limiter, 3000, gap=0.0)
+    assert limiter.rate > 100 and limiter.peak_rate > 50
+
+
+def test_backoff_halves_the_rate_once_per_cooldown():
+    limiter = HostLimiter(rate=40)
+    now = time.monotonic()
+    limiter.observe(429, 0.01, now=now)
+    limiter.observe(429, 0.01, now=now + 0.01)
+    assert limiter.rate == 20 and not limiter.slow_start and limiter.stats["backoff"] == 2
+
+
+def test_retry_after_holds_requests():
+    limiter = HostLimiter(rate=100)
+    now = time.monotonic()
+    limiter.observe(429, retry_after=5, now=now)
+    assert limiter.reserve(now=now) >= 5
+    assert parse_retry_after("7") == 7.0 and parse_retry_after("soon") is None
+
+
+def test_save_persists_the_measured_rate(tmp_path):
+    path = str(tmp_path / "ratelimit.json")
+    limiter = RateLimiter(path=path)
+    drive(limiter.host("target:80"), 2000, gap=0.05)
+    limiter.host("idle:80")
+    limiter.save()
+
+    fresh = RateLimiter(path=path)
+    assert fresh.rate("target:80") <= 21 and fresh.rate("idle:80") is None
+    assert fresh.rate_flag("nuclei", "target:80") == f"-rl {int(fresh.rate('target:80'))}"
+    assert fresh.rate_flag("nuclei", "target:80", extra="-rl 5") == ""
+    assert fresh.rate_flag("ffuf", "target:80", rate=30, share=4) == "-rate 7"
+
+
+def test_host_of():
+    assert host_of("https://Example.com:8443/a?b") == "example.com:8443"
+    assert host_of("example.com/x") == "example.com"
+
+
+def test_save_keeps_rates_saved_by_other_processes(tmp_path, in_processes):
+    path = str(tmp_path / "ratelimit.json")
+    early, late = RateLimiter(path=path), RateLimiter(path=path)
+    early.rate("a:80")  # file dibaca sebelum proses lain menyimpan
+    drive(late.host("b:80"), 200, gap=0.05)
+    late.save()
+    drive(early.host("a:80"), 200, gap=0.05)
+    early.save()
+    assert set(RateLimiter(path=path)._read()) == {"a:80", "b:80"}
+
+    in_processes(
+        "import sys\n"
+        "from plugins.ratelimit import RateLimiter\n"
+        "limiter = RateLimiter()\n"
+        "for n in range(20):\n"
+        "    host = limiter.host(f'h{sys.argv[1]}-{n}:80')\n"
+        "    host.peak_rate, host.stats['ok'] = 5.0, 1\n"
+        "    limiter.save()\n")
+    assert len(RateLimiter()._read()) == 4 * 20
@@ -0,0 +1,78 @@
+# tests/test_registry.py
+import sys
+
+import pytest
+
+from plugins.registry import PluginRegistry
+
+BROKEN = '''
+from .base import Plugin
+raise RuntimeError("modul tidak boleh di-import saat discovery")
+
+
+class Broken(Plugin):
+    name = "Broken Tool"
+    category = "Scanner"
+    bin_name = "broken"
+'''
+
+LAZY = '''
+from .base import Plugin
+
+
+class Helper:
+    name = "bukan plugin"
+
+
+class Lazy(Plugin):
+    name = "Lazy Recon"
+    category = "Recon"
+    description = "diimpor saat pertama dipakai"
+
+    def is_available(self):
+        return True
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    pkg = tmp_path / "fakeplugins"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "base.py").write_text("class Plugin:\n    pass\n")
+    (pkg / "broken.py").write_text(BROKEN)
+    (pkg / "lazy.py").write_text(LAZY)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    for name in [m for m in sys.modules if m.split(".")[0] == "fakeplugins"]:
+        del sys.modules[name]
+
+
+def test_discovery_reads_metadata_without_importing(package):
+    registry = PluginRegistry(str(package), package="fakeplugins")
+    specs = registry.specs()
+    assert [(s.class_name, s.name, s.category) for s in specs] == \
+        [("Lazy", "Lazy Recon", "Recon"), ("Broken", "Broken Tool", "Scanner")]
+    assert not [m for m in sys.modules if m.startswith("fakeplugins.")]
+    assert registry.spec("Broken").bin_name == "broken" and not registry.spec("Broken").custom_available
+
+
+def test_plugins_are_imported_on_first_use(package):
+    registry = PluginRegistry(str(package), package="fakeplugins")
+    spec = registry.spec("Lazy")
+    assert spec.custom_available and spec.is_available()
+    assert "fakeplugins.lazy" in sys.modules and "fakeplugins.broken" not in sys.modules
+    assert registry.get("Lazy") is spec.instance()
+
+
+def test_unknown_plugin_raises_key_error(package):
+    with pytest.raises(KeyError):
+        PluginRegistry(str(package), package="fakeplugins").spec("Helper")
+    with pytest.raises(KeyError):
+        PluginRegistry().spec("Missing")
+
+
+def test_bundled_plugins_are_found():
+    registry = PluginRegistry()
+    assert registry.spec("Nmap").bin_name == "nmap"
+    assert {"Subfinder", "Nuclei", "FFUF", "SimpleCrawler"} <= {s.class_name for s in registry.specs()}
@@ -0,0 +1,66 @@
+# tests/test_resolve.py
+import asyncio
+import struct
+
+import pytest
+
+from bench.harness import StubDNSServer
+from plugins.resolve import TTLCache, build_query, encode_name, parse_response, resolve_hosts
+
+
+def test_idn_label_length_counts_encoded_bytes():
+    assert encode_name("bücher.example") == b"\x0dxn--bcher-kva\x07example\x00"
+    query = build_query(0x1234, "a.example.", "AAAA")
+    assert query[:2] == b"\x12\x34" and query[12:] == b"\x01a\x07example\x00" + struct.pack(">HH", 28, 1)
+
+
+@pytest.mark.parametrize("name", ["x" * 64 + ".example", "a..example", ".".join(["a" * 60] * 5)])
+def test_invalid_names_raise_value_error(name):
+    with pytest.raises(ValueError):
+        encode_name(name)
+
+
+def test_parse_response_follows_compression():
+    question = b"\x01a\x07example\x00" + struct.pack(">HH", 1, 1)
+    cname = b"\x01b\xc0\x0e"  # b.example, menunjuk ke "example" di pertanyaan
+    data = (struct.pack(">HHHHHH", 7, 0x8180, 1, 2, 0, 0) + question
+            + struct.pack(">HHHIH", 0xC00C, 5, 1, 30, len(cname)) + cname
+            + struct.pack(">HHHIH", 0xC00C, 1, 1, 60, 4) + bytes([10, 0, 0, 1]))
+    assert parse_response(data) == (7, 0, [("CNAME", "b.example", 30), ("A", "10.0.0.1", 60)])
+
+
+def test_resolve_hosts_groups_wildcards_and_bad_names():
+    records = {"a.example.com": ["10.0.0.1"], "b.example.com": ["10.0.0.1"], "c.example.com": ["10.0.0.2"],
+               "xn--bcher-kva.example.com": ["10.0.0.3"]}
+    with StubDNSServer(records=records, wildcards={"wild.example.com": ["10.9.9.9"]},
+                       cnames={"alias.example.com": "c.example.com"}) as dns:
+        names = list(records) + ["alias.example.com", "x.wild.example.com", "gone.example.com",
+                                 "bücher.example.com", "x" * 64 + ".example.com"]
+        result = asyncio.run(resolve_hosts(names, f"127.0.0.1:{dns.port}", timeout=1, retries=0,
+                                           root="example.com"))
+    assert result.live["bücher.example.com"] == ["10.0.0.3"]
+    assert result.live["alias.example.com"] == ["10.0.0.2"]
+    assert result.wildcard == [("x.wild.example.com", "wild.example.com")]
+    assert result.dead == ["gone.example.com"] and result.failed == []
+    assert result.invalid == ["x" * 64 + ".example.com"]
+    assert result.targets() == ["a.example.com", "bücher.example.com", "c.example.com"]
+
+
+def test_timed_out_names_stay_targets():
+    with StubDNSServer(records={"a.example.com": ["10.0.0.1"], "b.example.com": ["10.0.0.1"]},
+                       silent=["slow.example.com"]) as dns:
+        result = asyncio.run(resolve_hosts(["a.example.com", "b.example.com", "slow.example.com", "gone.example.com"],
+                                           f"127.0.0.1:{dns.port}", timeout=0.3, retries=0))
+    assert result.failed == ["slow.example.com"] and result.dead == ["gone.example.com"]
+    # Hanya NXDOMAIN (dan wildcard) yang dibuang; nama yang timeout tetap di-scan
+    assert result.targets() == ["a.example.com", "slow.example.com"]
+
+
+def test_ttl_cache_expires(monkeypatch):
+    cache = TTLCache(max_ttl=10)
+    now = [100.0]
+    monkeypatch.setattr("plugins.resolve.time.monotonic", lambda: now[0])
+    cache.put("k", ("1.2.3.4",), 3600)
+    assert cache.get("k") == ("1.2.3.4",)
+    now[0] += 11
+    assert cache.get("k") is None
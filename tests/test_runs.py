@@ -0,0 +1,62 @@
+# tests/test_runs.py
+import time
+
+import pytest
+
+from plugins.runs import RunStore, diff_sorted
+
+
+def write(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def test_diff_between_runs(tmp_path):
+    store = RunStore(root=str(tmp_path / "runs"))
+    report = tmp_path / "subfinder_example.com.txt"
+    write(report, ["a.example.com", "B.example.com"])
+    first = store.record(str(report))
+    write(report, ["b.example.com", "c.example.com", "d.example.com"])
+    second = store.record(str(report))
+    third = store.record(str(report))  # isi sama, detik sama: id tetap naik
+    assert store.runs(str(report)) == [first, second, third] and first < second < third
+
+    diff = store.diff(str(report), old=first, new=second)
+    assert (diff["kind"], diff["added"], diff["removed"]) == ("subdomains", 2, 1)
+    assert open(diff["added_path"], encoding="utf-8").read() == "c.example.com\nd.example.com\n"
+    assert store.diff(str(report))["added"] == 0  # run terakhir vs sebelumnya: sama
+    targets, count = store.changed_targets(str(report), diff)
+    assert count == 2
+
+
+def test_diff_rejects_unknown_runs(tmp_path):
+    store = RunStore(root=str(tmp_path / "runs"))
+    report = tmp_path / "subfinder_example.com.txt"
+    write(report, ["a.example.com"])
+    store.record(str(report))
+    with pytest.raises(ValueError):
+        store.diff(str(report), old="20000101-000000")
+    with pytest.raises(ValueError):
+        store.diff(str(report), new="../../etc/passwd")
+    assert store.diff(str(tmp_path / "subfinder_other.txt")) is None
+
+
+def test_diff_sorted_streams_both_files(tmp_path):
+    old, new = tmp_path / "old", tmp_path / "new"
+    write(old, ["a", "c", "e"])
+    write(new, ["b", "c", "d"])
+    assert diff_sorted(str(old), str(new), str(tmp_path / "add"), str(tmp_path / "rem")) == (2, 2)
+    assert (tmp_path / "rem").read_text() == "a\ne\n"
+    assert diff_sorted(None, str(new), str(tmp_path / "add"), str(tmp_path / "rem")) == (3, 0)
+
+
+def test_concurrent_processes_get_distinct_run_ids(workdir, in_processes):
+    write(workdir / "subfinder_example.com.txt", ["a.example.com"])
+    start = time.time() + 1.0  # semua proses mulai bersamaan
+    in_processes(
+        "import time\n"
+        "from plugins.runs import RunStore\n"
+        "store = RunStore(keep=0)\n"
+        f"time.sleep(max(0.0, {start} - time.time()))\n"
+        "for _ in range(20):\n"
+        "    store.record('subfinder_example.com.txt')\n")
+    assert len(RunStore().runs("subfinder_example.com.txt")) == 4 * 20
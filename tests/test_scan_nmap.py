@@ -0,0 +1,83 @@
+# tests/test_scan_nmap.py
+import os
+
+from bench.harness import use_stubs
+from plugins.executor import get_executor
+from plugins.scan_nmap import Nmap, merge_xml, split_ports, split_targets
+
+
+def host_xml(address, ports, state="up"):
+    status = f'<status state="{state}"/>' if state else ""
+    family = "ipv6" if ":" in address else "ipv4"
+    return (f'<host>{status}<address addr="{address}" addrtype="{family}"/><ports>'
+            + "".join(f'<port protocol="tcp" portid="{p}"><state state="open"/></port>' for p in ports)
+            + "</ports></host>")
+
+
+def test_split_targets_packs_hosts_and_splits_cidr():
+    assert split_targets(["a", "b", "c"], hosts_per_shard=2) == [["a", "b"], ["c"]]
+    assert split_targets(["10.0.0.0/30", "x"], hosts_per_shard=4) == [["10.0.0.0/30"], ["x"]]
+    assert split_targets(["10.0.0.0/28"], hosts_per_shard=4) == [[f"10.0.0.{i}/30"] for i in range(0, 16, 4)]
+
+
+def test_split_ports():
+    assert split_ports("1-10,20", 3) == ["1-4", "5-8", "9-10,20"]
+    assert split_ports("T:80,U:53", 3) == ["T:80,U:53"]
+    assert split_ports("80", 1) == ["80"]
+
+
+def test_merge_xml_combines_ports_of_port_shards(tmp_path):
+    paths = []
+    for n, ports in enumerate([(22,), (80, 443)]):
+        path = tmp_path / f"shard{n}.xml"
+        path.write_text(f'<nmaprun scanner="nmap">{host_xml("10.0.0.2", ports)}'
+                        f'{host_xml(f"10.0.0.1{n}", (), "down")}</nmaprun>', encoding="utf-8")
+        paths.append(str(path))
+    out = merge_xml(paths, str(tmp_path / "merged.xml"), args="nmap x")
+    hosts = list(Nmap.iter_hosts(out))
+    assert [h["address"] for h in hosts] == ["10.0.0.2", "10.0.0.10", "10.0.0.11"]
+    assert [p["port"] for p in hosts[0]["ports"]] == [22, 80, 443]
+
+
+def test_merge_xml_mixes_address_families(tmp_path):
+    v4, v6 = tmp_path / "v4.xml", tmp_path / "v6.xml"
+    v4.write_text(f'<nmaprun scanner="nmap">{host_xml("10.0.0.1", (80,), state=None)}'
+                  f'{host_xml("scanme.example", ())}</nmaprun>', encoding="utf-8")
+    v6.write_text(f'<nmaprun scanner="nmap">{host_xml("2001:db8::1", (443,))}'
+                  f'{host_xml("10.0.0.1", (22,))}</nmaprun>', encoding="utf-8")
+    out = merge_xml([str(v4), str(v6)], str(tmp_path / "merged.xml"))
+    hosts = list(Nmap.iter_hosts(out))
+    assert [h["address"] for h in hosts] == ["10.0.0.1", "2001:db8::1", "scanme.example"]
+    # Salinan pertama tanpa <status>: status "up" dari shard lain tetap masuk
+    assert hosts[0]["status"] == "up" and [p["port"] for p in hosts[0]["ports"]] == [80, 22]
+
+
+def test_clean_target_keeps_ipv6_addresses():
+    nmap = Nmap()
+    assert nmap.clean_target_for_nmap("https://example.com:8443/a") == "example.com"
+    assert nmap.clean_target_for_nmap("2001:db8::1") == "2001:db8::1"
+    assert nmap.clean_target_for_nmap("http://[2001:db8::1]:8080/x") == "2001:db8::1"
+    assert nmap.clean_target_for_nmap("2001:db8::/64") == "2001:db8::/64"
+    assert nmap.expand_targets("10.0.0.1:22, ::1") == ["10.0.0.1", "::1"]
+
+
+def test_run_sharded_keeps_the_shared_tool_limit():
+    use_stubs()
+    executor = get_executor()
+    before = dict(executor.tool_limits)
+    out = Nmap().run_sharded("10.0.0.1,10.0.0.2,10.0.0.3", out_dir="reports", hosts_per_shard=1, parallel=3)
+    assert [h["address"] for h in Nmap.iter_hosts(out)] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    assert executor.tool_limits == before
+
+
+def test_run_sharded_skips_shards_without_report(monkeypatch):
+    def cached(self, cmd, out, key, **kwargs):
+        # Shard "sukses" tanpa menulis XML
+        if key != "10.0.0.2":
+            with open(out, "w", encoding="utf-8") as f:
+                f.write(f'<nmaprun scanner="nmap">{host_xml("10.0.0.1", (80,))}</nmaprun>')
+
+    monkeypatch.setattr(Nmap, "run_cmd_cached", cached)
+    out = Nmap().run_sharded("10.0.0.1,10.0.0.2", out_dir="reports", hosts_per_shard=1, parallel=2)
+    assert [h["address"] for h in Nmap.iter_hosts(out)] == ["10.0.0.1"]
+    assert not os.path.exists(os.path.join("reports", "nmap_10.0.0.1_10.0.0.2_shards"))
@@ -0,0 +1,103 @@
+# tests/test_scheduler.py
+import pytest
+
+from plugins.scheduler import JobQueue, job_target, submit_job
+
+WORKER = "daemon-lain:1"  # host lain: recover() hanya melihat heartbeat
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(str(tmp_path / "scheduler.db"))
+    yield q
+    q.close()
+
+
+def claim_all(queue, **kwargs):
+    claimed = []
+    while (job := queue.claim(WORKER, **kwargs)) is not None:
+        claimed.append(job["id"])
+    return claimed
+
+
+def test_job_target_is_the_host_without_port():
+    assert job_target(["https://Example.com:8443/a"], {}) == "example.com"
+    assert job_target([], {"domain": "example.com"}) == "example.com"
+    assert job_target([], {"url": "http://[::1]:8080/"}) == "[::1]"
+
+
+def test_unknown_method_is_rejected(queue):
+    with pytest.raises(ValueError):
+        queue.submit("crawl_simple", ["http://a/"], method="__init__")
+
+
+def test_claim_takes_the_highest_priority_first(queue):
+    low = queue.submit("crawl_simple", ["http://a/"])
+    high = queue.submit("crawl_simple", ["http://b/"], priority=5)
+    assert claim_all(queue) == [high, low]
+    job = queue.get(high)
+    assert job["state"] == "running" and job["attempts"] == 1 and job["worker"] == WORKER
+
+
+def test_claim_round_robins_between_targets(queue):
+    a = [queue.submit("crawl_simple", [f"http://a/{i}"]) for i in range(3)]
+    b = [queue.submit("crawl_simple", [f"http://b/{i}"]) for i in range(2)]
+    # Target besar yang masuk duluan tidak menghabiskan antrean
+    assert claim_all(queue) == [a[0], b[0], a[1], b[1], a[2]]
+
+
+def test_max_per_target_caps_running_jobs(queue):
+    a = [queue.submit("crawl_simple", [f"http://a/{i}"]) for i in range(2)]
+    b = queue.submit("crawl_simple", ["http://b/"])
+    assert claim_all(queue, max_per_target=1) == [a[0], b]
+    queue.finish(a[0], "done", exit_code=0)
+    assert claim_all(queue, max_per_target=1) == [a[1]]
+
+
+def test_cancel_queued_running_and_finished_jobs(queue):
+    running = queue.submit("crawl_simple", ["http://a/"], priority=1)
+    queued = queue.submit("crawl_simple", ["http://b/"])
+    queue.claim(WORKER)
+    assert queue.cancel(queued) and queue.get(queued)["state"] == "cancelled"
+    assert queue.cancel(running) and queue.get(running)["state"] == "running"
+    assert queue.cancel_requested(WORKER) == [running]
+    queue.finish(running, "cancelled")
+    assert not queue.cancel(running)
+    assert queue.claim(WORKER) is None
+
+
+def test_release_requeues_without_counting_the_attempt(queue):
+    job_id = queue.submit("crawl_simple", ["http://a/"])
+    queue.claim(WORKER)
+    queue.release(job_id)
+    job = queue.get(job_id)
+    assert job["state"] == "queued" and job["attempts"] == 0 and job["interrupted"] and job["worker"] is None
+    assert queue.claim(WORKER)["id"] == job_id
+
+
+def test_recover_requeues_stale_jobs_until_attempts_run_out(queue):
+    retry = queue.submit("crawl_simple", ["http://a/"], max_attempts=2)
+    last = queue.submit("crawl_simple", ["http://b/"], max_attempts=1)
+    cancelled = queue.submit("crawl_simple", ["http://c/"])
+    fresh = queue.submit("crawl_simple", ["http://d/"])
+    claim_all(queue)
+    queue.cancel(cancelled)
+    assert queue.recover(stale=3600) == ([], [])  # heartbeat masih baru: daemon dianggap hidup
+    requeued, failed = queue.recover(stale=0)
+    assert requeued == [retry, fresh] and failed == [last]
+    assert queue.get(retry)["state"] == "queued" and queue.get(retry)["interrupted"]
+    assert queue.get(last)["state"] == "failed"
+    assert queue.get(cancelled)["state"] == "cancelled"
+    assert queue.counts() == {"queued": 2, "running": 0, "done": 0, "failed": 1, "cancelled": 1}
+
+
+@pytest.mark.parametrize("timeout", ["soon", "0", -5, [1], float("nan")])
+def test_submit_job_rejects_bad_timeouts(queue, timeout):
+    with pytest.raises(ValueError):
+        submit_job(queue, {"plugin": "Nmap", "args": ["10.0.0.1"], "timeout": timeout})
+    assert queue.counts()["queued"] == 0
+
+
+def test_submit_job_parses_the_timeout(queue):
+    job_id = submit_job(queue, {"plugin": "Nmap", "args": ["10.0.0.1"], "timeout": "90"})
+    assert queue.get(job_id)["timeout"] == 90.0
@@ -0,0 +1,60 @@
+# tests/test_wordlist.py
+import os
+
+from bench.harness import FuzzTarget
+from plugins.fuzz_simple import SimpleFuzzer
+from plugins.wordlist import Wordlist, default_wordlist, normalize, parse_extensions, prepare_wordlist, \
+    unique_in_order
+
+
+def open_wordlist_files():
+    fds = []
+    for fd in os.listdir("/proc/self/fd"):
+        try:
+            fds.append(os.readlink(f"/proc/self/fd/{fd}"))
+        except OSError:
+            pass
+    return [path for path in fds if path.endswith((".words", ".idx"))]
+
+
+def test_normalize_and_extensions():
+    assert normalize("  /admin \n") == "admin"
+    assert normalize("# comment") is None and normalize("   ") is None and normalize("/") is None
+    assert normalize("Admin", lowercase=True) == "admin"
+    assert parse_extensions("php, .bak,php") == (".php", ".bak")
+
+
+def test_unique_in_order_with_small_chunks():
+    words = [f"w{i % 13}" for i in range(200)] + ["a", "w0"]
+    assert list(unique_in_order(iter(words), chunk_lines=7)) == [f"w{i}" for i in range(13)] + ["a"]
+
+
+def test_wordlist_merges_sources_and_shards(tmp_path):
+    one, two = tmp_path / "one.txt", tmp_path / "two.txt"
+    one.write_text("admin\n/login\n# x\nadmin\n", encoding="utf-8")
+    two.write_text("login\nbackup\n", encoding="utf-8")
+    with Wordlist([str(one), str(two)], cache_dir=str(tmp_path / "cache"), chunk_lines=2) as wl:
+        assert list(wl) == ["admin", "login", "backup"] and wl[-1] == "backup"
+        assert [list(wl.shard(i, 2)) for i in range(2)] == [["admin"], ["login", "backup"]]
+        assert list(wl.iter_range(1, 2, (".php",))) == ["login", "login.php"]
+        paths = wl.write_shards(2, str(tmp_path / "shards"))
+        assert open(paths[1], encoding="utf-8").read() == "login\nbackup\n"
+
+
+def test_prepare_wordlist_falls_back_to_the_default(tmp_path):
+    wl = prepare_wordlist(str(tmp_path / "missing.txt"), "param")
+    try:
+        assert wl.sources == [default_wordlist("param")] and len(wl) > 0
+    finally:
+        wl.close()
+    given = tmp_path / "given.txt"
+    given.write_text("x\n", encoding="utf-8")
+    with prepare_wordlist(f"{given},{tmp_path / 'missing.txt'}") as wl:
+        assert list(wl) == ["x"]
+
+
+def test_simple_fuzzer_missing_wordlist_uses_default_and_closes_it():
+    with FuzzTarget(paths={"admin"}) as target:
+        out = SimpleFuzzer().run(target.url, "nonexistent.txt", rate=0)
+        assert out and '"admin"' in open(out, encoding="utf-8").read()
+        assert open_wordlist_files() == []
@@ -0,0 +1,49 @@
+# tests/test_writer.py
+from plugins.writer import StreamWriter, external_sort
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_stream_writer_dedups_and_calls_on_write(tmp_path):
+    seen = []
+    path = tmp_path / "out.txt"
+    with StreamWriter(str(path), batch_size=2, on_write=seen.append) as w:
+        assert w.write("b")
+        assert w.write("a")
+        assert not w.write("b")
+        assert w.count == 2
+    assert read(path) == ["b", "a"]
+    assert seen == ["b", "a"]
+
+
+def test_stream_writer_key_and_restore(tmp_path):
+    path = tmp_path / "out.txt"
+    seen = []
+    with StreamWriter(str(path), on_write=seen.append, key=str.lower) as w:
+        w.restore(["A", "a"])
+        assert not w.write("a")
+        assert w.write("B")
+        assert not w.write("x", key="b")
+    assert read(path) == ["A", "B"]
+    assert seen == ["B"]
+
+
+def test_external_sort_in_small_chunks(tmp_path):
+    path = tmp_path / "lines.txt"
+    lines = [f"line{i % 37:03d}" for i in range(500)] + ["", "   "]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    external_sort(str(path), chunk_lines=16)
+    assert read(path) == sorted(set(l for l in lines if l.strip()))
+    assert not list(tmp_path.glob("*.sortchunk"))
+
+
+def test_external_sort_keeps_duplicates_and_writes_elsewhere(tmp_path):
+    path = tmp_path / "lines.txt"
+    out = tmp_path / "sorted.txt"
+    path.write_text("c\na\nc\nb\n", encoding="utf-8")
+    external_sort(str(path), str(out), chunk_lines=2, unique=False)
+    assert read(out) == ["a", "b", "c", "c"]
+    assert read(path) == ["c", "a", "c", "b"]